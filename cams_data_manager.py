@@ -26,11 +26,14 @@ import datetime
 import itertools
 import webbrowser
 
-from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication
+from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, QFileSystemWatcher, QTimer
 from qgis.PyQt.QtGui import QIcon
-from qgis.PyQt.QtWidgets import QAction, QMessageBox, QFileDialog
+from qgis.PyQt.QtWidgets import QAction, QMessageBox, QFileDialog, QInputDialog
 
-from qgis.core import QgsProject, QgsRasterLayer, QgsVectorFileWriter, QgsFeatureRequest
+from qgis.core import (
+    QgsApplication, QgsProject, QgsRasterLayer, QgsVectorFileWriter, QgsFeatureRequest,
+    QgsCoordinateReferenceSystem, QgsCoordinateTransform
+)
 
 # Initialize Qt resources from file resources.py
 from .resources import *
@@ -42,13 +45,31 @@ from .cams_data_manager_dialog import CAMSDataManagerDialog
 from .tools.ui_handler import collect_download_parameters
 from .tools.downloader import submit_cams_request
 from .tools.validator import validate_params
-from .tools.config import DEFAULT_DOWNLOAD_DIR, MODEL_BOUNDS
+from .tools.config import DEFAULT_DOWNLOAD_DIR, MODEL_BOUNDS, LOAD_AS_COG
 from .tools.unzipper import unzip_and_get_netcdf
+from .tools.result_cache import ResultCache
+from .tools.catalog import Catalog, Coverage, catalog_variable, month_periods
+from .tools.aggregation import AGGREGATION_FREQUENCIES
+from .tools.netcdf_loader import cog_job, layer_source, resolve_variable, SOURCE_PATH_PROPERTY
+from .tools.band_stats import ingest_statistics, read_band_statistics
+from .tools.layer_style import apply_pollutant_style
+from .tools.vrt_mosaic import build_time_mosaic, append_to_mosaic, read_vrt_sources, vrt_band_times
+from .tools.temporal_layer import TemporalBandBinding
+from .tools.statistics import format_statistics
+from .tools.nc_header import read_header
+from .tools.categorical import class_edges_for
+from .tools.analysis_jobs import (
+    statistics_job, aggregation_job, bivariate_job, pixel_correlation_job, intercomparison_job,
+    intercomparison_report
+)
+from .tools.tasks import AnalysisTask
+from .tools.compute import shutdown_backend
 
 # For loading layers to QGIS
 from qgis.core import QgsRasterLayer
 
-from .tools.ui_handler import NETCDF_VARIABLE_MAP
+from .tools.ui_handler import NETCDF_VARIABLE_MAP, VARIABLE_MAP, MODEL_MAP, TYPE_MAP
+from .tools.availability import refresh_job
 
 import tempfile
 import pandas as pd
@@ -56,9 +77,7 @@ import geopandas as gpd
 from .tools.aoi_utils import clip_netcdf_by_shapefile
 
 from .gui.analysis_tab import AnalysisTab
-
-import xarray as xr
-import numpy as np
+from .processing_provider.provider import CAMSProcessingProvider
 
 
 class CAMSDataManager:
@@ -119,6 +138,28 @@ class CAMSDataManager:
         # Current area of interest - used to store selected AOI for download
         self.current_aoi = None
 
+        # Persistent cache of statistics/bivariate results - created lazily
+        self._result_cache = None
+
+        # Band/time bindings of loaded layers, keyed by layer id
+        self._temporal_bindings = {}
+
+        # Catalog of NetCDF files and the watcher keeping it current - created lazily
+        self._catalog = None
+        self._file_watcher = None
+        self._catalog_timer = None
+
+        # Result of the last catalog query of the Analysis tab (tools.catalog.Coverage)
+        self.current_coverage = None
+
+        # Processing provider (cams:download, cams:clip, ...) - registered in initGui
+        self.provider = None
+
+        # Analysis tasks queued in the QGIS task manager and not finished yet
+        self._tasks = set()
+        # Layers waiting for the COG conversion of their NetCDF file, by (file, variable)
+        self._cog_conversions = {}
+
         # AnalysisTab instantiation and binding
         # self.analysis_tab = AnalysisTab(parent=self.dlg)
         # analysis_tab_widget = self.dlg.mainTabWidget.findChild(QWidget, "tabAnalysisResults")
@@ -218,6 +259,10 @@ class CAMSDataManager:
             callback=self.run,
             parent=self.iface.mainWindow())
 
+        # Make the algorithms available to the Processing toolbox, modeler and qgis_process
+        self.provider = CAMSProcessingProvider()
+        QgsApplication.processingRegistry().addProvider(self.provider)
+
         # Set first_start flag to True - will be set to False after first run
         self.first_start = True
 
@@ -228,6 +273,28 @@ class CAMSDataManager:
         This method is called by QGIS when the plugin is unloaded.
         It cleans up all UI elements added by the plugin.
         """
+        # Stop the analyses still running in the background
+        for task in list(self._tasks):
+            task.cancel()
+        # Stop the compute workers; chunks not started yet are dropped
+        shutdown_backend(wait=False)
+
+        # Remove the Processing algorithms
+        if self.provider is not None:
+            QgsApplication.processingRegistry().removeProvider(self.provider)
+            self.provider = None
+
+        # Stop following the temporal controller
+        for layer_id in list(self._temporal_bindings):
+            self.release_temporal_binding(layer_id)
+
+        # Stop watching the data directories
+        if self._catalog_timer is not None:
+            self._catalog_timer.stop()
+        if self._file_watcher is not None:
+            self._file_watcher.directoryChanged.disconnect(self.on_watched_directory_changed)
+            self._file_watcher = None
+
         # Remove each action from menu and toolbar
         for action in self.actions:
             self.iface.removePluginMenu(
@@ -387,6 +454,7 @@ class CAMSDataManager:
         self.dlg.btnBrowseOutput.clicked.connect(self.on_browse_output)
         self.dlg.btnRunStats.clicked.connect(self.on_run_stats_clicked)
         self.dlg.btnRunBivariate.clicked.connect(self.on_run_bivariate_clicked)
+        self.dlg.btnSelectByQuery.clicked.connect(self.on_select_by_query_clicked)
         # Analysis statistics variable linkage
         self.dlg.comboStatsLayer.currentIndexChanged.connect(self.populate_bivariate_vars)
         # Connect Terms and Conditions button
@@ -616,21 +684,6 @@ class CAMSDataManager:
             )
             return
 
-        # --- Availability check before download ---
-        from .tools.ui_handler import AVAILABILITY
-        var = self.dlg.comboVariable.currentText()
-        model = self.dlg.comboModel.currentText()
-        typ = self.dlg.comboType.currentText()
-        years_available = AVAILABILITY.get((var, model, typ), [])
-        if not years_available:
-            QMessageBox.warning(
-                self.dlg,
-                "No Available Years",
-                "No available years for the current selection. Please change parameters."
-            )
-            return
-        # --- End availability check ---
-
         # Reset progress bar before starting
         self.dlg.progressBar.setValue(0)
 
@@ -726,6 +779,14 @@ class CAMSDataManager:
 
             if file_to_load and os.path.exists(file_to_load):
                 netcdf_var = NETCDF_VARIABLE_MAP.get(params["variable"], params["variable"])
+                self.register_in_catalog(nc_file, "download")
+                if file_to_load != nc_file:
+                    self.register_in_catalog(file_to_load, "clipped", [nc_file])
+                # Band statistics are computed once at ingest and stored with the file
+                try:
+                    ingest_statistics(file_to_load, netcdf_var)
+                except Exception as e:
+                    print(f"[WARNING] Band statistics not stored: {e}")
                 self.load_data_to_qgis(file_to_load, netcdf_var)
             else:
                 QMessageBox.warning(
@@ -848,14 +909,21 @@ class CAMSDataManager:
             file_path (str): Absolute path to the .nc file (NetCDF)
             variable_name (str, optional): NetCDF variable name to load (not needed for most CAMS files)
         """
-        # Let QGIS/GDAL auto-detect all bands/variables, just like manual loading
-        uri = f'NETCDF:"{file_path}"'
-        layer_name = os.path.basename(file_path).replace(".nc", "")
+        # Display a cached Cloud-Optimized GeoTIFF (tiled, with overviews) when
+        # there is one; otherwise show the NetCDF file at once and convert it in the background
+        source, layer_name, convert = layer_source(file_path, variable_name, use_cog=LOAD_AS_COG)
 
-        raster_layer = QgsRasterLayer(uri, layer_name, "gdal")
+        raster_layer = QgsRasterLayer(source, layer_name, "gdal")
+        # Remember the NetCDF file behind a converted layer for the analysis tab
+        raster_layer.setCustomProperty(SOURCE_PATH_PROPERTY, file_path)
 
         if raster_layer.isValid():
+            self.style_layer(raster_layer, source, file_path, variable_name)
             QgsProject.instance().addMapLayer(raster_layer)
+            if raster_layer.bandCount() > 1:
+                self.bind_to_temporal_controller(raster_layer, file_path, variable_name)
+            if convert:
+                self.convert_layer_to_cog(raster_layer, file_path, variable_name)
             QMessageBox.information(
                 self.dlg,
                 "Layer Added",
@@ -869,6 +937,148 @@ class CAMSDataManager:
                 f"Please check GDAL NetCDF support or file integrity."
             )
 
+    def convert_layer_to_cog(self, layer, file_path, variable_name=None):
+        """
+        Convert the NetCDF file of a layer to a cached COG in a background task
+        and switch the layer to it once written.
+
+        The layer keeps its style and temporal binding. It shows the NetCDF file
+        until then, and stays on it if the conversion fails. Layers of a file
+        already being converted wait for the same task.
+
+        Args:
+            layer: QgsRasterLayer showing the NetCDF file.
+            file_path: NetCDF file the layer was loaded from.
+            variable_name: Displayed variable (see load_data_to_qgis).
+        """
+        key = (file_path, variable_name)
+        if key in self._cog_conversions:
+            self._cog_conversions[key].append(layer.id())
+            return
+        self._cog_conversions[key] = [layer.id()]
+
+        def on_result(cog_path):
+            for layer_id in self._cog_conversions.pop(key, []):
+                layer = QgsProject.instance().mapLayer(layer_id)
+                if layer is None:
+                    continue
+                source = layer.source()
+                renderer = layer.renderer().clone()
+                layer.setDataSource(cog_path, layer.name(), "gdal")
+                if not layer.isValid():
+                    print(f"[WARNING] {cog_path} cannot be displayed, keeping the NetCDF file")
+                    layer.setDataSource(source, layer.name(), "gdal")
+                layer.setRenderer(renderer)
+                layer.triggerRepaint()
+
+        def on_failed(message):
+            self._cog_conversions.pop(key, None)
+            print(f"[WARNING] COG conversion failed, keeping the NetCDF file: {message}")
+
+        task = AnalysisTask(f"CAMS COG conversion: {os.path.basename(file_path)}", cog_job,
+                            file_path, variable_name)
+        self._tasks.add(task)
+        task.resultReady.connect(on_result)
+        task.failed.connect(on_failed)
+        task.cancelled.connect(lambda: self._cog_conversions.pop(key, None))
+        task.taskCompleted.connect(lambda: self._tasks.discard(task))
+        task.taskTerminated.connect(lambda: self._tasks.discard(task))
+        QgsApplication.taskManager().addTask(task)
+
+    def style_layer(self, layer, source, file_path, variable_name=None):
+        """
+        Apply the pollutant colour ramp using stored band statistics.
+
+        Statistics missing from the layer source (e.g. files not ingested by
+        the download step) are computed once and stored with it.
+
+        Args:
+            layer: QgsRasterLayer about to be added.
+            source: GDAL source of the layer.
+            file_path: NetCDF file the layer was loaded from.
+            variable_name: Displayed variable (see load_data_to_qgis).
+        """
+        try:
+            stats = read_band_statistics(source)
+            if stats is None:
+                stats = ingest_statistics(file_path, variable_name, source=source)
+            variable = resolve_variable(file_path, variable_name) or variable_name
+            apply_pollutant_style(layer, variable, stats)
+        except Exception as e:
+            print(f"[WARNING] Default style kept: {e}")
+
+    def bind_to_temporal_controller(self, layer, file_path, variable_name=None):
+        """
+        Map the bands of a layer to their timestamps and follow the temporal controller.
+
+        Args:
+            layer: QgsRasterLayer just added to the project.
+            file_path: NetCDF file the layer was loaded from.
+            variable_name: Displayed variable (see load_data_to_qgis).
+        """
+        try:
+            binding = TemporalBandBinding.from_netcdf(layer, file_path, variable_name)
+        except Exception as e:
+            print(f"[WARNING] Layer not bound to the temporal controller: {e}")
+            return
+        self.attach_temporal_binding(layer, binding)
+
+    def attach_temporal_binding(self, layer, binding):
+        binding.attach(self.iface.mapCanvas())
+        layer_id = layer.id()
+        self._temporal_bindings[layer_id] = binding
+        layer.willBeDeleted.connect(lambda: self.release_temporal_binding(layer_id))
+
+    def release_temporal_binding(self, layer_id):
+        binding = self._temporal_bindings.pop(layer_id, None)
+        if binding is not None:
+            binding.detach()
+
+    @staticmethod
+    def netcdf_source_of(layer):
+        """
+        Path of the NetCDF file a raster layer displays, or None.
+
+        Args:
+            layer: QgsRasterLayer, opened from a NetCDF URI or from a COG
+                created by load_data_to_qgis.
+        """
+        path = layer.customProperty(SOURCE_PATH_PROPERTY)
+        if path:
+            return path
+        source = layer.source()
+        if source.lower().endswith('.nc') or 'NETCDF:' in source.upper():
+            if 'NETCDF:"' in source:
+                return source.split('NETCDF:"')[-1].split('"')[0]
+            return source
+        return None
+
+    def refresh_availability(self):
+        """
+        Rebuild the availability index from the ADS constraints file once its cache expired.
+
+        The download runs in a background task, so an unreachable ADS never
+        blocks the dialog. Failures (e.g. offline) are reported and the
+        previous index is kept.
+        """
+        def on_result(changes):
+            if changes is None:
+                return
+            for kind in ("added", "removed"):
+                for variable, model, data_type, level, months in changes[kind]:
+                    where = f", level {level}" if level is not None else ""
+                    print(f"[INFO] Availability {kind}: {variable}/{model}/{data_type}{where}: "
+                          f"{months[0][0]}-{months[0][1]} to {months[-1][0]}-{months[-1][1]} ({len(months)} months)")
+            self.dlg.update_year_options()
+
+        task = AnalysisTask("CAMS availability refresh", refresh_job, timeout=10)
+        self._tasks.add(task)
+        task.resultReady.connect(on_result)
+        task.failed.connect(lambda message: print(f"[WARNING] Availability could not be refreshed: {message}"))
+        task.taskCompleted.connect(lambda: self._tasks.discard(task))
+        task.taskTerminated.connect(lambda: self._tasks.discard(task))
+        QgsApplication.taskManager().addTask(task)
+
     def setup_year_month_defaults(self):
         """
         Initialize year and month checkboxes without default selection.
@@ -912,112 +1122,197 @@ class CAMSDataManager:
             self.refresh_analysis_tab()
 
     def refresh_analysis_tab(self):
+        self.refresh_catalog()
         self.populate_netcdf_list()
         self.populate_stats_layer_combo()
         self.populate_bivariate_vars()
 
-    def populate_netcdf_list(self):
-        self.dlg.listNetcdfLayers.clear()
-        seen_paths = set()
-        # 1. NetCDF layers already loaded in QGIS
+    @property
+    def catalog(self):
+        """
+        Catalog of known NetCDF files, opened on first use.
+        """
+        if self._catalog is None:
+            self._catalog = Catalog()
+        return self._catalog
+
+    def catalog_directories(self):
+        """Directories whose NetCDF files are kept in the catalog."""
+        directories = [DEFAULT_DOWNLOAD_DIR]
+        download_folder = self.dlg.lineFolder.text().strip()
+        if download_folder and os.path.isdir(download_folder):
+            directories.append(os.path.abspath(download_folder))
+        return list(dict.fromkeys(directories))
+
+    def project_netcdf_paths(self):
+        """NetCDF files behind the raster layers of the current project."""
+        paths = []
         for layer in QgsProject.instance().mapLayers().values():
             if isinstance(layer, QgsRasterLayer):
-                source = layer.source()
-                if source.lower().endswith('.nc') or 'NETCDF:' in source.upper():
-                    if 'NETCDF:"' in source:
-                        path = source.split('NETCDF:"')[-1].split('"')[0]
-                    else:
-                        path = source
-                    if os.path.exists(path) and path not in seen_paths:
-                        self.dlg.listNetcdfLayers.addItem(path)
-                        seen_paths.add(path)
-        # 2. ~/CAMS_Data directory
-        netcdf_dir = os.path.expanduser("~/CAMS_Data")
-        if not os.path.exists(netcdf_dir):
-            os.makedirs(netcdf_dir, exist_ok=True)
-        for fname in os.listdir(netcdf_dir):
-            if fname.endswith(".nc"):
-                fpath = os.path.join(netcdf_dir, fname)
-                if fpath not in seen_paths:
-                    self.dlg.listNetcdfLayers.addItem(fpath)
-                    seen_paths.add(fpath)
-        # 3. Current folder selected in Download tab
-        download_folder = self.dlg.lineFolder.text().strip()
-        if download_folder and os.path.exists(download_folder):
-            for fname in os.listdir(download_folder):
-                if fname.endswith(".nc"):
-                    fpath = os.path.join(download_folder, fname)
-                    if fpath not in seen_paths:
-                        self.dlg.listNetcdfLayers.addItem(fpath)
-                        seen_paths.add(fpath)
+                path = self.netcdf_source_of(layer)
+                if path and os.path.exists(path):
+                    paths.append(os.path.abspath(path))
+        return list(dict.fromkeys(paths))
+
+    def refresh_catalog(self):
+        """
+        Bring the catalog up to date with the watched directories and project layers.
+
+        Only new or modified files are opened; the directories are also watched
+        so that files added later are picked up without reopening the tab.
+        """
+        os.makedirs(DEFAULT_DOWNLOAD_DIR, exist_ok=True)
+        for directory in self.catalog_directories():
+            self.catalog.refresh_directory(directory)
+        for path in self.project_netcdf_paths():
+            self.register_in_catalog(path)
+        self.update_watched_directories()
+
+    def register_in_catalog(self, path, kind="download", lineage=None):
+        """
+        Record a downloaded or derived file in the catalog.
+
+        Args:
+            path: NetCDF file path.
+            kind: "download", "clipped", "aggregate", ...
+            lineage: Paths of the files it was derived from.
+        """
+        try:
+            self.catalog.register(path, kind, lineage)
+        except Exception as e:
+            print(f"[WARNING] Catalog could not record {path}: {e}")
+
+    def update_watched_directories(self):
+        if self._file_watcher is None:
+            self._file_watcher = QFileSystemWatcher()
+            self._file_watcher.directoryChanged.connect(self.on_watched_directory_changed)
+            # Files are often written in several steps; refresh once they settle
+            self._catalog_timer = QTimer()
+            self._catalog_timer.setSingleShot(True)
+            self._catalog_timer.setInterval(1000)
+            self._catalog_timer.timeout.connect(self.refresh_analysis_tab)
+        watched = set(self._file_watcher.directories())
+        for directory in self.catalog_directories():
+            if directory not in watched:
+                self._file_watcher.addPath(directory)
+
+    def on_watched_directory_changed(self, directory):
+        self._catalog_timer.start()
+
+    def catalog_paths(self):
+        """
+        NetCDF files to offer in the Analysis tab: project layers first, then the catalog.
+        """
+        paths = self.project_netcdf_paths()
+        seen = set(paths)
+        for record in self.catalog.files():
+            if record["path"] not in seen:
+                paths.append(record["path"])
+                seen.add(record["path"])
+        return paths
+
+    def aoi_bbox(self):
+        """
+        Bounding box of the current AOI as (west, south, east, north) in EPSG:4326, or None.
+        """
+        aoi = self.current_aoi
+        if not aoi:
+            return None
+        if "layer_ids" not in aoi:
+            return aoi["west"], aoi["south"], aoi["east"], aoi["north"]
+        wgs84 = QgsCoordinateReferenceSystem("EPSG:4326")
+        extent = None
+        for layer_id in aoi["layer_ids"]:
+            layer = QgsProject.instance().mapLayer(layer_id)
+            if layer is None:
+                continue
+            layer_extent = layer.boundingBoxOfSelected() if aoi.get("selected_only") else layer.extent()
+            transform = QgsCoordinateTransform(layer.crs(), wgs84, QgsProject.instance())
+            layer_extent = transform.transformBoundingBox(layer_extent)
+            if extent is None:
+                extent = layer_extent
+            else:
+                extent.combineExtentWith(layer_extent)
+        if extent is None:
+            return None
+        return extent.xMinimum(), extent.yMinimum(), extent.xMaximum(), extent.yMaximum()
+
+    def query_catalog_from_ui(self):
+        """
+        Query the catalog with the selections of the Download and AOI tabs.
+
+        Variable, model, level and type come from the Download tab, the period
+        from its year and month check boxes (contiguous months form one period)
+        and the area from the current AOI.
+
+        Returns:
+            Coverage: Covering files and gaps, or None if no period is selected.
+        """
+        years = [y for y, cb in self.dlg.yearCheckBox.items() if cb.isChecked()]
+        months = [m for m, cb in self.dlg.monthCheckBox.items() if cb.isChecked()]
+        periods = month_periods(years, months)
+        if not periods:
+            return None
+        filters = {
+            "variable": catalog_variable(VARIABLE_MAP.get(self.dlg.comboVariable.currentText(), "")) or None,
+            "model": MODEL_MAP.get(self.dlg.comboModel.currentText()),
+            "level": self.dlg.comboLevel.currentText() or None,
+            "data_type": TYPE_MAP.get(self.dlg.comboType.currentText()),
+        }
+        bbox = self.aoi_bbox()
+        return Coverage.combine([self.catalog.query(start=start, end=end, bbox=bbox, **filters)
+                                 for start, end in periods])
+
+    def on_select_by_query_clicked(self):
+        """
+        Select the catalogued files covering the Download tab selection and the AOI.
+
+        The files are selected in the file list (for aggregation) and offered
+        as one entry of the statistics combo box; gaps are reported.
+        """
+        self.refresh_catalog()
+        try:
+            coverage = self.query_catalog_from_ui()
+        except Exception as e:
+            QMessageBox.critical(self.dlg, "Catalog Query Failed", f"Error: {str(e)}")
+            return
+        if coverage is None:
+            QMessageBox.warning(self.dlg, "No period selected",
+                                "Select the years and months of the study period in the Download tab.")
+            return
+        self.current_coverage = coverage if len(coverage) else None
+        self.populate_netcdf_list()
+        self.populate_stats_layer_combo()
+        if not coverage.complete:
+            QMessageBox.warning(self.dlg, "Incomplete coverage",
+                                f"The catalog does not cover the whole period:\n{coverage.describe()}")
+
+    def populate_netcdf_list(self):
+        self.dlg.listNetcdfLayers.clear()
+        selected = set(self.current_coverage.paths) if self.current_coverage is not None else set()
+        for path in self.catalog_paths():
+            self.dlg.listNetcdfLayers.addItem(path)
+            if path in selected:
+                self.dlg.listNetcdfLayers.item(self.dlg.listNetcdfLayers.count() - 1).setSelected(True)
 
     def populate_stats_layer_combo(self):
         self.dlg.comboStatsLayer.clear()
-        seen_paths = set()
-        # 1. NetCDF layers already loaded in QGIS
-        for layer in QgsProject.instance().mapLayers().values():
-            if isinstance(layer, QgsRasterLayer):
-                source = layer.source()
-                if source.lower().endswith('.nc') or 'NETCDF:' in source.upper():
-                    if 'NETCDF:"' in source:
-                        path = source.split('NETCDF:"')[-1].split('"')[0]
-                    else:
-                        path = source
-                    if os.path.exists(path) and path not in seen_paths:
-                        self.dlg.comboStatsLayer.addItem(path)
-                        seen_paths.add(path)
-        # 2. ~/CAMS_Data directory
-        netcdf_dir = os.path.expanduser("~/CAMS_Data")
-        if not os.path.exists(netcdf_dir):
-            os.makedirs(netcdf_dir, exist_ok=True)
-        for fname in os.listdir(netcdf_dir):
-            if fname.endswith(".nc"):
-                fpath = os.path.join(netcdf_dir, fname)
-                if fpath not in seen_paths:
-                    self.dlg.comboStatsLayer.addItem(fpath)
-                    seen_paths.add(fpath)
-        # 3. Current folder selected in Download tab
-        download_folder = self.dlg.lineFolder.text().strip()
-        if download_folder and os.path.exists(download_folder):
-            for fname in os.listdir(download_folder):
-                if fname.endswith(".nc"):
-                    fpath = os.path.join(download_folder, fname)
-                    if fpath not in seen_paths:
-                        self.dlg.comboStatsLayer.addItem(fpath)
-                        seen_paths.add(fpath)
+        if self.current_coverage is not None:
+            # Statistics pooled over all the files of the last catalog query
+            self.dlg.comboStatsLayer.addItem(f"Catalog query: {self.current_coverage.describe()}",
+                                             self.current_coverage)
+        for path in self.catalog_paths():
+            self.dlg.comboStatsLayer.addItem(path, path)
 
     def populate_bivariate_vars(self):
         """
         Populate the primary and secondary variable combo boxes for bivariate statistics.
-        This function collects all NetCDF files from both loaded QGIS layers and the current download folder,
-        removes duplicates, and fills the combo boxes.
+        The NetCDF files come from the catalog (see catalog_paths), which is kept
+        up to date by refresh_catalog instead of rescanning directories here.
         """
         self.dlg.comboPrimaryVar.clear()
         self.dlg.comboSecondaryVar.clear()
-        file_paths = set()
-
-        # 1. Collect NetCDF files from loaded QGIS raster layers
-        for layer in QgsProject.instance().mapLayers().values():
-            if isinstance(layer, QgsRasterLayer):
-                source = layer.source()
-                if source.lower().endswith('.nc') or 'NETCDF:' in source.upper():
-                    if 'NETCDF:"' in source:
-                        path = source.split('NETCDF:"')[-1].split('"')[0]
-                    else:
-                        path = source
-                    if os.path.exists(path):
-                        file_paths.add(path)
-
-        # 2. Collect NetCDF files from the current download folder
-        download_folder = self.dlg.lineFolder.text().strip()
-        if download_folder and os.path.exists(download_folder):
-            for fname in os.listdir(download_folder):
-                if fname.endswith(".nc"):
-                    fpath = os.path.join(download_folder, fname)
-                    file_paths.add(fpath)
-
-        # 3. Fill the combo boxes with all unique NetCDF file paths
-        for fpath in sorted(file_paths):
+        for fpath in self.catalog_paths():
             fname = os.path.basename(fpath)
             self.dlg.comboPrimaryVar.addItem(fname, fpath)
             self.dlg.comboSecondaryVar.addItem(fname, fpath)
@@ -1034,6 +1329,56 @@ class CAMSDataManager:
             stats.append('std')
         return stats
 
+    @property
+    def result_cache(self):
+        """
+        Persistent analysis result cache, opened on first use.
+        """
+        if self._result_cache is None:
+            self._result_cache = ResultCache()
+        return self._result_cache
+
+    def start_task(self, task, on_result, error_title, progress_bar=None, on_partial=None):
+        """
+        Queue an analysis in the QGIS task manager and route its signals.
+
+        The task runs in a background thread; its results arrive on the main
+        thread through the callbacks, so several analyses can run at once and
+        can be cancelled from the task manager.
+
+        Args:
+            task: tools.tasks.AnalysisTask.
+            on_result: Called with the job's return value.
+            error_title: Title of the message box shown if the job fails.
+            progress_bar: Optional progress bar following the task progress.
+            on_partial: Optional callback for the partial results of the job.
+        """
+        description = task.description()
+        self._tasks.add(task)
+        if progress_bar is not None:
+            progress_bar.setRange(0, 100)
+            progress_bar.setValue(0)
+            task.progressChanged.connect(lambda value: progress_bar.setValue(int(value)))
+
+        def on_failed(message):
+            if progress_bar is not None:
+                progress_bar.setValue(0)
+            QMessageBox.critical(self.dlg, error_title, f"Error: {message}")
+
+        def on_cancelled():
+            if progress_bar is not None:
+                progress_bar.setValue(0)
+            print(f"[INFO] {description} cancelled")
+
+        if on_partial is not None:
+            task.partialResult.connect(on_partial)
+        task.resultReady.connect(on_result)
+        task.failed.connect(on_failed)
+        task.cancelled.connect(on_cancelled)
+        task.taskCompleted.connect(lambda: self._tasks.discard(task))
+        task.taskTerminated.connect(lambda: self._tasks.discard(task))
+        QgsApplication.taskManager().addTask(task)
+
     def on_aggregate_clicked(self):
         selected_items = self.dlg.listNetcdfLayers.selectedItems()
         if not selected_items:
@@ -1041,168 +1386,299 @@ class CAMSDataManager:
             return
         file_paths = [item.text() for item in selected_items]
         agg_type = self.dlg.comboAggType.currentText()
-        agg_map = {"Daily": "1D", "Weekly": "1W", "Monthly": "1M", "Quarterly": "1Q", "Yearly": "1Y"}
-        resample_str = agg_map.get(agg_type, "1M")
+        resample_str = AGGREGATION_FREQUENCIES.get(agg_type, "1M")
         output_path = self.dlg.lineOutputPath.text().strip()
         if not output_path:
             QMessageBox.warning(self.dlg, "No output path", "Please specify an output file path.")
             return
+        if agg_type == "Mosaic (VRT)":
+            self.build_mosaic(file_paths, output_path)
+            return
+        load_to_qgis = self.dlg.checkLoadToQgis.isChecked()
+
+        def on_result(lineage):
+            self.dlg.progressBarAgg.setValue(100)
+            self.register_in_catalog(output_path, "aggregate", lineage)
+            if load_to_qgis:
+                self.load_data_to_qgis(output_path)
+            QMessageBox.information(self.dlg, "Aggregation Complete", f"Aggregated file saved to:\n{output_path}")
+
+        task = AnalysisTask(f"CAMS {agg_type.lower()} aggregation: {os.path.basename(output_path)}",
+                            aggregation_job, file_paths, output_path, resample_str)
+        self.start_task(task, on_result, "Aggregation Failed", self.dlg.progressBarAgg)
+
+    def build_mosaic(self, file_paths, output_path):
+        """
+        Stack the time steps of the selected files into a virtual VRT layer.
+
+        No data is copied: the VRT references the bands of the NetCDF files in
+        time order. If the output VRT already exists, the files are appended.
+
+        Args:
+            file_paths: Selected NetCDF files.
+            output_path: VRT path (the extension is forced to .vrt).
+        """
+        if not output_path.lower().endswith(".vrt"):
+            output_path = os.path.splitext(output_path)[0] + ".vrt"
         try:
             self.dlg.progressBarAgg.setRange(0, 0)
-            import xarray as xr
-            QMessageBox.information(self.dlg, "Selected Files", "\n".join(file_paths))
-            ds = xr.open_mfdataset(file_paths, combine='by_coords', engine='netcdf4', chunks={})
-            # Force all variables to numpy, avoid dask
-            for v in ds.data_vars:
-                ds[v] = ds[v].compute()
-            agg_ds = ds.resample(time=resample_str).mean()
-            agg_ds = agg_ds.compute()
-            agg_ds.to_netcdf(output_path)
+            if os.path.exists(output_path):
+                n_bands = append_to_mosaic(output_path, file_paths)
+            else:
+                n_bands = build_time_mosaic(file_paths, output_path)
             self.dlg.progressBarAgg.setRange(0, 100)
             self.dlg.progressBarAgg.setValue(100)
             if self.dlg.checkLoadToQgis.isChecked():
-                self.load_data_to_qgis(output_path)
-            QMessageBox.information(self.dlg, "Aggregation Complete", f"Aggregated file saved to:\n{output_path}")
+                self.load_mosaic_to_qgis(output_path)
+            QMessageBox.information(self.dlg, "Mosaic Complete",
+                                    f"Virtual mosaic with {n_bands} time steps saved to:\n{output_path}")
         except Exception as e:
             self.dlg.progressBarAgg.setRange(0, 100)
             self.dlg.progressBarAgg.setValue(0)
-            QMessageBox.critical(self.dlg, "Aggregation Failed", f"Error: {str(e)}")
+            QMessageBox.critical(self.dlg, "Mosaic Failed", f"Error: {str(e)}")
+
+    def load_mosaic_to_qgis(self, vrt_path):
+        """
+        Add a VRT time mosaic to QGIS, styled and bound to the temporal controller.
+
+        Args:
+            vrt_path: Path of a VRT written by build_time_mosaic.
+        """
+        layer = QgsRasterLayer(vrt_path, os.path.splitext(os.path.basename(vrt_path))[0], "gdal")
+        if not layer.isValid():
+            QMessageBox.critical(self.dlg, "Load Failed", f"Failed to load mosaic '{vrt_path}'.")
+            return
+        stats = read_band_statistics(vrt_path)
+        if stats is not None:
+            apply_pollutant_style(layer, read_vrt_sources(vrt_path)[0]["variable"], stats)
+        QgsProject.instance().addMapLayer(layer)
+        try:
+            binding = TemporalBandBinding.from_gdal(layer, vrt_path, vrt_band_times(vrt_path))
+        except Exception as e:
+            print(f"[WARNING] Layer not bound to the temporal controller: {e}")
+            return
+        self.attach_temporal_binding(layer, binding)
 
     def on_browse_output(self):
-        out_path, _ = QFileDialog.getSaveFileName(self.dlg, "Select Output NetCDF File", "", "NetCDF Files (*.nc)")
+        out_path, _ = QFileDialog.getSaveFileName(
+            self.dlg, "Select Output File", "", "NetCDF Files (*.nc);;Virtual Mosaic (*.vrt)")
         if out_path:
             self.dlg.lineOutputPath.setText(out_path)
 
     def on_run_stats_clicked(self):
-        file_path = self.dlg.comboStatsLayer.currentText().strip()
-        if not file_path or not os.path.exists(file_path):
-            QMessageBox.warning(self.dlg, "No file selected", "Please select a valid NetCDF file.")
-            return
+        source = self.dlg.comboStatsLayer.currentData()
+        if isinstance(source, Coverage):
+            # Catalog query: statistics pooled over all the covering files
+            paths = source.paths
+        else:
+            file_path = self.dlg.comboStatsLayer.currentText().strip()
+            if not file_path or not os.path.exists(file_path):
+                QMessageBox.warning(self.dlg, "No file selected", "Please select a valid NetCDF file.")
+                return
+            paths = [file_path]
         stats = self.get_selected_stats()
         if not stats:
             QMessageBox.warning(self.dlg, "No statistics selected", "Please select at least one statistic.")
             return
         try:
-            ds = xr.open_dataset(file_path)
-            var_names = [v for v in ds.data_vars if ds[v].ndim > 0 and v.lower() not in {"spatial_ref", "crs", "grid_mapping"}]
-            if not var_names:
+            # The headers are enough to find the variables and look up the cache
+            headers = [read_header(path) for path in paths]
+            var_names = [header.first_data_variable for header in headers]
+            if None in var_names:
                 QMessageBox.warning(self.dlg, "No valid variable", "No valid scientific variable found in this file.")
                 return
             var_name = var_names[0]
-            data = ds[var_name]
-            arr = data.values.flatten()  # Merge all spatial pixels
-            # Process missing_value/-999/999/.FillValue
-            missing_vals = set()
-            for attr in ["missing_value", "_FillValue"]:
-                if attr in data.attrs:
-                    missing_vals.add(data.attrs[attr])
-            missing_vals.update([-999, 999])
-            for mv in missing_vals:
-                arr = np.where(arr == mv, np.nan, arr)
-            results = []
-            if 'mean' in stats:
-                results.append(f"Mean: {float(np.nanmean(arr)):.4f}")
-            if 'max' in stats:
-                results.append(f"Max: {float(np.nanmax(arr)):.4f}")
-            if 'min' in stats:
-                results.append(f"Min: {float(np.nanmin(arr)):.4f}")
-            if 'std' in stats:
-                results.append(f"Std. Dev: {float(np.nanstd(arr)):.4f}")
-            self.dlg.textStatsResult.setPlainText("\n".join(results))
+            fill_values = [header.fill_values(name) for header, name in zip(headers, var_names)]
+            cache_params = {"fill_values": fill_values[0] if len(paths) == 1 else fill_values}
+            # Reuse the result of a previous scan if the files have not changed
+            values = self.result_cache.get(paths, var_name, "statistics", cache_params)
         except Exception as e:
             QMessageBox.critical(self.dlg, "Statistics Failed", f"Error: {str(e)}")
+            return
+        if values is not None:
+            record = {"stage": "final", "exact": True, "values": values, "errors": {}}
+            self.dlg.textStatsResult.setPlainText(format_statistics(record, stats))
+            return
+
+        def on_partial(record):
+            # Estimates are refined in place as more chunks are read
+            self.dlg.textStatsResult.setPlainText(format_statistics(record, stats))
+
+        def on_result(record):
+            self.dlg.textStatsResult.setPlainText(format_statistics(record, stats))
+            self.result_cache.put(paths, var_name, "statistics", cache_params, record["values"])
+
+        self.dlg.textStatsResult.setPlainText("Reading data...")
+        task = AnalysisTask(f"CAMS statistics: {os.path.basename(paths[0])}"
+                            + (f" and {len(paths) - 1} more" if len(paths) > 1 else ""),
+                            statistics_job, paths, var_names)
+        self.start_task(task, on_result, "Statistics Failed", on_partial=on_partial)
 
     def on_run_bivariate_clicked(self):
+        if self.dlg.comboAnalysisMethod.currentText() == "Intercomparison Matrix":
+            self.run_intercomparison_matrix()
+            return
         file1 = self.dlg.comboPrimaryVar.currentData()
         file2 = self.dlg.comboSecondaryVar.currentData()
         if not file1 or not file2:
             QMessageBox.warning(self.dlg, "No file selected", "Please select two NetCDF files for analysis.")
             return
         try:
-            import xarray as xr
-            import numpy as np
-            ds1 = xr.open_dataset(file1)
-            ds2 = xr.open_dataset(file2)
-            # Automatically recognize primary variable
-            var_names1 = [v for v in ds1.data_vars if ds1[v].ndim > 0 and v.lower() not in {"spatial_ref", "crs", "grid_mapping"}]
-            var_names2 = [v for v in ds2.data_vars if ds2[v].ndim > 0 and v.lower() not in {"spatial_ref", "crs", "grid_mapping"}]
-            if not var_names1 or not var_names2:
+            # Automatically recognize primary variable from the headers
+            header1 = read_header(file1)
+            header2 = read_header(file2)
+            var1 = header1.first_data_variable
+            var2 = header2.first_data_variable
+            if var1 is None or var2 is None:
                 QMessageBox.warning(self.dlg, "No valid variable", "No valid scientific variable found in one of the files.")
                 return
-            var1 = var_names1[0]
-            var2 = var_names2[0]
-            data1 = ds1[var1].values.flatten()
-            data2 = ds2[var2].values.flatten()
-            # Process invalid values
-            missing_vals1 = set()
-            for attr in ["missing_value", "_FillValue"]:
-                if attr in ds1[var1].attrs:
-                    missing_vals1.add(ds1[var1].attrs[attr])
-            missing_vals1.update([-999, 999])
-            for mv in missing_vals1:
-                data1 = np.where(data1 == mv, np.nan, data1)
-            missing_vals2 = set()
-            for attr in ["missing_value", "_FillValue"]:
-                if attr in ds2[var2].attrs:
-                    missing_vals2.add(ds2[var2].attrs[attr])
-            missing_vals2.update([-999, 999])
-            for mv in missing_vals2:
-                data2 = np.where(data2 == mv, np.nan, data2)
-            # Align lengths
-            min_len = min(len(data1), len(data2))
-            data1 = data1[:min_len]
-            data2 = data2[:min_len]
-            mask = ~np.isnan(data1) & ~np.isnan(data2)
-            data1 = data1[mask]
-            data2 = data2[mask]
             method = self.dlg.comboAnalysisMethod.currentText()
-            if method == "Correlation":
-                from scipy.stats import pearsonr
-                if len(data1) == 0 or len(data2) == 0:
-                    self.dlg.textBivariateResult.setPlainText("No valid data for correlation.")
-                    return
-                corr, pval = pearsonr(data1, data2)
-                result = f"Pearson correlation: {corr:.4f}\np-value: {pval:.4g}"
-                self.dlg.textBivariateResult.setPlainText(result)
-            elif method == "Linear Regression":
-                from scipy.stats import linregress
-                if len(data1) == 0 or len(data2) == 0:
-                    self.dlg.textBivariateResult.setPlainText("No valid data for regression.")
+            cache_params = {"method": method, "fill_values": [header1.fill_values(var1), header2.fill_values(var2)]}
+            if method == "Categorical Skill Scores":
+                edges = self.ask_class_edges(var1)
+                if edges is None:
                     return
-                reg = linregress(data1, data2)
-                result = (
-                    f"Linear regression:\n"
-                    f"y = {reg.slope:.4f} * x + {reg.intercept:.4f}\n"
-                    f"R² = {reg.rvalue**2:.4f}\n"
-                    f"p-value = {reg.pvalue:.4g}\n"
-                    f"StdErr = {reg.stderr:.4g}"
-                )
-                self.dlg.textBivariateResult.setPlainText(result)
-            elif method == "Classification Accuracy":
-                try:
-                    from sklearn.metrics import accuracy_score
-                except ImportError:
-                    self.dlg.textBivariateResult.setPlainText("scikit-learn is required for classification accuracy analysis.")
-                    return
-                if len(data1) == 0 or len(data2) == 0:
-                    self.dlg.textBivariateResult.setPlainText("No valid data for classification accuracy.")
-                    return
-                try:
-                    y_true = data1.astype(int)
-                    y_pred = data2.astype(int)
-                except Exception:
-                    y_true = data1.astype(str)
-                    y_pred = data2.astype(str)
-                acc = accuracy_score(y_true, y_pred)
-                result = (
-                    f"Classification accuracy: {acc:.4f}\n"
-                    f"Total samples: {len(y_true)}"
-                )
-                self.dlg.textBivariateResult.setPlainText(result)
-            else:
-                self.dlg.textBivariateResult.setPlainText("This analysis method is not implemented yet.")
+                cache_params["edges"] = edges
+            # Reuse the result of a previous run if neither file has changed
+            cached = self.result_cache.get([file1, file2], [var1, var2], "bivariate", cache_params)
         except Exception as e:
             QMessageBox.critical(self.dlg, "Bivariate Analysis Failed", f"Error: {str(e)}")
+            return
+        if cached is not None:
+            self.dlg.textBivariateResult.setPlainText(cached["text"])
+            return
+        if method == "Per-pixel Correlation Map":
+            self.run_pixel_correlation_map(file1, var1, file2, var2)
+            return
+
+        def on_result(result):
+            text, complete = result
+            if complete:
+                self.result_cache.put([file1, file2], [var1, var2], "bivariate", cache_params, {"text": text})
+            self.dlg.textBivariateResult.setPlainText(text)
+
+        task = AnalysisTask(f"CAMS {method.lower()}: {os.path.basename(file1)} / {os.path.basename(file2)}",
+                            bivariate_job, file1, var1, file2, var2, method, cache_params.get("edges"))
+        self.start_bivariate_task(task, on_result, "Bivariate Analysis Failed")
+
+    def start_bivariate_task(self, task, on_result, error_title):
+        """
+        Queue a bivariate task, showing its progress in the result box until it finishes.
+        """
+        label = task.description()
+        self.dlg.textBivariateResult.setPlainText(f"{label}: reading data...")
+        task.progressChanged.connect(
+            lambda value: self.dlg.textBivariateResult.setPlainText(f"{label}: {value:.0f}% read..."))
+        self.start_task(task, on_result, error_title)
+
+    def ask_class_edges(self, variable):
+        """
+        Ask for the class edges of a categorical evaluation.
+
+        The European AQI bands of the variable are proposed when configured.
+
+        Args:
+            variable: NetCDF variable name of the reference file.
+
+        Returns:
+            list: Increasing class edges, or None if cancelled or invalid.
+        """
+        default = class_edges_for(variable) or []
+        text, ok = QInputDialog.getText(
+            self.dlg, "Class Edges",
+            "Upper class edges (comma separated, µg/m³):",
+            text=", ".join(f"{e:g}" for e in default))
+        if not ok:
+            return None
+        try:
+            edges = [float(v) for v in text.replace(";", ",").split(",") if v.strip()]
+        except ValueError:
+            edges = []
+        if not edges or any(b <= a for a, b in zip(edges, edges[1:])):
+            QMessageBox.warning(self.dlg, "Invalid class edges",
+                                "Enter at least one edge, in strictly increasing order.")
+            return None
+        return edges
+
+    def run_pixel_correlation_map(self, file1, var1, file2, var2):
+        """
+        Compute r, slope, intercept, R² and p-value for every grid cell along time.
+
+        The aligned pair is streamed chunk by chunk into per-cell sufficient
+        statistics in a background task, and the maps are written as a
+        multi-band GeoTIFF that is then added to the QGIS project.
+
+        Args:
+            file1, var1: Primary file and variable.
+            file2, var2: Secondary file and variable.
+        """
+        out_path, _ = QFileDialog.getSaveFileName(
+            self.dlg, "Save Correlation Map", "", "GeoTIFF Files (*.tif)")
+        if not out_path:
+            return
+        if not out_path.lower().endswith(".tif"):
+            out_path += ".tif"
+
+        def on_result(result):
+            self.dlg.textBivariateResult.setPlainText(result)
+            layer = QgsRasterLayer(out_path, os.path.splitext(os.path.basename(out_path))[0], "gdal")
+            if layer.isValid():
+                QgsProject.instance().addMapLayer(layer)
+
+        task = AnalysisTask(f"CAMS correlation map: {os.path.basename(out_path)}",
+                            pixel_correlation_job, file1, var1, file2, var2, out_path)
+        self.start_bivariate_task(task, on_result, "Correlation Map Failed")
+
+    def run_intercomparison_matrix(self):
+        """
+        Compare all NetCDF files selected in the file list against each other.
+
+        All inputs are aligned on common time steps and grid and read once,
+        chunk by chunk; correlation, RMSE and mean bias are accumulated for
+        every pair and written as one square CSV table per metric.
+        """
+        paths = [item.text() for item in self.dlg.listNetcdfLayers.selectedItems()]
+        if len(paths) < 2:
+            QMessageBox.warning(self.dlg, "Not enough files",
+                                "Select at least two NetCDF files in the file list to build an intercomparison matrix.")
+            return
+        try:
+            variables = []
+            fill_values = []
+            for path in paths:
+                header = read_header(path)
+                if header.first_data_variable is None:
+                    QMessageBox.warning(self.dlg, "No valid variable", f"No valid scientific variable found in {path}.")
+                    return
+                variables.append(header.first_data_variable)
+                fill_values.append(header.fill_values(header.first_data_variable))
+            cache_params = {"fill_values": fill_values}
+            cached = self.result_cache.get(paths, variables, "intercomparison_matrices", cache_params)
+        except Exception as e:
+            QMessageBox.critical(self.dlg, "Intercomparison Failed", f"Error: {str(e)}")
+            return
+        out_path, _ = QFileDialog.getSaveFileName(
+            self.dlg, "Save Intercomparison Tables", "", "CSV Files (*.csv)")
+        if not out_path:
+            return
+
+        def show_report(result):
+            try:
+                self.dlg.textBivariateResult.setPlainText(intercomparison_report(result, out_path))
+            except Exception as e:
+                QMessageBox.critical(self.dlg, "Intercomparison Failed", f"Error: {str(e)}")
+
+        def on_result(result):
+            self.result_cache.put(paths, variables, "intercomparison_matrices", cache_params, result)
+            show_report(result)
+
+        # The matrices are cached; the tables are always written to the chosen path
+        if cached is not None:
+            show_report(cached)
+            return
+        task = AnalysisTask(f"CAMS intercomparison of {len(paths)} files", intercomparison_job,
+                            paths, variables)
+        self.start_bivariate_task(task, on_result, "Intercomparison Failed")
 
     def on_layers_changed(self):
         """
@@ -1243,6 +1719,7 @@ class CAMSDataManager:
             self.setup_checkbox_dictionaries()
             self.setup_year_month_defaults()
             self.setup_connections()
+            self.refresh_availability()
             
         # These operations need to be performed every time the plugin is opened
         # Populate vector layers dropdown
@@ -25,7 +25,7 @@ import os
 
 from qgis.PyQt import uic
 from qgis.PyQt import QtWidgets
-from .tools.ui_handler import AVAILABILITY
+from .tools.ui_handler import available_years
 
 # This loads your .ui file so that PyQt can populate your plugin with the elements from Qt Designer
 FORM_CLASS, _ = uic.loadUiType(os.path.join(
@@ -76,7 +76,7 @@ class CAMSDataManagerDialog(QtWidgets.QDialog, FORM_CLASS):
         var = self.comboVariable.currentText()
         model = self.comboModel.currentText()
         typ = self.comboType.currentText()
-        years = AVAILABILITY.get((var, model, typ), [])
+        years = available_years(var, model, typ)
         # Robustness: if there are no available years, show a warning and disable all checkboxes
         if not years:
             for year, cb in self.yearCheckBox.items():
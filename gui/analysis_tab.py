@@ -4,9 +4,15 @@ from PyQt5.QtWidgets import QWidget, QMessageBox
 import xarray as xr
 import logging
 
+from ..tools.catalog import Catalog
+from ..tools.nc_header import read_header
+
 class AnalysisTab(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        # One catalog for the tab, refreshed once per refresh() rather than per list
+        self.catalog = Catalog()
+        self._catalog_refreshed = False
         ui_path = os.path.join(os.path.dirname(__file__), "..", "cams_data_manager_dialog_base.ui")
         uic.loadUi(ui_path, self)
 
@@ -26,19 +32,29 @@ class AnalysisTab(QWidget):
         """
         Unified refresh for all contents in the Analysis tab, convenient for future extension.
         """
+        self._catalog_refreshed = False
         self.populate_netcdf_list()
         self.populate_stats_layer_combo()
         self.populate_bivariate_vars()
         # Future: refresh statistics variables, clear results, etc.
 
+    def catalog_paths(self):
+        """
+        NetCDF files of ~/CAMS_Data, from the file catalog (refreshed incrementally,
+        once per refresh of the tab).
+        """
+        if not self._catalog_refreshed:
+            netcdf_dir = os.path.expanduser("~/CAMS_Data")
+            if not os.path.exists(netcdf_dir):
+                os.makedirs(netcdf_dir, exist_ok=True)
+            self.catalog.refresh_directory(netcdf_dir)
+            self._catalog_refreshed = True
+        return [record["path"] for record in self.catalog.files()]
+
     def populate_netcdf_list(self):
         self.listNetcdfLayers.clear()
-        netcdf_dir = os.path.expanduser("~/CAMS_Data")
-        if not os.path.exists(netcdf_dir):
-            os.makedirs(netcdf_dir, exist_ok=True)
-        for fname in os.listdir(netcdf_dir):
-            if fname.endswith(".nc"):
-                self.listNetcdfLayers.addItem(os.path.join(netcdf_dir, fname))
+        for path in self.catalog_paths():
+            self.listNetcdfLayers.addItem(path)
 
     def populate_stats_layer_combo(self):
         """
@@ -46,12 +62,8 @@ class AnalysisTab(QWidget):
         """
         if hasattr(self, 'comboStatsLayer'):
             self.comboStatsLayer.clear()
-            netcdf_dir = os.path.expanduser("~/CAMS_Data")
-            if not os.path.exists(netcdf_dir):
-                os.makedirs(netcdf_dir, exist_ok=True)
-            for fname in os.listdir(netcdf_dir):
-                if fname.endswith(".nc"):
-                    self.comboStatsLayer.addItem(os.path.join(netcdf_dir, fname))
+            for path in self.catalog_paths():
+                self.comboStatsLayer.addItem(path)
 
     def populate_bivariate_vars(self):
         """
@@ -65,8 +77,8 @@ class AnalysisTab(QWidget):
             if not file_path or not os.path.exists(file_path):
                 return
             try:
-                ds = xr.open_dataset(file_path)
-                var_names = list(ds.data_vars.keys())
+                # Header only: no data is decoded to list the variables
+                var_names = read_header(file_path).data_variables
                 for v in var_names:
                     self.comboPrimaryVar.addItem(v)
                     self.comboSecondaryVar.addItem(v)
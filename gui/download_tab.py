@@ -9,7 +9,7 @@ from PyQt5 import uic
 from PyQt5.QtWidgets import QWidget, QMessageBox, QProgressDialog
 
 # Import helper modules
-from ..tools.ui_handler import collect_download_parameters, AVAILABILITY
+from ..tools.ui_handler import collect_download_parameters, available_years
 from ..tools.downloader import submit_cams_request
 from ..tools.validator import validate_params
 
@@ -216,7 +216,7 @@ class DownloadTab(QWidget):
         var = self.comboVariable.currentText()
         model = self.comboModel.currentText()
         typ = self.comboType.currentText()
-        years = AVAILABILITY.get((var, model, typ), [])
+        years = available_years(var, model, typ)
         for year, cb in self.yearCheckBox.items():
             cb.setEnabled(year in years)
             if year not in years:
@@ -0,0 +1,3 @@
+"""
+QGIS Processing provider of the CAMS Data Manager plugin.
+"""
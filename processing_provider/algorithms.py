@@ -0,0 +1,429 @@
+"""
+This module wraps the download, clip, aggregation and statistics engines of
+tools/ as QGIS Processing algorithms. Processing runs them as background
+tasks, so they never touch the GUI; they report progress to the feedback
+object and stop at the next request, file or chunk when cancelled.
+"""
+
+import os
+
+import numpy as np
+
+from qgis.PyQt.QtCore import QCoreApplication, QVariant
+from qgis.core import (
+    QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsFeature, QgsFeatureSink, QgsField, QgsFields,
+    QgsGeometry, QgsPoint, QgsProcessing, QgsProcessingAlgorithm, QgsProcessingException,
+    QgsProcessingOutputMultipleLayers, QgsProcessingOutputNumber, QgsProcessingParameterEnum,
+    QgsProcessingParameterExtent, QgsProcessingParameterFeatureSink, QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterFile, QgsProcessingParameterFileDestination, QgsProcessingParameterFolderDestination,
+    QgsProcessingParameterMultipleLayers, QgsProcessingParameterString
+)
+
+from ..tools.aggregation import AGGREGATION_FREQUENCIES, aggregate_files
+from ..tools.alignment import LAT_NAMES, LON_NAMES
+from ..tools.analysis_jobs import zonal_statistics_job
+from ..tools.aoi_utils import clip_netcdf_by_bbox, clip_netcdf_by_shapefile
+from ..tools.batch import download_request
+from ..tools.catalog import Catalog
+from ..tools.config import DEFAULT_DOWNLOAD_DIR
+from ..tools.download_plan import plan_downloads, split_download
+from ..tools.nc_header import read_header
+from ..tools.nc_reader import VariableReader, open_dataset
+from ..tools.statistics import iter_pooled_statistics
+from ..tools.ui_handler import VARIABLE_MAP, MODEL_MAP, TYPE_MAP
+
+WGS84 = QgsCoordinateReferenceSystem("EPSG:4326")
+NETCDF_FILTER = "NetCDF files (*.nc)"
+STATISTICS = ("mean", "min", "max", "std")
+
+
+def _split_values(text, width=None):
+    """
+    Values of a comma-separated parameter, e.g. "2021, 2022" or "1,2,3".
+
+    Args:
+        width: Zero-pad numeric values to this width (e.g. 2 for months).
+    """
+    values = [value.strip() for value in text.replace(";", ",").split(",") if value.strip()]
+    if width:
+        values = [value.zfill(width) for value in values]
+    return values
+
+
+def _register(path, kind, lineage, feedback):
+    """Record an output in the plugin catalog; a failure only warns."""
+    try:
+        Catalog().register(path, kind, lineage)
+    except Exception as e:
+        feedback.reportError(f"Not added to the catalog: {e}", False)
+
+
+class VariableReaders:
+    """
+    Readers of one variable in several NetCDF files, closed on exit.
+    """
+
+    def __init__(self, paths, variable=None):
+        if not paths:
+            raise QgsProcessingException("No input NetCDF file.")
+        self.paths = paths
+        self.variable = variable or read_header(paths[0]).first_data_variable
+        if not self.variable:
+            raise QgsProcessingException(f"No data variable found in {paths[0]}.")
+        self.datasets = []
+
+    def __enter__(self):
+        readers = []
+        for path in self.paths:
+            ds = open_dataset(path)
+            self.datasets.append(ds)
+            if self.variable not in ds:
+                raise QgsProcessingException(f"Variable '{self.variable}' not found in {path}.")
+            readers.append(VariableReader(ds[self.variable]))
+        return readers
+
+    def __exit__(self, *exc):
+        for ds in self.datasets:
+            ds.close()
+        return False
+
+
+class CAMSAlgorithm(QgsProcessingAlgorithm):
+    """
+    Common boilerplate of the CAMS algorithms.
+    """
+
+    GROUP = "data"
+
+    def tr(self, string):
+        return QCoreApplication.translate("Processing", string)
+
+    def createInstance(self):
+        return type(self)()
+
+    def group(self):
+        return self.tr({"data": "Data", "analysis": "Analysis"}[self.GROUP])
+
+    def groupId(self):
+        return self.GROUP
+
+
+class DownloadAlgorithm(CAMSAlgorithm):
+    """
+    Download CAMS reanalyses from ADS with as few requests as possible.
+    """
+
+    VARIABLES = "VARIABLES"
+    MODELS = "MODELS"
+    LEVELS = "LEVELS"
+    TYPE = "TYPE"
+    YEARS = "YEARS"
+    MONTHS = "MONTHS"
+    OUTPUT = "OUTPUT"
+    FILES = "FILES"
+
+    def name(self):
+        return "download"
+
+    def displayName(self):
+        return self.tr("Download CAMS data")
+
+    def shortHelpString(self):
+        return self.tr("Downloads every combination of the selected variables, models, levels, years and "
+                       "months that ADS provides, packed into as few requests as possible. Months that "
+                       "are not available are reported and skipped; ZIPs already in the output folder "
+                       "are reused. Needs an ADS API key in ~/.cdsapirc.")
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterEnum(
+            self.VARIABLES, self.tr("Variables"), options=list(VARIABLE_MAP), allowMultiple=True))
+        self.addParameter(QgsProcessingParameterEnum(
+            self.MODELS, self.tr("Models"), options=list(MODEL_MAP), allowMultiple=True, defaultValue=[0]))
+        self.addParameter(QgsProcessingParameterString(
+            self.LEVELS, self.tr("Levels (m, comma-separated)"), defaultValue="0"))
+        self.addParameter(QgsProcessingParameterEnum(
+            self.TYPE, self.tr("Data type"), options=list(TYPE_MAP), defaultValue=0))
+        self.addParameter(QgsProcessingParameterString(self.YEARS, self.tr("Years (comma-separated)")))
+        self.addParameter(QgsProcessingParameterString(
+            self.MONTHS, self.tr("Months (comma-separated)"), defaultValue=",".join(str(m) for m in range(1, 13))))
+        self.addParameter(QgsProcessingParameterFolderDestination(
+            self.OUTPUT, self.tr("Output folder"), defaultValue=DEFAULT_DOWNLOAD_DIR))
+        self.addOutput(QgsProcessingOutputMultipleLayers(self.FILES, self.tr("NetCDF files")))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        variables = [list(VARIABLE_MAP.values())[i]
+                     for i in self.parameterAsEnums(parameters, self.VARIABLES, context)]
+        models = [list(MODEL_MAP.values())[i] for i in self.parameterAsEnums(parameters, self.MODELS, context)]
+        data_type = list(TYPE_MAP.values())[self.parameterAsEnum(parameters, self.TYPE, context)]
+        levels = _split_values(self.parameterAsString(parameters, self.LEVELS, context))
+        years = _split_values(self.parameterAsString(parameters, self.YEARS, context))
+        months = _split_values(self.parameterAsString(parameters, self.MONTHS, context), 2)
+        folder = self.parameterAsString(parameters, self.OUTPUT, context)
+        if not (variables and models and levels and years and months):
+            raise QgsProcessingException(self.tr("Select at least one variable, model, level, year and month."))
+        os.makedirs(folder, exist_ok=True)
+
+        plan = plan_downloads(variables, models, levels, [data_type], years, months)
+        feedback.pushInfo(plan.describe())
+        for cell in plan.unavailable:
+            feedback.reportError(self.tr("Not available: ") + " ".join(cell), False)
+        if not plan.requests:
+            raise QgsProcessingException(self.tr("Nothing to download: no selected month is available."))
+
+        catalog = Catalog()
+        files = []
+        for i, request in enumerate(plan.requests):
+            if feedback.isCanceled():
+                break
+            feedback.pushInfo(f"Request {i + 1}/{len(plan.requests)}: {request!r}")
+            try:
+                zip_path, _ = download_request(request, folder)
+            except Exception as e:
+                raise QgsProcessingException(f"CDS API request failed: {e}")
+            found, missing, _ = split_download(zip_path, request, catalog)
+            if missing:
+                feedback.reportError(f"{len(missing)} requested month(s) missing from {zip_path}", False)
+            files.extend(found[cell] for cell in sorted(found))
+            feedback.setProgress(100.0 * (i + 1) / len(plan.requests))
+        return {self.OUTPUT: folder, self.FILES: files}
+
+
+class ClipAlgorithm(CAMSAlgorithm):
+    """
+    Clip a NetCDF file to an extent or to the polygons of a layer.
+    """
+
+    INPUT = "INPUT"
+    EXTENT = "EXTENT"
+    MASK = "MASK"
+    OUTPUT = "OUTPUT"
+
+    def name(self):
+        return "clip"
+
+    def displayName(self):
+        return self.tr("Clip NetCDF")
+
+    def shortHelpString(self):
+        return self.tr("Clips a CAMS NetCDF file to the polygons of a layer (cells touching a polygon are "
+                       "kept) or, without a mask layer, to an extent.")
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFile(self.INPUT, self.tr("NetCDF file"), extension="nc"))
+        self.addParameter(QgsProcessingParameterExtent(self.EXTENT, self.tr("Extent"), optional=True))
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.MASK, self.tr("Mask layer"), [QgsProcessing.TypeVectorPolygon], optional=True))
+        self.addParameter(QgsProcessingParameterFileDestination(self.OUTPUT, self.tr("Clipped NetCDF"), NETCDF_FILTER))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        input_nc = self.parameterAsFile(parameters, self.INPUT, context)
+        output_nc = self.parameterAsFileOutput(parameters, self.OUTPUT, context)
+        try:
+            if parameters.get(self.MASK):
+                shapefile = self.parameterAsCompatibleSourceLayerPath(
+                    parameters, self.MASK, context, ["shp"], "shp", feedback)
+                if feedback.isCanceled():
+                    return {}
+                clip_netcdf_by_shapefile(input_nc, output_nc, shapefile)
+            else:
+                extent = self.parameterAsExtent(parameters, self.EXTENT, context, WGS84)
+                if extent.isNull():
+                    raise QgsProcessingException(self.tr("Give an extent or a mask layer."))
+                clip_netcdf_by_bbox(input_nc, output_nc, extent.yMaximum(), extent.yMinimum(),
+                                    extent.xMaximum(), extent.xMinimum())
+        except QgsProcessingException:
+            raise
+        except Exception as e:
+            raise QgsProcessingException(f"Clipping failed: {e}")
+        _register(output_nc, "clipped", [input_nc], feedback)
+        feedback.setProgress(100)
+        return {self.OUTPUT: output_nc}
+
+
+class AggregateAlgorithm(CAMSAlgorithm):
+    """
+    Temporal mean of NetCDF files at a coarser frequency.
+    """
+
+    INPUTS = "INPUTS"
+    FREQUENCY = "FREQUENCY"
+    OUTPUT = "OUTPUT"
+
+    def name(self):
+        return "aggregate"
+
+    def displayName(self):
+        return self.tr("Aggregate over time")
+
+    def shortHelpString(self):
+        return self.tr("Writes the daily, weekly, monthly, quarterly or yearly mean of one or more CAMS "
+                       "NetCDF files (e.g. the monthly files of a year) to one NetCDF file.")
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterMultipleLayers(
+            self.INPUTS, self.tr("NetCDF files"), QgsProcessing.TypeFile))
+        self.addParameter(QgsProcessingParameterEnum(
+            self.FREQUENCY, self.tr("Frequency"), options=list(AGGREGATION_FREQUENCIES), defaultValue=2))
+        self.addParameter(QgsProcessingParameterFileDestination(self.OUTPUT, self.tr("Aggregated NetCDF"),
+                                                                NETCDF_FILTER))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        paths = self.parameterAsFileList(parameters, self.INPUTS, context)
+        frequency = list(AGGREGATION_FREQUENCIES.values())[self.parameterAsEnum(parameters, self.FREQUENCY, context)]
+        output_nc = self.parameterAsFileOutput(parameters, self.OUTPUT, context)
+        try:
+            lineage = aggregate_files(paths, output_nc, frequency)
+        except Exception as e:
+            raise QgsProcessingException(f"Aggregation failed: {e}")
+        _register(output_nc, "aggregate", lineage, feedback)
+        feedback.setProgress(100)
+        return {self.OUTPUT: output_nc}
+
+
+class StatisticsAlgorithm(CAMSAlgorithm):
+    """
+    Mean, min, max and std of a variable over one or more NetCDF files.
+    """
+
+    GROUP = "analysis"
+    INPUTS = "INPUTS"
+    VARIABLE = "VARIABLE"
+
+    def name(self):
+        return "statistics"
+
+    def displayName(self):
+        return self.tr("Statistics")
+
+    def shortHelpString(self):
+        return self.tr("Computes the mean, minimum, maximum and standard deviation of a variable over all "
+                       "the given NetCDF files, reading them chunk by chunk. Missing values are ignored. "
+                       "The first data variable is used if none is given.")
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterMultipleLayers(
+            self.INPUTS, self.tr("NetCDF files"), QgsProcessing.TypeFile))
+        self.addParameter(QgsProcessingParameterString(self.VARIABLE, self.tr("Variable"), optional=True))
+        for name in STATISTICS:
+            self.addOutput(QgsProcessingOutputNumber(name.upper(), self.tr(name.capitalize())))
+        self.addOutput(QgsProcessingOutputNumber("COUNT", self.tr("Count")))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        paths = self.parameterAsFileList(parameters, self.INPUTS, context)
+        variable = self.parameterAsString(parameters, self.VARIABLE, context) or None
+        record = None
+        with VariableReaders(paths, variable) as readers:
+            for record in iter_pooled_statistics(readers):
+                if feedback.isCanceled():
+                    return {}
+                feedback.setProgress(100.0 * record["fraction"])
+        results = {name.upper(): record["values"][name] for name in STATISTICS}
+        results["COUNT"] = record["count"]
+        feedback.pushInfo(", ".join(f"{k.lower()}: {v:.4f}" for k, v in results.items()))
+        return results
+
+
+class ZonalStatisticsAlgorithm(CAMSAlgorithm):
+    """
+    Statistics of a variable inside each polygon of a layer.
+    """
+
+    GROUP = "analysis"
+    INPUTS = "INPUTS"
+    VARIABLE = "VARIABLE"
+    ZONES = "ZONES"
+    OUTPUT = "OUTPUT"
+
+    def name(self):
+        return "zonalstatistics"
+
+    def displayName(self):
+        return self.tr("Zonal statistics")
+
+    def shortHelpString(self):
+        return self.tr("Copies the polygons of the zone layer with the mean, minimum, maximum, standard "
+                       "deviation and count of the variable over the grid cells whose centre lies in each "
+                       "polygon, pooled over all the given NetCDF files (which must share one grid).")
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterMultipleLayers(
+            self.INPUTS, self.tr("NetCDF files"), QgsProcessing.TypeFile))
+        self.addParameter(QgsProcessingParameterString(self.VARIABLE, self.tr("Variable"), optional=True))
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.ZONES, self.tr("Zones"), [QgsProcessing.TypeVectorPolygon]))
+        self.addParameter(QgsProcessingParameterFeatureSink(self.OUTPUT, self.tr("Zonal statistics")))
+
+    @staticmethod
+    def zone_masks(source, lat, lon, context, feedback):
+        """
+        Boolean (lat, lon) mask of the cell centres inside each feature.
+
+        Returns:
+            dict: Feature id -> mask; None if cancelled.
+        """
+        transform = QgsCoordinateTransform(source.sourceCrs(), WGS84, context.transformContext())
+        masks = {}
+        for feature in source.getFeatures():
+            if feedback.isCanceled():
+                return None
+            mask = np.zeros((lat.size, lon.size), dtype=bool)
+            geometry = QgsGeometry(feature.geometry())
+            if not geometry.isEmpty():
+                geometry.transform(transform)
+                box = geometry.boundingBox()
+                rows = np.nonzero((lat >= box.yMinimum()) & (lat <= box.yMaximum()))[0]
+                cols = np.nonzero((lon >= box.xMinimum()) & (lon <= box.xMaximum()))[0]
+                engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+                engine.prepareGeometry()
+                for i in rows:
+                    for j in cols:
+                        mask[i, j] = engine.intersects(QgsPoint(float(lon[j]), float(lat[i])))
+            masks[feature.id()] = mask
+        return masks
+
+    def processAlgorithm(self, parameters, context, feedback):
+        paths = self.parameterAsFileList(parameters, self.INPUTS, context)
+        variable = self.parameterAsString(parameters, self.VARIABLE, context) or None
+        source = self.parameterAsSource(parameters, self.ZONES, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.ZONES))
+
+        fields = QgsFields(source.fields())
+        for name in STATISTICS:
+            fields.append(QgsField(name, QVariant.Double))
+        fields.append(QgsField("count", QVariant.Int))
+        sink, dest_id = self.parameterAsSink(parameters, self.OUTPUT, context, fields, source.wkbType(),
+                                             source.sourceCrs())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        with VariableReaders(paths, variable) as readers:
+            header = read_header(paths[0])
+            lat_name, lon_name = readers[0].dims[-2:]
+            if lat_name not in LAT_NAMES or lon_name not in LON_NAMES:
+                raise QgsProcessingException(
+                    self.tr("The variable must have latitude and longitude as its last dimensions."))
+            feedback.setProgressText(self.tr("Rasterizing zones"))
+            masks = self.zone_masks(source, header.coords[lat_name], header.coords[lon_name], context, feedback)
+            if masks is None:
+                return {}
+        feedback.setProgressText(self.tr("Reading data"))
+        steps = zonal_statistics_job(paths, readers[0].name, masks)
+        try:
+            while True:
+                if feedback.isCanceled():
+                    steps.close()
+                    return {}
+                fraction, _ = next(steps)
+                feedback.setProgress(100.0 * fraction)
+        except StopIteration as stop:
+            zones = stop.value
+
+        for feature in source.getFeatures():
+            values = zones[feature.id()]
+            out = QgsFeature(fields)
+            out.setGeometry(feature.geometry())
+            out.setAttributes(feature.attributes() + [values[name] if values["count"] else None
+                                                      for name in STATISTICS] + [values["count"]])
+            sink.addFeature(out, QgsFeatureSink.FastInsert)
+        return {self.OUTPUT: dest_id}
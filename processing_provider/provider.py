@@ -0,0 +1,37 @@
+"""
+This module registers the CAMS algorithms with the QGIS Processing framework,
+so they can be chained in the Graphical Modeler, run in batch mode or called
+with qgis_process.
+"""
+
+import os
+
+from qgis.PyQt.QtGui import QIcon
+from qgis.core import QgsProcessingProvider
+
+from .algorithms import (
+    AggregateAlgorithm, ClipAlgorithm, DownloadAlgorithm, StatisticsAlgorithm, ZonalStatisticsAlgorithm
+)
+
+
+class CAMSProcessingProvider(QgsProcessingProvider):
+    """
+    Provider of the "cams" algorithms (cams:download, cams:clip, ...).
+    """
+
+    def loadAlgorithms(self):
+        for algorithm in (DownloadAlgorithm, ClipAlgorithm, AggregateAlgorithm, StatisticsAlgorithm,
+                          ZonalStatisticsAlgorithm):
+            self.addAlgorithm(algorithm())
+
+    def id(self):
+        return "cams"
+
+    def name(self):
+        return "CAMS Europe AQ"
+
+    def longName(self):
+        return "CAMS Europe air quality reanalyses"
+
+    def icon(self):
+        return QIcon(os.path.join(os.path.dirname(os.path.dirname(__file__)), "icon.png"))
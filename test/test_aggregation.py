@@ -0,0 +1,83 @@
+# coding=utf-8
+"""Temporal aggregation test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.aggregation import aggregate_files
+from tools.compute import ComputeBackend
+from tools.kernels import close_files
+
+
+class AggregationTest(unittest.TestCase):
+    """Test period means match xarray resampling over several files."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(3)
+        self.paths = []
+        # Two files of 36 hours each; the second day is split between them
+        for number, start in enumerate(["2022-01-01", "2022-01-02T12:00"]):
+            values = rng.gamma(2.0, 10.0, (36, 1, 3, 2)).astype("float32")
+            values[rng.random(values.shape) < 0.1] = np.nan
+            path = os.path.join(self.tmp_dir, f"no2_{number}.nc")
+            xr.Dataset(
+                {"no2_conc": (("time", "level", "latitude", "longitude"), values, {"units": "µg/m3"})},
+                coords={"time": pd.date_range(start, periods=36, freq="h"), "level": [0.0],
+                        "latitude": [50.0, 49.9, 49.8], "longitude": [5.0, 5.1]},
+                attrs={"title": "test"},
+            ).to_netcdf(path, encoding={"no2_conc": {"_FillValue": -999.0}})
+            self.paths.append(path)
+        # Given in reverse order: the time steps are sorted by the aggregation
+        self.paths.reverse()
+
+    def tearDown(self):
+        """Runs after each test."""
+        close_files()
+        shutil.rmtree(self.tmp_dir)
+
+    def check(self, backend):
+        output = os.path.join(self.tmp_dir, "daily.nc")
+        with backend:
+            lineage = aggregate_files(self.paths, output, "1D", backend)
+        self.assertEqual(lineage, self.paths)
+        inputs = [xr.open_dataset(path) for path in sorted(self.paths)]
+        expected = xr.concat(inputs, "time").resample(time="1D").mean().load()
+        for ds in inputs:
+            ds.close()
+        with xr.open_dataset(output) as result:
+            self.assertEqual(result["no2_conc"].dims, ("time", "level", "latitude", "longitude"))
+            self.assertEqual(result.attrs["title"], "test")
+            self.assertEqual(result["no2_conc"].attrs["units"], "µg/m3")
+            np.testing.assert_array_equal(result["time"].values, expected["time"].values)
+            np.testing.assert_allclose(result["no2_conc"].values, expected["no2_conc"].values, rtol=1e-5)
+
+    def test_inline(self):
+        self.check(ComputeBackend(workers=0))
+
+    def test_workers(self):
+        self.check(ComputeBackend(workers=2))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(AggregationTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,78 @@
+# coding=utf-8
+"""Bivariate alignment test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.alignment import AlignedGroup, AlignedPair
+from tools.nc_reader import VariableReader
+
+
+def make_dataset(start, periods, lats, lons, name="no2"):
+    """Build an in-memory CAMS-like dataset whose values encode their coordinates."""
+    times = pd.date_range(start, periods=periods, freq="h")
+    hours = np.arange(periods, dtype="float32")[:, None, None, None]
+    values = hours * 1000 + np.asarray(lats, dtype="float32")[None, None, :, None] \
+        + np.asarray(lons, dtype="float32")[None, None, None, :] * 0.01
+    return xr.Dataset(
+        {name: (("time", "level", "latitude", "longitude"), values.astype("float32"))},
+        coords={"time": times, "level": [0.0], "latitude": lats, "longitude": lons})
+
+
+class AlignedPairTest(unittest.TestCase):
+    """Test time join and regridding of two variables."""
+
+    def test_time_and_extent_join(self):
+        """Only common time steps and the common extent are compared."""
+        ds1 = make_dataset("2022-01-01 00:00", 10, np.arange(50.0, 40.0, -1.0), np.arange(0.0, 10.0))
+        ds2 = make_dataset("2022-01-01 04:00", 10, np.arange(48.0, 38.0, -1.0), np.arange(2.0, 12.0))
+        pair = AlignedPair(VariableReader(ds1["no2"]), ds1, VariableReader(ds2["no2"]), ds2)
+        self.assertIsNone(pair.regridded)
+        self.assertEqual(pair.shape, (6, 8, 8))
+        x, y = pair.read()
+        # Values encode hour index and coordinates; ds2 starts 4 hours later
+        np.testing.assert_allclose(x, y + 4000, rtol=1e-6)
+        np.testing.assert_allclose(x[0], ds1["no2"].values[4, 0, 2:, 2:])
+
+    def test_regrid_onto_coarser_grid(self):
+        """The finer grid is interpolated onto the coarser one."""
+        ds1 = make_dataset("2022-01-01", 3, np.arange(50.0, 40.0, -0.5), np.arange(0.0, 10.0, 0.5))
+        ds2 = make_dataset("2022-01-01", 3, np.arange(49.0, 41.0, -1.0), np.arange(1.0, 9.0))
+        pair = AlignedPair(VariableReader(ds1["no2"]), ds1, VariableReader(ds2["no2"]), ds2)
+        self.assertEqual(pair.regridded, 1)
+        x, y = pair.read()
+        self.assertEqual(x.shape, y.shape)
+        # Values are linear in the coordinates, so bilinear interpolation is exact
+        np.testing.assert_allclose(x, y, rtol=1e-5)
+
+    def test_group_of_three(self):
+        """Several inputs share the time steps and extent common to all."""
+        ds1 = make_dataset("2022-01-01 00:00", 10, np.arange(50.0, 40.0, -1.0), np.arange(0.0, 10.0))
+        ds2 = make_dataset("2022-01-01 02:00", 10, np.arange(50.0, 40.0, -0.5), np.arange(0.0, 10.0, 0.5))
+        ds3 = make_dataset("2022-01-01 04:00", 10, np.arange(48.0, 38.0, -1.0), np.arange(2.0, 12.0))
+        group = AlignedGroup([(VariableReader(ds["no2"]), ds) for ds in (ds1, ds2, ds3)])
+        self.assertEqual(group.regridded_inputs, [2])
+        self.assertEqual(group.shape, (6, 8, 8))
+        x, y, z = group.read()
+        np.testing.assert_allclose(x, y + 2000, rtol=1e-5)
+        np.testing.assert_allclose(x, z + 4000, rtol=1e-6)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(AlignedPairTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,98 @@
+# coding=utf-8
+"""Analysis jobs test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.analysis_jobs import bivariate_job, intercomparison_job, intercomparison_report, statistics_job
+from tools.intercomparison import MATRIX_METRICS
+from tools.result_cache import ResultCache
+
+
+def run(job):
+    """Drive a job to completion; returns (fractions, result)."""
+    fractions = []
+    try:
+        while True:
+            fractions.append(next(job)[0])
+    except StopIteration as stop:
+        return fractions, stop.value
+
+
+class AnalysisJobsTest(unittest.TestCase):
+    """Test the analyses run by the background tasks."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.values = rng.gamma(2.0, 10.0, (48, 4, 5)).astype("float32")
+        self.paths = []
+        for i, values in enumerate((self.values, self.values * 2.0)):
+            path = os.path.join(self.tmp_dir, f"model{i}.nc")
+            xr.Dataset(
+                {"no2": (("time", "latitude", "longitude"), values)},
+                coords={"time": pd.date_range("2022-01-01", periods=48, freq="h"),
+                        "latitude": [50.0, 49.9, 49.8, 49.7], "longitude": [5.0, 5.1, 5.2, 5.3, 5.4]},
+            ).to_netcdf(path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        """Runs after each test."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_statistics_job(self):
+        fractions, record = run(statistics_job(self.paths, ["no2", "no2"]))
+        self.assertEqual(fractions[-1], 1.0)
+        self.assertTrue(record["exact"])
+        self.assertAlmostEqual(record["values"]["mean"], float(self.values.mean()) * 1.5, places=3)
+
+    def test_bivariate_job(self):
+        job = bivariate_job(self.paths[0], "no2", self.paths[1], "no2", "Skill Scores")
+        fractions, (text, complete) = run(job)
+        self.assertTrue(complete)
+        self.assertEqual(fractions, sorted(fractions))
+        self.assertEqual(fractions[-1], 1.0)
+        self.assertIn(f"Mean bias = {float(self.values.mean()):.4f}", text)
+
+
+    def test_intercomparison_repeat_run(self):
+        """A cached intercomparison writes its tables again to a newly chosen path."""
+        cache = ResultCache(os.path.join(self.tmp_dir, "cache", "results.sqlite"))
+        _, result = run(intercomparison_job(self.paths, ["no2", "no2"]))
+        first = intercomparison_report(result, os.path.join(self.tmp_dir, "first.csv"))
+        cache.put(self.paths, ["no2", "no2"], "intercomparison_matrices", {}, result)
+
+        cached = cache.get(self.paths, ["no2", "no2"], "intercomparison_matrices", {})
+        out_dir = os.path.join(self.tmp_dir, "second")
+        os.makedirs(out_dir)
+        text = intercomparison_report(cached, os.path.join(out_dir, "tables.csv"))
+        written = [os.path.join(out_dir, f"tables_{metric}.csv") for metric in MATRIX_METRICS]
+        self.assertIn(f"Tables: {', '.join(written)}", text)
+        self.assertTrue(all(os.path.exists(path) for path in written))
+        with open(os.path.join(self.tmp_dir, "first_bias.csv")) as a, open(written[MATRIX_METRICS.index("bias")]) as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(first.split("Tables:")[0], text.split("Tables:")[0])
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(AnalysisJobsTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,137 @@
+# coding=utf-8
+"""Availability index test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from tools.availability import (
+    AvailabilityIndex, ANY_LEVEL, load_availability, months_mask, index_from_constraints,
+    diff_availability, refresh_availability, plan_errors
+)
+from tools.ui_handler import available_years
+
+ALL_MONTHS = [f"{m:02d}" for m in range(1, 13)]
+
+
+class AvailabilityTest(unittest.TestCase):
+    """Test queries on the availability bitsets."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.index = AvailabilityIndex(2013, {
+            ("nitrogen_dioxide", "ensemble", "validated_reanalysis", ANY_LEVEL):
+                months_mask(2013, ["2021", "2022"], ALL_MONTHS),
+            ("nitrogen_dioxide", "emep", "validated_reanalysis", ANY_LEVEL):
+                months_mask(2013, ["2022"], ["01", "02", "03"]),
+            ("ozone", "emep", "validated_reanalysis", "500"): months_mask(2013, ["2022"], ["07"]),
+        })
+
+    def test_queries_along_any_axis(self):
+        self.assertEqual(self.index.years("nitrogen_dioxide", "ensemble", "validated_reanalysis"), ["2021", "2022"])
+        self.assertEqual(self.index.months("nitrogen_dioxide", "emep", "validated_reanalysis", "2022"),
+                         ["01", "02", "03"])
+        self.assertEqual(self.index.models("nitrogen_dioxide", "validated_reanalysis", "2022", "02"),
+                         ["emep", "ensemble"])
+        self.assertEqual(self.index.models("nitrogen_dioxide", "validated_reanalysis", "2022", "07"), ["ensemble"])
+        self.assertTrue(self.index.is_available("ozone", "emep", "validated_reanalysis", "2022", "07", level=500))
+        self.assertFalse(self.index.is_available("ozone", "emep", "validated_reanalysis", "2022", "07", level=0))
+        self.assertEqual(self.index.find(month="07", level="500"), [
+            ("nitrogen_dioxide", "ensemble", "validated_reanalysis", ANY_LEVEL),
+            ("ozone", "emep", "validated_reanalysis", "500"),
+        ])
+
+    def test_missing_months_of_plan(self):
+        missing = self.index.missing("nitrogen_dioxide", "emep", "validated_reanalysis",
+                                     ["2012", "2022"], ["02", "04"])
+        self.assertEqual(missing, [("2012", "02"), ("2012", "04"), ("2022", "04")])
+
+    def test_save_and_load(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "availability.json")
+            self.index.version = "test"
+            self.index.save(path)
+            loaded = AvailabilityIndex.from_file(path)
+            self.assertEqual(loaded.entries, self.index.entries)
+            self.assertEqual(loaded.version, "test")
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_shipped_index(self):
+        """The data file shipped with the plugin answers display-label lookups."""
+        self.assertIn("2022", available_years("Nitrogen dioxide", "Ensemble median", "Validated reanalysis"))
+        self.assertEqual(available_years("Ammonia", "MINNI", "Interim reanalysis"), ["2023"])
+        self.assertIs(load_availability(), load_availability())
+
+    def test_constraints_rebuild_and_diff(self):
+        """An index built from ADS constraints reports the months added or removed."""
+        constraints = [
+            {"variable": ["nitrogen_dioxide"], "model": ["ensemble", "emep"], "level": ["0", "500"],
+             "type": ["validated_reanalysis"], "year": ["2022"], "month": ["01", "02", "03"]},
+            {"variable": ["nitrogen_dioxide"], "model": ["ensemble"], "level": ["0"],
+             "type": ["validated_reanalysis"], "year": ["2021", "2023"], "month": ALL_MONTHS},
+            {"variable": ["ozone"], "model": ["emep"]},
+        ]
+        new = index_from_constraints(constraints, version="v2")
+        self.assertEqual(new.base_year, 2021)
+        self.assertEqual(new.levels("nitrogen_dioxide", "ensemble", "validated_reanalysis"), ["0", "500"])
+        self.assertEqual(new.years("nitrogen_dioxide", "ensemble", "validated_reanalysis", level=500), ["2022"])
+        changes = diff_availability(self.index, new)
+        removed = {(v, m, lvl): months for v, m, _, lvl, months in changes["removed"]}
+        added = {(v, m, lvl): months for v, m, _, lvl, months in changes["added"]}
+        self.assertEqual(added[("nitrogen_dioxide", "ensemble", "0")][0], ("2023", "01"))
+        self.assertEqual(removed[("nitrogen_dioxide", "ensemble", "500")][0], ("2021", "01"))
+        self.assertIn(("ozone", "emep", "500"), removed)
+
+        params = {"variable": "nitrogen_dioxide", "model": "emep", "type": "validated_reanalysis",
+                  "level": "0", "years": ["2022"], "months": ["04"]}
+        self.assertEqual(plan_errors(params, new), ["Not available for 2022-04."])
+        params["months"] = ["03"]
+        self.assertEqual(plan_errors(params, new), [])
+        params["level"] = "50"
+        self.assertTrue(plan_errors(params, new)[0].startswith("Level 50"))
+
+    def test_refresh_respects_ttl(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            source = os.path.join(tmp_dir, "constraints.json")
+            cache = os.path.join(tmp_dir, "availability.json")
+            with open(source, "w") as f:
+                json.dump([{"variable": ["ozone"], "model": ["emep"], "level": ["0"],
+                            "type": ["interim_reanalysis"], "year": ["2024"], "month": ["01"]}], f)
+            changes = refresh_availability(source, cache_path=cache)
+            self.assertIn(("ozone", "emep", "interim_reanalysis", "0", [("2024", "01")]), changes["added"])
+            self.assertEqual(load_availability(cache).years("ozone", "emep", "interim_reanalysis"), ["2024"])
+            # Still fresh: nothing is read again
+            self.assertIsNone(refresh_availability(source, cache_path=cache))
+            self.assertEqual(refresh_availability(source, cache_path=cache, ttl=0), {"added": [], "removed": []})
+            # A failed attempt is not repeated before the retry delay
+            missing = os.path.join(tmp_dir, "missing.json")
+            with self.assertRaises(OSError):
+                refresh_availability(missing, cache_path=cache, ttl=0)
+            self.assertIsNone(refresh_availability(missing, cache_path=cache, ttl=0))
+            self.assertEqual(refresh_availability(source, cache_path=cache, ttl=0, retry=0),
+                             {"added": [], "removed": []})
+            self.assertFalse(os.path.exists(cache + ".failed"))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(AvailabilityTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,53 @@
+# coding=utf-8
+"""Band statistics test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+
+import numpy as np
+import xarray as xr
+
+from tools.band_stats import compute_band_statistics
+from tools.nc_reader import VariableReader
+
+
+class BandStatisticsTest(unittest.TestCase):
+    """Test the chunked per-band statistics."""
+
+    def test_matches_numpy_per_band(self):
+        """Per-band and global statistics equal numpy over each time step."""
+        rng = np.random.default_rng(4)
+        values = rng.gamma(2.0, 20.0, size=(9, 1, 6, 7)).astype(np.float32)
+        values[2, 0, :3] = -999.0
+        values[5] = -999.0  # a band with no valid value
+        data = xr.DataArray(values, dims=("time", "level", "latitude", "longitude"), name="o3")
+        stats = compute_band_statistics(VariableReader(data), chunk_elements=100)
+
+        decoded = np.where(values == -999.0, np.nan, values).reshape(9, -1)
+        self.assertEqual(len(stats["bands"]), 9)
+        for band, row in zip(stats["bands"], decoded):
+            if np.isnan(row).all():
+                self.assertEqual(band["count"], 0)
+                continue
+            self.assertAlmostEqual(band["min"], np.nanmin(row), places=4)
+            self.assertAlmostEqual(band["max"], np.nanmax(row), places=4)
+            self.assertAlmostEqual(band["mean"], np.nanmean(row.astype(np.float64)), places=6)
+            self.assertAlmostEqual(band["std"], np.nanstd(row.astype(np.float64)), places=6)
+        self.assertAlmostEqual(stats["global"]["mean"], np.nanmean(decoded.astype(np.float64)), places=6)
+        self.assertEqual(stats["global"]["count"], np.isfinite(decoded).sum())
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(BandStatisticsTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
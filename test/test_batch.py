@@ -0,0 +1,122 @@
+# coding=utf-8
+"""Headless batch runner test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import importlib.util
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from tools.availability import AvailabilityIndex, ANY_LEVEL, months_mask
+from tools.batch import ProgressLog, load_plan, run_plan
+from tools.catalog import Catalog
+from tools.download_plan import plan_downloads
+from test.test_catalog import write_month
+
+
+class BatchTest(unittest.TestCase):
+    """Test running a plan without QGIS."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.index = AvailabilityIndex(2013, {
+            ("nitrogen_dioxide", "ensemble", "validated_reanalysis", ANY_LEVEL): months_mask(2013, ["2022"], ["01", "02"]),
+        })
+        self.plan = {
+            "folder": os.path.join(self.tmp_dir, "data"),
+            "workers": 2,
+            "download": {"variables": ["nitrogen_dioxide"], "models": ["ensemble"], "levels": [0],
+                         "types": ["validated_reanalysis"], "years": [2022], "months": ["01", "02", "03"]},
+            "clip": {"north": 50.0, "south": 49.85, "east": 5.1, "west": 5.0},
+            "statistics": True,
+        }
+
+    def tearDown(self):
+        """Runs after each test."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_plan(self):
+        path = os.path.join(self.tmp_dir, "plan.json")
+        with open(path, "w") as f:
+            json.dump(self.plan, f)
+        plan = load_plan(path)
+        self.assertEqual(plan["download"]["levels"], ["0"])
+        self.assertEqual(plan["download"]["years"], ["2022"])
+        self.plan["clip"]["north"] = 40.0
+        with open(path, "w") as f:
+            json.dump(self.plan, f)
+        with self.assertRaises(ValueError):
+            load_plan(path)
+
+    def test_run_plan(self):
+        """A downloaded ZIP is reused, then clipped and summarised."""
+        request, = plan_downloads(*self.plan["download"].values(), index=self.index).requests
+        os.makedirs(self.plan["folder"])
+        with zipfile.ZipFile(os.path.join(self.plan["folder"], request.filename()), "w") as archive:
+            for month in ("01", "02"):
+                member = os.path.join(self.tmp_dir, f"cams.eaq.vra.ENSa.no2.l0.2022-{month}.nc")
+                write_month(member, f"2022-{month}-01")
+                archive.write(member, os.path.basename(member))
+
+        stream = io.StringIO()
+        catalog = Catalog(os.path.join(self.tmp_dir, "catalog.sqlite"))
+        result = run_plan(self.plan, ProgressLog(stream=stream), self.index, catalog)
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([e["event"] for e in events],
+                         ["plan", "download", "clip", "clip", "statistics", "done"])
+        self.assertEqual(events[1]["result"][1], "skipped")
+        self.assertEqual(len(result["unavailable"]), 1)
+        self.assertEqual(result["errors"], 0)
+        product = "nitrogen_dioxide_ensemble_l0_validated_reanalysis"
+        self.assertEqual(len(result["files"][product]), 2)
+        self.assertEqual(catalog.get(result["files"][product][0])["kind"], "clipped")
+        self.assertAlmostEqual(result["statistics"][product]["mean"], 1.0)
+
+    @unittest.skipUnless(importlib.util.find_spec("zarr"), "zarr is not installed")
+    def test_run_plan_into_store(self):
+        """Clipped months are appended to one store, which is then aggregated."""
+        request, = plan_downloads(*self.plan["download"].values(), index=self.index).requests
+        os.makedirs(self.plan["folder"])
+        with zipfile.ZipFile(os.path.join(self.plan["folder"], request.filename()), "w") as archive:
+            for month in ("01", "02"):
+                member = os.path.join(self.tmp_dir, f"cams.eaq.vra.ENSa.no2.l0.2022-{month}.nc")
+                write_month(member, f"2022-{month}-01")
+                archive.write(member, os.path.basename(member))
+        self.plan.update(store=True, aggregate={"frequency": "1D"})
+
+        stream = io.StringIO()
+        catalog = Catalog(os.path.join(self.tmp_dir, "catalog.sqlite"))
+        result = run_plan(self.plan, ProgressLog(stream=stream), self.index, catalog)
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([e["event"] for e in events],
+                         ["plan", "download", "clip", "clip", "store", "aggregate", "statistics", "done"])
+        self.assertEqual(events[4]["result"], 48)
+        product = "nitrogen_dioxide_ensemble_l0_validated_reanalysis"
+        output, = result["files"][product]
+        self.assertEqual(catalog.get(output)["kind"], "aggregate")
+        self.assertEqual(len(json.loads(catalog.get(output)["lineage"])), 2)
+        self.assertEqual(catalog.get(output)["model"], "ensemble")
+        self.assertAlmostEqual(result["statistics"][product]["mean"], 1.0)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(BatchTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,96 @@
+# coding=utf-8
+"""Streaming bivariate statistics test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+
+import numpy as np
+from scipy.stats import linregress, pearsonr
+
+from tools.bivariate import BivariateAccumulator, PixelRegressionAccumulator, _north_up_layout
+
+
+class BivariateTest(unittest.TestCase):
+    """Test bivariate accumulators against scipy."""
+
+    def setUp(self):
+        """Runs before each test."""
+        rng = np.random.default_rng(0)
+        self.x = rng.normal(20.0, 5.0, size=(120, 3, 4)).astype("float32")
+        self.y = (2.0 * self.x + rng.normal(0.0, 4.0, size=self.x.shape)).astype("float32")
+        self.x[5, 0, 0] = np.nan
+
+    def test_pooled_matches_scipy(self):
+        """Chunked pooled statistics equal scipy on the full arrays."""
+        acc = BivariateAccumulator()
+        for start in range(0, 120, 17):
+            acc.update(self.x[start:start + 17], self.y[start:start + 17])
+        valid = np.isfinite(self.x)
+        x = self.x[valid].astype(np.float64)
+        y = self.y[valid].astype(np.float64)
+        r, _ = pearsonr(x, y)
+        reg = linregress(x, y)
+        self.assertAlmostEqual(acc.correlation()["r"], r, places=10)
+        self.assertAlmostEqual(acc.regression()["slope"], reg.slope, places=10)
+        self.assertAlmostEqual(acc.regression()["stderr"], reg.stderr, places=10)
+        scores = acc.skill_scores()
+        self.assertAlmostEqual(scores["bias"], float(np.mean(y - x)), places=8)
+        self.assertAlmostEqual(scores["rmse"], float(np.sqrt(np.mean((y - x) ** 2))), places=8)
+
+    def test_merge_matches_single_pass(self):
+        """Accumulators of separate chunks merge to the result of one pass."""
+        whole = BivariateAccumulator()
+        whole.update(self.x, self.y)
+        merged = BivariateAccumulator()
+        for start in (60, 0):
+            part = BivariateAccumulator()
+            part.update(self.x[start:start + 60], self.y[start:start + 60])
+            merged.merge(part)
+        self.assertEqual(merged.n, whole.n)
+        self.assertAlmostEqual(merged.correlation()["r"], whole.correlation()["r"], places=10)
+        self.assertAlmostEqual(merged.skill_scores()["rmse"], whole.skill_scores()["rmse"], places=8)
+        pixels = PixelRegressionAccumulator((3, 4))
+        for start in (0, 60):
+            part = PixelRegressionAccumulator((3, 4))
+            part.update(self.x[start:start + 60], self.y[start:start + 60])
+            pixels.merge(part)
+        single = PixelRegressionAccumulator((3, 4))
+        single.update(self.x, self.y)
+        np.testing.assert_allclose(pixels.result()["slope"], single.result()["slope"], rtol=1e-6)
+
+    def test_pixel_maps_match_linregress(self):
+        """Per-cell results match scipy's linregress on each time series."""
+        acc = PixelRegressionAccumulator((3, 4))
+        for start in range(0, 120, 17):
+            acc.update(self.x[start:start + 17], self.y[start:start + 17])
+        maps = acc.result()
+        for i, j in [(0, 0), (2, 3)]:
+            valid = np.isfinite(self.x[:, i, j])
+            reg = linregress(self.x[valid, i, j], self.y[valid, i, j])
+            self.assertAlmostEqual(float(maps["r"][i, j]), reg.rvalue, places=5)
+            self.assertAlmostEqual(float(maps["slope"][i, j]), reg.slope, places=4)
+            self.assertAlmostEqual(float(maps["intercept"][i, j]), reg.intercept, places=3)
+            self.assertEqual(int(maps["n"][i, j]), int(valid.sum()))
+
+    def test_pixel_map_layout_is_north_up(self):
+        """A 0..360 grid with ascending latitude is written west to east and north to south."""
+        rows, columns, geotransform = _north_up_layout([40.0, 45.0, 50.0], [0.0, 90.0, 180.0, 270.0])
+        np.testing.assert_array_equal(rows, [2, 1, 0])
+        np.testing.assert_array_equal(columns, [2, 3, 0, 1])
+        self.assertEqual(geotransform, (-225.0, 90.0, 0.0, 52.5, 0.0, -5.0))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(BivariateTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,127 @@
+# coding=utf-8
+"""File catalog test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.catalog import Catalog, parse_filename, month_periods
+
+
+def write_month(path, start, periods=24, lats=(50.0, 49.9, 49.8), lons=(5.0, 5.1)):
+    """Write a small CAMS-like NetCDF file."""
+    times = pd.date_range(start, periods=periods, freq="h")
+    values = np.ones((periods, 1, len(lats), len(lons)), dtype="float32")
+    xr.Dataset(
+        {"no2_conc": (("time", "level", "latitude", "longitude"), values)},
+        coords={"time": times, "level": [0.0], "latitude": list(lats), "longitude": list(lons)},
+    ).to_netcdf(path)
+
+
+class CatalogTest(unittest.TestCase):
+    """Test incremental cataloguing of NetCDF files."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.catalog = Catalog(os.path.join(self.tmp_dir, "cache", "catalog.sqlite"), hash_files=True)
+        self.january = os.path.join(self.tmp_dir, "cams.eaq.vra.ENSa.no2.l0.2022-01.nc")
+        write_month(self.january, "2022-01-01")
+
+    def tearDown(self):
+        """Runs after each test."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_filename_convention(self):
+        """Model, level and type are taken from ADS file names."""
+        info = parse_filename("/data/cams.eaq.ira.LOTO.o3.l50.2021-07.nc")
+        self.assertEqual(info, {"model": "lotos", "netcdf_variable": "o3", "level": "50",
+                                "data_type": "interim_reanalysis"})
+
+    def test_incremental_refresh_and_lineage(self):
+        """Only new or changed files are read; derived files inherit metadata."""
+        self.assertEqual(self.catalog.refresh_directory(self.tmp_dir), [self.january])
+        self.assertEqual(self.catalog.refresh_directory(self.tmp_dir), [])
+        record = self.catalog.get(self.january)
+        self.assertEqual(record["variable"], "nitrogen_dioxide")
+        self.assertEqual(record["model"], "ensemble")
+        self.assertEqual(record["time_start"], "2022-01-01T00:00:00")
+        self.assertEqual(record["time_end"], "2022-01-01T23:00:00")
+        self.assertAlmostEqual(record["lat_max"], 50.0)
+        self.assertEqual(len(record["hash"]), 64)
+
+        clipped = os.path.join(self.tmp_dir, "january_clipped.nc")
+        write_month(clipped, "2022-01-01", lats=(50.0, 49.9))
+        self.catalog.register(clipped, "clipped", [self.january])
+        derived = self.catalog.get(clipped)
+        self.assertEqual(derived["model"], "ensemble")
+        self.assertEqual(derived["kind"], "clipped")
+        self.assertNotEqual(derived["grid_signature"], record["grid_signature"])
+        self.assertEqual(self.catalog.refresh_directory(self.tmp_dir), [])
+        self.assertEqual(self.catalog.get(clipped)["kind"], "clipped")
+
+        os.remove(self.january)
+        self.catalog.refresh_directory(self.tmp_dir)
+        self.assertEqual([r["path"] for r in self.catalog.files()], [clipped])
+
+    def test_query_coverage(self):
+        """The fewest files on one grid cover the period; gaps are reported."""
+        third = os.path.join(self.tmp_dir, "cams.eaq.vra.ENSa.no2.l0.2022-01-03.nc")
+        write_month(third, "2022-01-03")
+        clipped = os.path.join(self.tmp_dir, "january_clipped.nc")
+        write_month(clipped, "2022-01-01", lats=(50.0, 49.9))
+        self.catalog.refresh_directory(self.tmp_dir)
+        self.catalog.register(clipped, "clipped", [self.january])
+
+        coverage = self.catalog.query(variable="nitrogen_dioxide", start="2022-01-01", end="2022-01-04")
+        self.assertEqual(coverage.paths, [self.january, third])
+        self.assertEqual(coverage.gaps, [("2022-01-02T00:00:00", "2022-01-03T00:00:00")])
+
+        # For one day, the file already clipped to the AOI is preferred
+        coverage = self.catalog.query(variable="nitrogen_dioxide", start="2022-01-01", end="2022-01-02",
+                                      bbox=(5.0, 49.9, 5.1, 50.0))
+        self.assertEqual(coverage.paths, [clipped])
+        self.assertTrue(coverage.complete)
+
+        # No file covers an AOI outside the grid
+        coverage = self.catalog.query(variable="nitrogen_dioxide", start="2022-01-01", end="2022-01-02",
+                                      bbox=(5.0, 49.0, 5.1, 50.0))
+        self.assertEqual(coverage.paths, [])
+        self.assertEqual(coverage.gaps, [("2022-01-01T00:00:00", "2022-01-02T00:00:00")])
+        self.assertFalse(coverage.complete)
+
+        # Without a period, no matching file is still not a complete coverage
+        coverage = self.catalog.query(variable="nitrogen_dioxide", bbox=(5.0, 49.0, 5.1, 50.0))
+        self.assertEqual(coverage.gaps, [])
+        self.assertFalse(coverage.complete)
+
+    def test_month_periods(self):
+        """Contiguous selected months form one period."""
+        periods = month_periods(["2021", "2022"], ["01", "02", "12"])
+        self.assertEqual([(str(a), str(b)) for a, b in periods], [
+            ("2021-01-01T00:00:00", "2021-03-01T00:00:00"),
+            ("2021-12-01T00:00:00", "2022-03-01T00:00:00"),
+            ("2022-12-01T00:00:00", "2023-01-01T00:00:00"),
+        ])
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(CatalogTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
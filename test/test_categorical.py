@@ -0,0 +1,57 @@
+# coding=utf-8
+"""Categorical skill score test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+
+import numpy as np
+
+from tools.categorical import ConfusionAccumulator, class_edges_for
+
+
+class ConfusionAccumulatorTest(unittest.TestCase):
+    """Test the chunked confusion matrix and derived scores."""
+
+    def test_scores_match_direct_counts(self):
+        """Chunked bincount equals counting classes pair by pair."""
+        rng = np.random.default_rng(3)
+        x = rng.gamma(2.0, 30.0, 5000).astype(np.float32)
+        y = (x * rng.normal(1.0, 0.3, x.size)).astype(np.float32)
+        y[::17] = np.nan
+        edges = class_edges_for("no2_conc")
+        self.assertEqual(edges, [40.0, 90.0, 120.0, 230.0, 340.0])
+
+        acc = ConfusionAccumulator(edges)
+        for start in range(0, x.size, 999):
+            acc.update(x[start:start + 999], y[start:start + 999])
+        scores = acc.result()
+
+        valid = np.isfinite(y)
+        cx = np.digitize(x[valid], edges)
+        cy = np.digitize(y[valid], edges)
+        expected = np.zeros((6, 6), dtype=np.int64)
+        for a, b in zip(cx, cy):
+            expected[a, b] += 1
+        np.testing.assert_array_equal(scores["matrix"], expected)
+        self.assertAlmostEqual(scores["accuracy"], np.mean(cx == cy))
+        po = np.mean(cx == cy)
+        pe = sum(np.mean(cx == k) * np.mean(cy == k) for k in range(6))
+        self.assertAlmostEqual(scores["kappa"], (po - pe) / (1 - pe))
+        self.assertAlmostEqual(scores["pod"][1], np.mean(cy[cx == 1] == 1))
+        self.assertAlmostEqual(scores["far"][1], np.mean(cx[cy == 1] != 1))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ConfusionAccumulatorTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
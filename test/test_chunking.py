@@ -0,0 +1,70 @@
+# coding=utf-8
+"""Chunk planner test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from tools import chunking
+from tools.chunking import ChunkPlanner, MAP, SERIES, bytes_per_element
+
+
+class ChunkPlannerTest(unittest.TestCase):
+    """Test chunk sizes and shapes follow the memory budget and access pattern."""
+
+    def test_elements_share_budget(self):
+        budget = 1024 ** 3
+        planner = ChunkPlanner(workers=4, budget=budget)
+        self.assertEqual(planner.elements(np.float32), budget // (4 * bytes_per_element(np.float32)))
+        self.assertEqual(planner.elements(np.float32, inputs=2), budget // (8 * bytes_per_element(np.float32)))
+        self.assertGreater(planner.elements(np.int16), planner.elements(np.float64))
+
+    def test_ranges_cover_and_balance(self):
+        with mock.patch.object(chunking, "MIN_CHUNK_ELEMENTS", 10):
+            ranges = ChunkPlanner(workers=2, budget=1024 ** 3).ranges(100, 5)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], 100)
+        self.assertTrue(all(a[1] == b[0] for a, b in zip(ranges, ranges[1:])))
+        # About TASKS_PER_WORKER chunks per worker
+        self.assertEqual(len(ranges), 2 * chunking.TASKS_PER_WORKER)
+
+    def test_ranges_fit_budget(self):
+        budget = 4096 * 100 * bytes_per_element(np.float32)
+        ranges = ChunkPlanner(workers=1, budget=budget).ranges(365, 4096, tasks=1)
+        self.assertEqual(ranges[0], (0, 100))
+
+    def test_shape_by_access(self):
+        planner = ChunkPlanner(workers=1, budget=chunking.MIN_CHUNK_ELEMENTS * bytes_per_element(np.float32))
+        shape = (1000, 100, 1000)
+        # Map-wise: whole grids, a few time steps
+        self.assertEqual(planner.shape(shape, 0, access=MAP), (1, 100, 1000))
+        # Time series: the whole time axis for a block of rows
+        self.assertEqual(planner.shape(shape, 0, access=SERIES), (1000, 1, 100))
+        self.assertEqual(planner.shape((10, 20, 30), 0, access=SERIES), (10, 20, 30))
+        with self.assertRaises(ValueError):
+            planner.shape(shape, 0, access="diagonal")
+
+    def test_budget_from_config(self):
+        with mock.patch.object(chunking, "COMPUTE_MEMORY_BUDGET", 3 * 1024 ** 3):
+            self.assertEqual(ChunkPlanner().budget, 3 * 1024 ** 3)
+        with mock.patch.object(chunking, "COMPUTE_MEMORY_BUDGET", None), \
+                mock.patch.object(chunking, "available_memory", lambda: 8 * 1024 ** 3):
+            self.assertEqual(ChunkPlanner().budget, int(8 * 1024 ** 3 * chunking.COMPUTE_MEMORY_FRACTION))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ChunkPlannerTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
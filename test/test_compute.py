@@ -0,0 +1,121 @@
+# coding=utf-8
+"""Compute backend test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.analysis_jobs import pixel_correlation_job, statistics_job
+from tools.bivariate import PixelRegressionAccumulator
+from tools.chunking import ChunkPlanner
+from tools.compute import ComputeBackend
+from tools.kernels import close_files, statistics_chunk
+from tools.statistics import iter_merged_statistics
+
+
+def fill_slot(out, value, slot):
+    """Kernel of the shared memory test: write a value into a slot."""
+    out[slot] = value
+    return slot
+
+
+class ComputeBackendTest(unittest.TestCase):
+    """Test chunk tasks run inline and in worker processes."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.values = np.random.default_rng(1).gamma(2.0, 10.0, (30, 3, 4)).astype("float32")
+        self.path = os.path.join(self.tmp_dir, "no2.nc")
+        xr.Dataset(
+            {"no2": (("time", "latitude", "longitude"), self.values)},
+            coords={"time": pd.date_range("2022-01-01", periods=30, freq="h"),
+                    "latitude": [50.0, 49.9, 49.8], "longitude": [5.0, 5.1, 5.2, 5.3]},
+        ).to_netcdf(self.path)
+
+    def tearDown(self):
+        """Runs after each test."""
+        close_files()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_planner_follows_backend(self):
+        planner = ComputeBackend(workers=4, memory_budget=1024 ** 3).planner
+        self.assertEqual((planner.workers, planner.budget), (4, 1024 ** 3))
+
+    def merged_mean(self, backend):
+        with mock.patch("tools.chunking.MIN_CHUNK_ELEMENTS", 60):
+            ranges = ChunkPlanner(2, 1024 ** 3).ranges(30, 12)
+        tasks = [(self.path, "no2", start, stop) for start, stop in ranges]
+        with backend:
+            parts = [part for _, part in backend.map_unordered(statistics_chunk, tasks)]
+        record = None
+        for record in iter_merged_statistics(parts, self.values.size):
+            pass
+        return record
+
+    def test_inline_and_workers_agree(self):
+        inline = self.merged_mean(ComputeBackend(workers=0))
+        pooled = self.merged_mean(ComputeBackend(workers=2))
+        self.assertTrue(pooled["exact"])
+        self.assertEqual(pooled["count"], self.values.size)
+        self.assertAlmostEqual(pooled["values"]["mean"], float(self.values.mean(dtype=np.float64)), places=4)
+        self.assertAlmostEqual(pooled["values"]["std"], inline["values"]["std"], places=4)
+
+    def test_files_released_after_job(self):
+        for workers in (0, 2):
+            with ComputeBackend(workers=workers) as backend:
+                for _ in statistics_job([self.path] * 2, ["no2"] * 2, backend):
+                    pass
+                # HDF5 refuses to rewrite a file another handle still holds
+                with xr.open_dataset(self.path) as ds:
+                    ds = ds.load()
+                (ds * 2).to_netcdf(self.path)
+
+    def test_workers_write_shared_memory(self):
+        with ComputeBackend(workers=2) as backend:
+            with backend.shared_array((2, 3), np.float64) as out:
+                name = out.name
+                total = np.zeros(3)
+                tasks = [(out, float(value)) for value in range(1, 6)]
+                for _, slot, result in backend.map_slots(fill_slot, tasks, 2):
+                    self.assertEqual(slot, result)
+                    total += out.array[slot]
+            np.testing.assert_array_equal(total, [15.0, 15.0, 15.0])
+        # The segment is freed with the block
+        self.assertFalse(os.path.exists(os.path.join("/dev/shm", name)))
+
+    def test_pixel_sums_through_shared_memory(self):
+        maps = {}
+        with ComputeBackend(workers=2) as backend, \
+                mock.patch("tools.chunking.MIN_CHUNK_ELEMENTS", 48), \
+                mock.patch("tools.analysis_jobs.write_pixel_maps", lambda path, result, lat, lon: maps.update(result)):
+            job = pixel_correlation_job(self.path, "no2", self.path, "no2", "unused.tif", backend=backend)
+            fractions = [fraction for fraction, _ in job]
+        self.assertGreater(len(fractions), 2)
+        expected = PixelRegressionAccumulator((3, 4))
+        expected.update(self.values, self.values)
+        np.testing.assert_array_equal(maps["n"], expected.result()["n"])
+        np.testing.assert_allclose(maps["slope"], expected.result()["slope"], rtol=1e-5)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ComputeBackendTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,85 @@
+# coding=utf-8
+"""Download planner test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from tools.availability import AvailabilityIndex, ANY_LEVEL, months_mask
+from tools.catalog import Catalog
+from tools.download_plan import DownloadRequest, plan_downloads, split_download
+from test.test_catalog import write_month
+
+ALL_MONTHS = [f"{m:02d}" for m in range(1, 13)]
+
+
+class DownloadPlanTest(unittest.TestCase):
+    """Test packing cells into ADS requests and splitting the downloads."""
+
+    def setUp(self):
+        """Runs before each test."""
+        full = months_mask(2013, ["2021", "2022"], ALL_MONTHS)
+        self.index = AvailabilityIndex(2013, {
+            ("nitrogen_dioxide", "ensemble", "validated_reanalysis", ANY_LEVEL): full,
+            ("ozone", "ensemble", "validated_reanalysis", ANY_LEVEL): full,
+            ("nitrogen_dioxide", "emep", "validated_reanalysis", ANY_LEVEL): full,
+            ("ozone", "emep", "validated_reanalysis", ANY_LEVEL): months_mask(2013, ["2022"], ALL_MONTHS),
+        })
+
+    def test_fewest_requests(self):
+        plan = plan_downloads(["nitrogen_dioxide", "ozone"], ["ensemble", "emep"], ["0", "500"],
+                              ["validated_reanalysis"], ["2021", "2022"], ["01", "02", "03"], self.index)
+        # Every available cell exactly once, nothing unavailable requested
+        cells = plan.cells
+        self.assertEqual(len(cells), len(set(cells)))
+        self.assertEqual(len(cells), 2 * 2 * 2 * 6 - 2 * 3)
+        self.assertEqual(sorted(plan.unavailable),
+                         [("ozone", "emep", lvl, "validated_reanalysis", "2021", m)
+                          for lvl in ("0", "500") for m in ("01", "02", "03")])
+        self.assertLessEqual(len(plan.requests), 3)
+
+    def test_cost_limit(self):
+        plan = plan_downloads(["nitrogen_dioxide"], ["ensemble"], ["0"], ["validated_reanalysis"],
+                              ["2021", "2022"], ALL_MONTHS, self.index, cost_limit=5)
+        self.assertTrue(all(r.cost <= 5 for r in plan.requests))
+        self.assertEqual(len(plan.cells), 24)
+
+    def test_split_download(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            request = DownloadRequest(["nitrogen_dioxide"], ["ensemble"], ["0"], ["validated_reanalysis"],
+                                      ["2022"], ["01", "02"])
+            zip_path = os.path.join(tmp_dir, request.filename())
+            member = os.path.join(tmp_dir, "src", "cams.eaq.vra.ENSa.no2.l0.2022-02.nc")
+            os.makedirs(os.path.dirname(member))
+            write_month(member, "2022-02-01")
+            with zipfile.ZipFile(zip_path, "w") as archive:
+                archive.write(member, os.path.basename(member))
+            catalog = Catalog(os.path.join(tmp_dir, "catalog.sqlite"))
+            found, missing, unmatched = split_download(zip_path, request, catalog, os.path.join(tmp_dir, "out"))
+            cell = ("nitrogen_dioxide", "ensemble", "0", "validated_reanalysis", "2022", "02")
+            self.assertEqual(list(found), [cell])
+            self.assertEqual(missing, [("nitrogen_dioxide", "ensemble", "0", "validated_reanalysis", "2022", "01")])
+            self.assertEqual(unmatched, [])
+            self.assertEqual(catalog.get(found[cell])["kind"], "download")
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(DownloadPlanTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,57 @@
+# coding=utf-8
+"""Intercomparison matrix test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+
+import numpy as np
+
+from tools.intercomparison import IntercomparisonAccumulator
+
+
+class IntercomparisonTest(unittest.TestCase):
+    """Test the one-pass N×N intercomparison matrix."""
+
+    def test_matches_pairwise_computation(self):
+        """Chunked matrices equal pairwise numpy results with per-pair masks."""
+        rng = np.random.default_rng(2)
+        base = rng.gamma(3.0, 10.0, size=(48, 5, 6))
+        inputs = [
+            (base + 40.0 + rng.normal(0, 2, base.shape)).astype(np.float32),
+            (0.8 * base + 45.0 + rng.normal(0, 4, base.shape)).astype(np.float32),
+            (1.2 * base + 35.0 + rng.normal(0, 3, base.shape)).astype(np.float32),
+        ]
+        inputs[1][rng.random(base.shape) < 0.2] = np.nan
+        inputs[2][:5] = np.nan
+
+        acc = IntercomparisonAccumulator(3)
+        for start in range(0, 48, 7):
+            acc.update([v[start:start + 7] for v in inputs])
+        result = acc.result()
+
+        for i in range(3):
+            for j in range(3):
+                a = inputs[i].astype(np.float64).ravel()
+                b = inputs[j].astype(np.float64).ravel()
+                valid = np.isfinite(a) & np.isfinite(b)
+                a, b = a[valid], b[valid]
+                self.assertEqual(result["n"][i, j], valid.sum())
+                self.assertAlmostEqual(result["bias"][i, j], np.mean(b - a), places=8)
+                self.assertAlmostEqual(result["rmse"][i, j], np.sqrt(np.mean((b - a) ** 2)), places=8)
+                self.assertAlmostEqual(result["r"][i, j], np.corrcoef(a, b)[0, 1], places=8)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(IntercomparisonTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,78 @@
+# coding=utf-8
+"""NetCDF header reader test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.nc_header import read_header
+from tools.nc_reader import open_dataset, VariableReader
+
+
+class NetCDFHeaderTest(unittest.TestCase):
+    """Test reading NetCDF metadata without decoding the data."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "sample.nc")
+        times = pd.date_range("2022-01-01", periods=6, freq="h")
+        values = np.arange(6 * 3 * 2, dtype="float32").reshape(6, 1, 3, 2)
+        ds = xr.Dataset(
+            {"no2_conc": (("time", "level", "latitude", "longitude"), values)},
+            coords={"time": times, "level": [0.0], "latitude": [50.0, 49.9, 49.8], "longitude": [5.0, 5.1]},
+        )
+        ds["no2_conc"].attrs["missing_value"] = np.float32(-999.0)
+        ds.to_netcdf(self.path, encoding={"no2_conc": {"_FillValue": np.float32(-9999.0)}})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_metadata(self):
+        header = read_header(self.path)
+        self.assertEqual(header.dims, {"time": 6, "level": 1, "latitude": 3, "longitude": 2})
+        self.assertEqual(header.data_variables, ["no2_conc"])
+        self.assertEqual(header.variables["no2_conc"]["shape"], (6, 1, 3, 2))
+        self.assertEqual(header.time_range, (np.datetime64("2022-01-01T00:00:00"),
+                                             np.datetime64("2022-01-01T05:00:00"), 6))
+        self.assertEqual(header.lat_range, (49.8, 50.0, 3))
+        self.assertEqual(header.lon_range, (5.0, 5.1, 2))
+        np.testing.assert_allclose(header.coords["level"], [0.0])
+
+    def test_fill_values_match_reader(self):
+        header = read_header(self.path)
+        ds = open_dataset(self.path)
+        try:
+            self.assertEqual(header.fill_values("no2_conc"), VariableReader(ds["no2_conc"]).fill_values)
+        finally:
+            ds.close()
+
+    def test_memoized_until_modified(self):
+        first = read_header(self.path)
+        self.assertIs(read_header(self.path), first)
+        xr.Dataset({"o3_conc": (("latitude",), np.zeros(2, dtype="float32"))},
+                   coords={"latitude": [1.0, 2.0]}).to_netcdf(self.path)
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(read_header(self.path).data_variables, ["o3_conc"])
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(NetCDFHeaderTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,65 @@
+# coding=utf-8
+"""NetCDF reader fill-value decoding test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+
+import numpy as np
+import xarray as xr
+
+from tools.nc_reader import VariableReader
+
+
+class VariableReaderTest(unittest.TestCase):
+    """Test decoding of fill values at read time."""
+
+    def setUp(self):
+        """Runs before each test."""
+        values = np.array([[1.0, -999.0, 999.0], [-1.0, 5.0, 7.0]], dtype="float32")
+        self.data = xr.DataArray(
+            values, dims=("time", "x"), name="no2", attrs={"_FillValue": np.float32(-1.0)})
+
+    def test_fill_values_masked(self):
+        """_FillValue and default sentinels become NaN, 999 is kept."""
+        out = VariableReader(self.data).read()
+        self.assertEqual(out.dtype, np.float32)
+        np.testing.assert_array_equal(np.isnan(out), [[False, True, False], [True, False, False]])
+        self.assertEqual(out[0, 2], 999.0)
+
+    def test_decoding_leaves_source_unchanged(self):
+        """Reading twice gives the same values and leaves the DataArray as it was."""
+        self.data.attrs["scale_factor"] = np.float32(2.0)
+        source = self.data.values.copy()
+        reader = VariableReader(self.data)
+        first, second = reader.read(), reader.read()
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(first[1, 1], 10.0)
+        np.testing.assert_array_equal(self.data.values, source)
+
+    def test_custom_sentinels(self):
+        """Sentinels passed explicitly replace the configured ones."""
+        out = VariableReader(self.data, sentinels=[7.0]).read()
+        self.assertEqual(out[0, 1], -999.0)
+        self.assertTrue(np.isnan(out[1, 2]))
+
+    def test_iter_chunks_covers_array(self):
+        """Chunks along time cover the full variable."""
+        chunks = [chunk for _, chunk in VariableReader(self.data).iter_chunks(chunk_elements=3)]
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(sum(c.size for c in chunks), self.data.size)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(VariableReaderTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,114 @@
+# coding=utf-8
+"""NetCDF loader cache test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.netcdf_loader import cog_job, cog_path_for, convert_to_cog, is_cog_current, layer_source, netcdf_uri
+
+try:
+    from osgeo import gdal
+except ImportError:
+    gdal = None
+
+
+class CogCacheTest(unittest.TestCase):
+    """Test naming and reuse of cached COG files."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, "no2_ensemble_2022_01.nc")
+        with open(self.source, "wb") as f:
+            f.write(b"netcdf")
+
+    def tearDown(self):
+        """Runs after each test."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_cog_next_to_source(self):
+        """The cached COG lives next to the source, named after the variable."""
+        self.assertEqual(cog_path_for(self.source, "no2_conc"),
+                         os.path.join(self.tmp_dir, "no2_ensemble_2022_01.no2_conc.cog.tif"))
+        self.assertEqual(cog_path_for(self.source),
+                         os.path.join(self.tmp_dir, "no2_ensemble_2022_01.cog.tif"))
+
+    def test_stale_cog_is_not_reused(self):
+        """A COG older than its source must be converted again."""
+        cog = cog_path_for(self.source, "no2_conc")
+        self.assertFalse(is_cog_current(cog, self.source))
+        with open(cog, "wb") as f:
+            f.write(b"tiff")
+        self.assertTrue(is_cog_current(cog, self.source))
+        mtime = os.path.getmtime(cog)
+        os.utime(self.source, (mtime + 10, mtime + 10))
+        self.assertFalse(is_cog_current(cog, self.source))
+
+    def test_netcdf_source_without_cog(self):
+        """Without COGs the NetCDF file is shown as is and nothing is converted."""
+        self.assertEqual(layer_source(self.source, use_cog=False),
+                         (netcdf_uri(self.source), "no2_ensemble_2022_01", False))
+
+
+@unittest.skipIf(gdal is None, "GDAL is not available")
+class CogConversionTest(unittest.TestCase):
+    """Test the COG written from a multi-band NetCDF variable."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, "no2_ensemble_2022_01.nc")
+        data = np.random.default_rng(0).random((6, 40, 50)).astype("float32")
+        xr.Dataset(
+            {"no2_conc": (("time", "latitude", "longitude"), data)},
+            coords={"time": pd.date_range("2022-01-01", periods=6, freq="h"),
+                    "latitude": np.linspace(49.95, 46.05, 40), "longitude": np.linspace(5.05, 9.95, 50)},
+        ).to_netcdf(self.source)
+
+    def tearDown(self):
+        """Runs after each test."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_bands_are_interleaved(self):
+        """Every time step is a band, stored band by band so one frame is read alone."""
+        cog = convert_to_cog(self.source, "no2_conc")
+        self.assertEqual(cog, cog_path_for(self.source, "no2_conc"))
+        ds = gdal.Open(cog)
+        self.assertEqual(ds.RasterCount, 6)
+        self.assertEqual(ds.GetMetadataItem("INTERLEAVE", "IMAGE_STRUCTURE"), "BAND")
+        ds = None
+        self.assertFalse(os.path.exists(cog + ".tmp"))
+
+    def test_layer_shows_netcdf_until_converted(self):
+        """The NetCDF file is displayed at once; the COG is used once the background job wrote it."""
+        source, _, convert = layer_source(self.source, "no2_conc")
+        self.assertEqual(source, netcdf_uri(self.source))
+        self.assertTrue(convert)
+        job = cog_job(self.source, "no2_conc")
+        next(job)
+        with self.assertRaises(StopIteration) as stop:
+            next(job)
+        self.assertEqual(layer_source(self.source, "no2_conc"), (stop.exception.value, "no2_ensemble_2022_01", False))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(CogCacheTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,62 @@
+# coding=utf-8
+"""Result cache test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tools.result_cache import ResultCache
+
+
+class ResultCacheTest(unittest.TestCase):
+    """Test the persistent analysis result cache."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp_dir, "source.nc")
+        with open(self.source, "wb") as f:
+            f.write(b"first version")
+        self.cache = ResultCache(os.path.join(self.tmp_dir, "cache", "results.sqlite"))
+
+    def tearDown(self):
+        """Runs after each test."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_roundtrip(self):
+        """A stored result is returned for identical inputs only."""
+        self.cache.put([self.source], "no2", "statistics", {}, {"mean": 1.5})
+        self.assertEqual(self.cache.get([self.source], "no2", "statistics"), {"mean": 1.5})
+        self.assertIsNone(self.cache.get([self.source], "o3", "statistics"))
+        self.assertIsNone(self.cache.get([self.source], "no2", "statistics", {"k": 1}))
+
+    def test_replaced_file_invalidates(self):
+        """Replacing the source file drops its cached entries."""
+        self.cache.put([self.source], "no2", "statistics", {}, {"mean": 1.5})
+        with open(self.source, "wb") as f:
+            f.write(b"second, longer version")
+        self.assertIsNone(self.cache.get([self.source], "no2", "statistics"))
+
+    def test_invalidate_path(self):
+        """Explicit invalidation removes results depending on a file."""
+        self.cache.put([self.source], "no2", "statistics", {}, {"mean": 1.5})
+        self.cache.invalidate(self.source)
+        self.assertIsNone(self.cache.get([self.source], "no2", "statistics"))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ResultCacheTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,95 @@
+# coding=utf-8
+"""Progressive statistics test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+
+import numpy as np
+import xarray as xr
+
+from tools.nc_reader import VariableReader
+from tools.statistics import (RunningStats, iter_progressive_statistics, iter_pooled_statistics,
+                             iter_zonal_statistics, spread_order)
+
+
+class StatisticsTest(unittest.TestCase):
+    """Test the chunked statistics accumulator."""
+
+    def setUp(self):
+        """Runs before each test."""
+        rng = np.random.default_rng(42)
+        values = rng.gamma(2.0, 10.0, (30, 20, 25)).astype("float32")
+        values[0, :3, :3] = np.nan
+        self.data = xr.DataArray(values, dims=("time", "latitude", "longitude"), name="no2")
+
+    def test_merge_matches_numpy(self):
+        """Merging chunk accumulators gives the full-array result."""
+        acc = RunningStats()
+        for chunk in np.array_split(self.data.values, 7):
+            acc.update(chunk)
+        values = self.data.values
+        self.assertAlmostEqual(acc.mean, float(np.nanmean(values)), places=4)
+        self.assertAlmostEqual(acc.std, float(np.nanstd(values)), places=4)
+        self.assertEqual(acc.min, float(np.nanmin(values)))
+        self.assertEqual(acc.max, float(np.nanmax(values)))
+
+    def test_progressive_ends_exact(self):
+        """The last progressive record is exact; earlier ones are estimates."""
+        reader = VariableReader(self.data)
+        records = list(iter_progressive_statistics(reader, chunk_elements=2000, preview_size=500))
+        self.assertEqual(records[0]["stage"], "preview")
+        self.assertFalse(records[0]["exact"])
+        final = records[-1]
+        self.assertTrue(final["exact"])
+        self.assertAlmostEqual(final["values"]["mean"], float(np.nanmean(self.data.values)), places=4)
+
+    def test_partial_records_spread_without_bounds(self):
+        """Partial records cover the whole period and claim no error bounds."""
+        self.assertEqual(spread_order(range(10)), [0, 3, 6, 9, 1, 4, 7, 2, 5, 8])
+        reader = VariableReader(self.data)
+        records = list(iter_progressive_statistics(reader, chunk_elements=2000, preview_size=500))
+        partial = [record for record in records if record["stage"] == "partial"]
+        self.assertTrue(partial)
+        self.assertTrue(np.isfinite(records[0]["errors"]["mean"]))
+        for record in partial:
+            self.assertTrue(np.isnan(record["errors"]["mean"]))
+            self.assertGreater(record["count"], records[0]["count"])
+
+    def test_pooled_over_files(self):
+        """Statistics of several readers equal those of their concatenation."""
+        readers = [VariableReader(self.data.isel(time=slice(0, 12))),
+                   VariableReader(self.data.isel(time=slice(12, None)))]
+        records = list(iter_pooled_statistics(readers, chunk_elements=2000))
+        self.assertTrue(all(np.isnan(record["errors"]["mean"]) for record in records[:-1]))
+        final = records[-1]
+        self.assertTrue(final["exact"])
+        self.assertAlmostEqual(final["values"]["mean"], float(np.nanmean(self.data.values)), places=4)
+        self.assertAlmostEqual(final["values"]["std"], float(np.nanstd(self.data.values)), places=4)
+
+    def test_zonal(self):
+        """Each zone gets the statistics of its own cells only."""
+        west = np.zeros((20, 25), dtype=bool)
+        west[:, :10] = True
+        readers = [VariableReader(self.data)]
+        final = list(iter_zonal_statistics(readers, {1: west, 2: ~west}, chunk_elements=2000))[-1]
+        self.assertTrue(final["exact"])
+        for zone, mask in ((1, west), (2, ~west)):
+            values = self.data.values[:, mask]
+            self.assertAlmostEqual(final["zones"][zone]["mean"], float(np.nanmean(values)), places=4)
+            self.assertEqual(final["zones"][zone]["count"], int(np.isfinite(values).sum()))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(StatisticsTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,57 @@
+# coding=utf-8
+"""Temporal layer binding test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.nc_reader import VariableReader
+from tools.statistics import preview_statistics
+from tools.temporal_layer import band_for_time, band_ranges, band_times, value_range
+
+
+class TemporalLayerTest(unittest.TestCase):
+    """Test band/time mapping and the decoded frame cache."""
+
+    def test_band_mapping(self):
+        """Each instant maps to the band whose interval contains it."""
+        times = pd.date_range("2022-01-01", periods=4, freq="h")
+        ds = xr.Dataset(
+            {"no2_conc": (("time", "level", "latitude", "longitude"), np.zeros((4, 1, 2, 3), "float32"))},
+            coords={"time": times, "level": [0.0], "latitude": [45.0, 44.9], "longitude": [7.0, 7.1, 7.2]})
+        time_dim, band_time = band_times(VariableReader(ds["no2_conc"]), ds)
+        self.assertEqual(time_dim, "time")
+        self.assertEqual(len(band_time), 4)
+        self.assertEqual(band_for_time(band_time, np.datetime64("2022-01-01T01:30")), 1)
+        self.assertEqual(band_for_time(band_time, np.datetime64("2021-12-31T23:00")), 0)
+        self.assertEqual(band_for_time(band_time, np.datetime64("2022-01-02T00:00")), 3)
+        self.assertEqual(band_ranges(band_time)[-1][1], np.datetime64("2022-01-01T04:00"))
+
+    def test_value_range_covers_all_frames(self):
+        """One stretch spans the values of every time step, ignoring fill values."""
+        data = np.arange(24, dtype="float32").reshape(4, 2, 3)
+        data[0, 0, 0] = np.nan
+        ds = xr.Dataset({"no2_conc": (("time", "latitude", "longitude"), data)},
+                        coords={"time": pd.date_range("2022-01-01", periods=4, freq="h")})
+        values = preview_statistics(VariableReader(ds["no2_conc"]))["values"]
+        self.assertEqual(value_range(values), (1.0, 23.0))
+        self.assertIsNone(value_range({"min": np.nan, "max": np.nan}))
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(TemporalLayerTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,93 @@
+# coding=utf-8
+"""Virtual time mosaic test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from tools.vrt_mosaic import build_vrt_xml, read_vrt_sources, vrt_band_times
+
+
+def make_source(name, times, xsize=4):
+    """Source description as returned by describe_source."""
+    return {
+        "path": f"/data/{name}.nc",
+        "variable": "no2_conc",
+        "uri": f'NETCDF:"/data/{name}.nc":no2_conc',
+        "xsize": xsize,
+        "ysize": 3,
+        "geotransform": [-25.0, 0.1, 0.0, 72.0, 0.0, -0.1],
+        "srs": "EPSG:4326",
+        "data_type": "Float32",
+        "nodata": -999.0,
+        "times": times,
+        "stats": [[float(i), float(i) + 10.0, 5.0, 1.0] for i in range(len(times))],
+    }
+
+
+class VrtMosaicTest(unittest.TestCase):
+    """Test the VRT stacking monthly files in time order."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Runs after each test."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_bands_in_time_order(self):
+        """Bands reference the right source band, sorted by time without duplicates."""
+        february = make_source("feb", ["2022-02-01T00:00:00", "2022-02-01T01:00:00"])
+        january = make_source("jan", ["2022-01-31T23:00:00", "2022-02-01T00:00:00"])
+        xml, times = build_vrt_xml([february, january])
+        self.assertEqual(times, ["2022-01-31T23:00:00", "2022-02-01T00:00:00", "2022-02-01T01:00:00"])
+
+        path = os.path.join(self.tmp_dir, "mosaic.vrt")
+        with open(path, "w") as f:
+            f.write(xml)
+        bands = ET.parse(path).getroot().findall("VRTRasterBand")
+        sources = [(b.findtext("SimpleSource/SourceFilename"), b.findtext("SimpleSource/SourceBand")) for b in bands]
+        self.assertEqual(sources, [(january["uri"], "1"), (january["uri"], "2"), (february["uri"], "2")])
+        np.testing.assert_array_equal(vrt_band_times(path), np.array(times, dtype="datetime64[ms]"))
+        self.assertEqual([s["path"] for s in read_vrt_sources(path)], ["/data/jan.nc", "/data/feb.nc"])
+        metadata = {m.get("key"): m.text for m in bands[0].findall("Metadata/MDI")}
+        self.assertEqual(float(metadata["CAMS_GLOBAL_MAXIMUM"]), 11.0)
+
+    def test_grid_mismatch_is_rejected(self):
+        """Files on different grids cannot be stacked."""
+        with self.assertRaises(ValueError):
+            build_vrt_xml([make_source("a", ["2022-01-01T00:00:00"]),
+                           make_source("b", ["2022-02-01T00:00:00"], xsize=5)])
+
+    def test_source_mismatch_is_rejected(self):
+        """Files with another variable, geotransform or value type cannot be stacked."""
+        january = make_source("jan", ["2022-01-01T00:00:00"])
+        shifted = make_source("feb", ["2022-02-01T00:00:00"])
+        shifted["geotransform"] = [-24.95, 0.1, 0.0, 72.0, 0.0, -0.1]
+        other_variable = dict(make_source("feb", ["2022-02-01T00:00:00"]), variable="o3_conc")
+        other_type = dict(make_source("feb", ["2022-02-01T00:00:00"]), data_type="Float64")
+        for source in (shifted, other_variable, other_type):
+            with self.assertRaises(ValueError):
+                build_vrt_xml([january, source])
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(VrtMosaicTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,105 @@
+# coding=utf-8
+"""Zarr store test.
+
+.. note:: This program is free software; you can redistribute it and/or modify
+     it under the terms of the GNU General Public License as published by
+     the Free Software Foundation; either version 2 of the License, or
+     (at your option) any later version.
+
+"""
+
+__author__ = 'zhanbin.wu@mail.polimi.it'
+__date__ = '2025-05-02'
+__copyright__ = 'Copyright 2025, POLIMI'
+
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from tools.aggregation import aggregate_files
+from tools.compute import ComputeBackend
+from tools.kernels import close_files
+from tools.zarr_store import append_to_store, ingest_files, store_chunks, store_times
+
+
+def write_month(path, month, lats=(50.0, 49.9, 49.8), seed=0):
+    """Write one month of hourly random data with some missing values."""
+    times = pd.date_range(month, pd.Timestamp(month) + pd.offsets.MonthBegin(1), freq="h", inclusive="left")
+    values = np.random.default_rng(seed).gamma(2.0, 10.0, (len(times), 1, len(lats), 2)).astype("float32")
+    values[::7, 0, 0, 0] = np.nan
+    xr.Dataset(
+        {"no2_conc": (("time", "level", "latitude", "longitude"), values, {"units": "µg/m3"})},
+        coords={"time": times, "level": [0.0], "latitude": list(lats), "longitude": [5.0, 5.1]},
+    ).to_netcdf(path, encoding={"no2_conc": {"zlib": True, "_FillValue": -999.0}})
+
+
+@unittest.skipUnless(importlib.util.find_spec("zarr"), "zarr is not installed")
+class ZarrStoreTest(unittest.TestCase):
+    """Test months are appended to a store and read back like NetCDF files."""
+
+    def setUp(self):
+        """Runs before each test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.months = []
+        for seed, month in enumerate(["2022-01", "2022-02", "2022-03"]):
+            path = os.path.join(self.tmp_dir, f"cams.eaq.vra.ENSa.no2.l0.{month}.nc")
+            write_month(path, month, seed=seed)
+            self.months.append(path)
+        self.store = os.path.join(self.tmp_dir, "stores", "no2.zarr")
+
+    def tearDown(self):
+        """Runs after each test."""
+        close_files()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_append_only(self):
+        # Months given out of order are appended in time order
+        self.assertEqual(ingest_files(self.months[1::-1], self.store), (31 + 28) * 24)
+        # A month already in the store is skipped, an earlier one refused
+        self.assertEqual(append_to_store(self.months[1], self.store), 0)
+        self.assertEqual(append_to_store(self.months[2], self.store), 31 * 24)
+        self.assertEqual(len(store_times(self.store)), (31 + 28 + 31) * 24)
+        with xr.open_zarr(self.store) as store, \
+                xr.concat([xr.open_dataset(path) for path in self.months], "time") as expected:
+            np.testing.assert_array_equal(store["no2_conc"].values, expected["no2_conc"].values)
+            self.assertEqual(store["no2_conc"].attrs["units"], "µg/m3")
+
+    def test_refuses_other_grid(self):
+        append_to_store(self.months[0], self.store)
+        other = os.path.join(self.tmp_dir, "other.nc")
+        write_month(other, "2022-02", lats=(45.0, 44.9, 44.8))
+        with self.assertRaises(ValueError):
+            append_to_store(other, self.store)
+        shutil.rmtree(self.store)
+        append_to_store(self.months[1], self.store)
+        with self.assertRaises(ValueError):
+            append_to_store(self.months[0], self.store)
+
+    def test_store_chunks(self):
+        data = xr.DataArray(np.zeros((100, 1, 40, 30)), dims=("time", "level", "latitude", "longitude"))
+        self.assertEqual(store_chunks(data, 24, 24 * 300), (24, 1, 10, 30))
+        self.assertEqual(store_chunks(data, 24, 10 ** 6), (24, 1, 40, 30))
+
+    def test_aggregate_store(self):
+        ingest_files(self.months, self.store)
+        output = os.path.join(self.tmp_dir, "weekly.nc")
+        with ComputeBackend(workers=2) as backend:
+            aggregate_files([self.store], output, "1W", backend)
+        inputs = [xr.open_dataset(path) for path in self.months]
+        expected = xr.concat(inputs, "time").resample(time="1W").mean().load()
+        for ds in inputs:
+            ds.close()
+        with xr.open_dataset(output) as result:
+            np.testing.assert_allclose(result["no2_conc"].values, expected["no2_conc"].values, rtol=1e-5)
+
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(ZarrStoreTest)
+    runner = unittest.TextTestRunner(verbosity=2)
+    runner.run(suite)
@@ -0,0 +1,52 @@
+"""
+Command line entry point of the headless batch runner (see tools/batch.py).
+
+Run from the plugin directory:
+
+    python -m tools run plan.yaml --log progress.jsonl
+    python -m tools plan plan.yaml
+
+"run" executes the plan and exits with status 1 if any job failed; "plan"
+only prints the ADS requests the plan would submit.
+"""
+
+import argparse
+import json
+import sys
+
+from .batch import DOWNLOAD_FIELDS, ProgressLog, load_plan, run_plan
+from .download_plan import plan_downloads
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools", description="CAMS batch download and processing")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="execute a plan")
+    run.add_argument("plan", help="JSON or YAML plan file")
+    run.add_argument("--workers", type=int, help="number of parallel workers (overrides the plan)")
+    run.add_argument("--log", help="append JSON progress lines to this file instead of stdout")
+    dry_run = commands.add_parser("plan", help="print the ADS requests of a plan without running it")
+    dry_run.add_argument("plan", help="JSON or YAML plan file")
+    args = parser.parse_args(argv)
+
+    try:
+        plan = load_plan(args.plan)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 2
+
+    if args.command == "plan":
+        download_plan = plan_downloads(*(plan["download"][key] for key in DOWNLOAD_FIELDS))
+        for request in download_plan.requests:
+            print(json.dumps(request.to_api()))
+        print(download_plan.describe(), file=sys.stderr)
+        return 0
+
+    if args.workers:
+        plan["workers"] = args.workers
+    result = run_plan(plan, ProgressLog(args.log))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+This module aggregates CAMS NetCDF files over time.
+The input is either a list of files or a catalog query result (see
+catalog.Catalog.query), so the files covering a study period can be
+aggregated without picking them one by one.
+"""
+
+from contextlib import ExitStack, closing
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from .catalog import query_paths
+from .compute import get_backend
+from .kernels import period_mean
+
+# Aggregation names of the Analysis tab -> pandas resampling frequencies
+AGGREGATION_FREQUENCIES = {"Daily": "1D", "Weekly": "1W", "Monthly": "1M", "Quarterly": "1Q", "Yearly": "1Y"}
+
+
+def iter_aggregate(source, output_path, frequency="1M", backend=None):
+    """
+    Write the temporal mean of one or more NetCDF files at a coarser frequency,
+    one output period at a time.
+
+    Every period is a task of the compute backend that reads only its own
+    time steps, in chunks sized by the chunk planner, and writes its mean in
+    place into shared memory, so periods run in parallel and progress can be
+    reported (and the work stopped) between them. Periods without any time
+    step are left out of the output. The files must share their grid; they
+    are only read lazily here, without dask.
+
+    Args:
+        source: List of NetCDF paths or a catalog.Coverage.
+        output_path: Output NetCDF path.
+        frequency: pandas resampling frequency, e.g. "1D" or "1M".
+        backend: compute.ComputeBackend (default: the shared one).
+
+    Yields:
+        float: Fraction of the periods done.
+
+    Returns:
+        list: Paths of the input files (the lineage of the output).
+
+    Raises:
+        ValueError: If there is no input file.
+    """
+    paths = query_paths(source)
+    if not paths:
+        raise ValueError("No input file to aggregate.")
+    # Time steps of all files in time order, as (file, position in the file)
+    times, steps = [], []
+    for path in paths:
+        with xr.open_dataset(path) as ds:
+            times.extend(ds.indexes["time"])
+            steps.extend((path, position) for position in range(ds.sizes["time"]))
+    order = pd.Series(np.arange(len(steps)), index=pd.DatetimeIndex(times)).sort_index()
+    periods = [(label, group.values) for label, group in order.resample(frequency) if len(group)]
+    backend = backend or get_backend()
+    ds = xr.open_dataset(paths[0])
+    try:
+        timed = [name for name in ds.data_vars
+                 if "time" in ds[name].dims and np.issubdtype(ds[name].dtype, np.number)]
+        plane = max((ds[name].size // ds.sizes["time"] for name in timed), default=1)
+        steps_per_read = max(1, backend.planner.elements() // max(1, plane))
+        with ExitStack() as stack:
+            # The workers write the mean of each period into its row of a shared array
+            out = {}
+            for name in timed:
+                dims = ("time",) + tuple(dim for dim in ds[name].dims if dim != "time")
+                shape = (len(periods),) + tuple(ds.sizes[dim] for dim in dims[1:])
+                out[name] = dims, stack.enter_context(backend.shared_array(shape, np.float32))
+            shared = {name: means for name, (_, means) in out.items()}
+            tasks = []
+            for index, (_, members) in enumerate(periods):
+                segments = {}
+                for member in members:
+                    path, position = steps[member]
+                    segments.setdefault(path, []).append(position)
+                segments = [(path, np.array(positions)) for path, positions in segments.items()]
+                tasks.append((segments, timed, index, shared, steps_per_read))
+            with closing(backend.map_unordered(period_mean, tasks)) as results:
+                for done, _ in enumerate(results, 1):
+                    yield done / len(periods)
+            coords = {name: coord for name, coord in ds.coords.items() if "time" not in coord.dims}
+            coords["time"] = pd.DatetimeIndex([label for label, _ in periods])
+            agg_ds = xr.Dataset(
+                {name: (dims, means.array.copy(), ds[name].attrs) for name, (dims, means) in out.items()},
+                coords=coords,
+            )
+        agg_ds.attrs = ds.attrs
+        agg_ds.to_netcdf(output_path)
+    finally:
+        ds.close()
+    return paths
+
+
+def aggregate_files(source, output_path, frequency="1M", backend=None):
+    """
+    Write the temporal mean of one or more NetCDF files at a coarser frequency.
+
+    Args:
+        source: List of NetCDF paths or a catalog.Coverage.
+        output_path: Output NetCDF path.
+        frequency: pandas resampling frequency, e.g. "1D" or "1M".
+        backend: compute.ComputeBackend (default: the shared one).
+
+    Returns:
+        list: Paths of the input files (the lineage of the output).
+
+    Raises:
+        ValueError: If there is no input file.
+    """
+    jobs = iter_aggregate(source, output_path, frequency, backend)
+    while True:
+        try:
+            next(jobs)
+        except StopIteration as stop:
+            return stop.value
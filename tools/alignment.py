@@ -0,0 +1,310 @@
+"""
+This module aligns CAMS NetCDF variables for bivariate and intercomparison analysis.
+Time steps are inner-joined on their timestamps, and when the grids differ the
+finer ones are bilinearly interpolated onto the coarsest one over their common
+extent. Only the overlapping hyperslab of each file is ever read, and the
+interpolation weights are cached per (source grid, target grid) pair.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .chunking import default_planner
+
+TIME_NAMES = ("time", "valid_time", "t")
+LAT_NAMES = ("latitude", "lat")
+LON_NAMES = ("longitude", "lon")
+
+# Tolerance (degrees) below which two coordinate values are considered equal
+COORD_TOLERANCE = 1e-6
+
+
+def _find_dim(dims, candidates):
+    for name in candidates:
+        if name in dims:
+            return name
+    return None
+
+
+def _grid_dims(reader):
+    """Return the (time, lat, lon) dimension names of a variable (time may be None)."""
+    dims = reader.dims
+    lat = _find_dim(dims, LAT_NAMES)
+    lon = _find_dim(dims, LON_NAMES)
+    if lat is None or lon is None:
+        raise ValueError(f"Variable '{reader.name}' has no latitude/longitude dimensions: {dims}")
+    return _find_dim(dims, TIME_NAMES), lat, lon
+
+
+def _extra_indexers(reader, used):
+    """Select index 0 of any remaining singleton dimension (e.g. level)."""
+    indexers = {}
+    for dim, size in zip(reader.dims, reader.shape):
+        if dim in used:
+            continue
+        if size != 1:
+            raise ValueError(
+                f"Variable '{reader.name}' has a non-singleton extra dimension '{dim}' ({size}); "
+                "select a single level before bivariate analysis."
+            )
+        indexers[dim] = 0
+    return indexers
+
+
+def _as_index(indices):
+    """Turn a sorted index array into a slice when it is contiguous."""
+    indices = np.asarray(indices)
+    if indices.size and np.all(np.diff(indices) == 1):
+        return slice(int(indices[0]), int(indices[-1]) + 1)
+    return indices
+
+
+def _spacing(coord):
+    return float(np.median(np.abs(np.diff(coord)))) if coord.size > 1 else 0.0
+
+
+def _overlap_indices(coord, lo, hi, pad=0):
+    """Indices of coord within [lo, hi], widened by pad cells on each side."""
+    inside = np.nonzero((coord >= lo - COORD_TOLERANCE) & (coord <= hi + COORD_TOLERANCE))[0]
+    if inside.size == 0:
+        return slice(0, 0)
+    start = max(0, int(inside[0]) - pad)
+    stop = min(coord.size, int(inside[-1]) + 1 + pad)
+    return slice(start, stop)
+
+
+@lru_cache(maxsize=32)
+def _linear_weights_cached(src, dst):
+    src = np.asarray(src, dtype=np.float64)
+    dst = np.asarray(dst, dtype=np.float64)
+    n = src.size
+    if n == 1:
+        zeros = np.zeros(dst.size, dtype=np.intp)
+        return zeros, zeros, np.zeros(dst.size, dtype=np.float32)
+    descending = src[0] > src[-1]
+    ascending = src[::-1] if descending else src
+    i1 = np.clip(np.searchsorted(ascending, dst, side="left"), 1, n - 1)
+    i0 = i1 - 1
+    weight = (dst - ascending[i0]) / (ascending[i1] - ascending[i0])
+    weight = np.clip(weight, 0.0, 1.0).astype(np.float32)
+    if descending:
+        i0, i1 = n - 1 - i0, n - 1 - i1
+    return i0, i1, weight
+
+
+def linear_weights(src, dst):
+    """
+    Linear interpolation indices and weights from a 1D source axis to a target axis.
+
+    Results are cached, so regridding many chunks (or repeated runs on the same
+    pair of grids) computes the weights only once.
+
+    Args:
+        src: Monotonic source coordinates (ascending or descending).
+        dst: Target coordinates, within the source range.
+
+    Returns:
+        tuple: (i0, i1, w) so that value = src_values[i0] * (1 - w) + src_values[i1] * w.
+    """
+    return _linear_weights_cached(tuple(np.asarray(src, dtype=np.float64).tolist()),
+                                  tuple(np.asarray(dst, dtype=np.float64).tolist()))
+
+
+def regrid_bilinear(chunk, lat_weights, lon_weights):
+    """
+    Bilinearly interpolate a (time, lat, lon) chunk with precomputed axis weights.
+
+    Args:
+        chunk: float32 array of shape (time, lat, lon).
+        lat_weights: (i0, i1, w) from linear_weights along latitude.
+        lon_weights: (i0, i1, w) from linear_weights along longitude.
+
+    Returns:
+        numpy.ndarray: float32 array on the target grid. A target cell is NaN if
+            any of its source neighbours is missing.
+    """
+    i0, i1, w = lat_weights
+    rows = chunk[:, i0, :] * (1 - w)[None, :, None] + chunk[:, i1, :] * w[None, :, None]
+    j0, j1, v = lon_weights
+    return rows[:, :, j0] * (1 - v)[None, None, :] + rows[:, :, j1] * v[None, None, :]
+
+
+class _AlignedSide:
+    """Read plan for one of the aligned variables."""
+
+    def __init__(self, reader, ds):
+        self.reader = reader
+        self.time_dim, self.lat_dim, self.lon_dim = _grid_dims(reader)
+        used = {d for d in (self.time_dim, self.lat_dim, self.lon_dim) if d}
+        self.extra = _extra_indexers(reader, used)
+        self.lat = np.asarray(ds[self.lat_dim].values, dtype=np.float64)
+        self.lon = np.asarray(ds[self.lon_dim].values, dtype=np.float64)
+        self.times = np.asarray(ds[self.time_dim].values) if self.time_dim else None
+        # Set by AlignedGroup
+        self.time_index = None
+        self.lat_index = None
+        self.lon_index = None
+        self.lat_weights = None
+        self.lon_weights = None
+
+    def read(self, time_positions):
+        """Read the overlapping hyperslab for the given positions in the common time axis."""
+        indexers = dict(self.extra)
+        indexers[self.lat_dim] = self.lat_index
+        indexers[self.lon_dim] = self.lon_index
+        if self.time_dim:
+            indexers[self.time_dim] = _as_index(self.time_index[time_positions])
+        chunk = self.reader.read(**indexers)
+        # Reorder to (time, lat, lon) whatever the storage order is
+        order = [d for d in self.reader.dims if d in indexers and d not in self.extra]
+        target = [d for d in (self.time_dim, self.lat_dim, self.lon_dim) if d]
+        chunk = np.transpose(chunk, [order.index(d) for d in target])
+        if not self.time_dim:
+            chunk = chunk[None, :, :]
+        if self.lat_weights is not None:
+            chunk = regrid_bilinear(chunk, self.lat_weights, self.lon_weights)
+        return chunk
+
+
+class AlignedGroup:
+    """
+    Any number of variables aligned on common time steps and a common grid.
+
+    Time steps are inner-joined across all inputs and the grid is the common
+    extent of the coarsest input; every input on a different grid is
+    bilinearly interpolated onto it.
+
+    Args:
+        inputs: Sequence of (nc_reader.VariableReader, xarray.Dataset) tuples,
+            the dataset being the one the reader was opened from (for coordinates).
+
+    Raises:
+        ValueError: If the variables share no time step or no spatial overlap.
+    """
+
+    def __init__(self, inputs):
+        if len(inputs) < 2:
+            raise ValueError("At least two variables are needed for alignment.")
+        self.sides = tuple(_AlignedSide(reader, ds) for reader, ds in inputs)
+        self._join_time()
+        self._join_grid()
+
+    def _join_time(self):
+        with_time = [side.times is not None for side in self.sides]
+        if not all(with_time):
+            if any(with_time):
+                raise ValueError("Only some of the variables have a time dimension.")
+            for side in self.sides:
+                side.time_index = np.zeros(1, dtype=np.intp)
+            self.times = None
+            return
+        times = self.sides[0].times
+        for side in self.sides[1:]:
+            times = np.intersect1d(times, side.times, assume_unique=True)
+        if times.size == 0:
+            raise ValueError("The files have no time step in common.")
+        for side in self.sides:
+            side.time_index = np.nonzero(np.isin(side.times, times))[0]
+        self.times = times
+
+    def _join_grid(self):
+        lat_lo = max(side.lat.min() for side in self.sides)
+        lat_hi = min(side.lat.max() for side in self.sides)
+        lon_lo = max(side.lon.min() for side in self.sides)
+        lon_hi = min(side.lon.max() for side in self.sides)
+        if lat_lo > lat_hi + COORD_TOLERANCE or lon_lo > lon_hi + COORD_TOLERANCE:
+            raise ValueError("The files do not overlap spatially.")
+
+        for side in self.sides:
+            side.lat_index = _overlap_indices(side.lat, lat_lo, lat_hi)
+            side.lon_index = _overlap_indices(side.lon, lon_lo, lon_hi)
+
+        # Interpolate every finer (or shifted) grid onto the coarsest one
+        target = max(self.sides, key=lambda side: _spacing(side.lat) * _spacing(side.lon))
+        self.lat = target.lat[target.lat_index]
+        self.lon = target.lon[target.lon_index]
+        if self.lat.size == 0 or self.lon.size == 0:
+            raise ValueError("The files do not overlap spatially.")
+        self.regridded_inputs = []
+        for number, side in enumerate(self.sides, start=1):
+            lat, lon = side.lat[side.lat_index], side.lon[side.lon_index]
+            if (lat.shape == self.lat.shape and lon.shape == self.lon.shape
+                    and np.allclose(lat, self.lat, atol=COORD_TOLERANCE)
+                    and np.allclose(lon, self.lon, atol=COORD_TOLERANCE)):
+                continue
+            side.lat_index = _overlap_indices(side.lat, lat_lo, lat_hi, pad=1)
+            side.lon_index = _overlap_indices(side.lon, lon_lo, lon_hi, pad=1)
+            side.lat_weights = linear_weights(side.lat[side.lat_index], self.lat)
+            side.lon_weights = linear_weights(side.lon[side.lon_index], self.lon)
+            self.regridded_inputs.append(number)
+
+    @property
+    def n_times(self):
+        return 1 if self.times is None else int(self.times.size)
+
+    @property
+    def shape(self):
+        """Shape (time, lat, lon) of the aligned arrays."""
+        return self.n_times, self.lat.size, self.lon.size
+
+    def iter_chunks(self, chunk_elements=None):
+        """
+        Read all variables chunk by chunk along the common time axis.
+
+        Args:
+            chunk_elements: Approximate number of aligned elements per chunk and
+                input (default: planned from the memory budget, see chunking).
+
+        Yields:
+            tuple: One float32 array of shape (time, lat, lon) per input, on the common grid.
+        """
+        per_step = max(1, self.lat.size * self.lon.size)
+        if chunk_elements is None:
+            ranges = default_planner().ranges(self.n_times, per_step, inputs=len(self.sides), tasks=1)
+        else:
+            step = max(1, chunk_elements // per_step)
+            ranges = [(start, min(start + step, self.n_times)) for start in range(0, self.n_times, step)]
+        for start, stop in ranges:
+            positions = np.arange(start, stop)
+            yield tuple(side.read(positions) for side in self.sides)
+
+    def read(self):
+        """
+        Read all aligned variables in full.
+
+        Returns:
+            tuple: One float32 array of shape (time, lat, lon) per input.
+        """
+        chunks = list(zip(*self.iter_chunks()))
+        return tuple(np.concatenate(parts) for parts in chunks)
+
+    def describe(self):
+        """Short human-readable summary of the alignment."""
+        text = f"Aligned {self.n_times} common time steps on a {self.lat.size}×{self.lon.size} grid"
+        if self.regridded_inputs:
+            text += f" (file {', '.join(str(n) for n in self.regridded_inputs)} regridded)"
+        return text
+
+
+class AlignedPair(AlignedGroup):
+    """
+    Two variables aligned on common time steps and a common grid.
+
+    Args:
+        reader1: nc_reader.VariableReader of the primary variable.
+        ds1: Dataset reader1 was opened from (for coordinates).
+        reader2: nc_reader.VariableReader of the secondary variable.
+        ds2: Dataset reader2 was opened from (for coordinates).
+
+    Raises:
+        ValueError: If the variables share no time step or no spatial overlap.
+    """
+
+    def __init__(self, reader1, ds1, reader2, ds2):
+        super().__init__([(reader1, ds1), (reader2, ds2)])
+
+    @property
+    def regridded(self):
+        """Number (1 or 2) of the regridded variable, or None if the grids match."""
+        return self.regridded_inputs[0] if self.regridded_inputs else None
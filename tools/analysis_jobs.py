@@ -0,0 +1,349 @@
+"""
+This module holds the analyses of the Analysis tab as Qt-free jobs.
+A job is a generator that yields (fraction done, partial result or None) after
+every chunk it reads and returns its final result, so the caller decides where
+it runs: tasks.AnalysisTask runs jobs in a QGIS background thread, reporting
+the fractions as task progress and stopping at the next chunk when cancelled.
+Jobs only open and close their own files; they never touch the GUI. The
+chunks themselves are read by the workers of the compute backend (see
+compute.py) and their accumulators merged here as they come back.
+"""
+
+import os
+from contextlib import closing
+
+import numpy as np
+
+from .aggregation import iter_aggregate
+from .alignment import AlignedGroup, AlignedPair
+from .bivariate import BivariateAccumulator, PixelRegressionAccumulator, write_pixel_maps, PIXEL_MAP_BANDS
+from .categorical import ConfusionAccumulator, class_labels, format_categorical
+from .chunking import TASKS_PER_WORKER
+from .compute import get_backend
+from .intercomparison import IntercomparisonAccumulator, write_matrix_tables, format_matrix
+from .kernels import pair_chunk, pixel_chunk, statistics_chunk, zonal_chunk
+from .nc_reader import open_dataset, VariableReader
+from .statistics import (RunningStats, iter_merged_statistics, preview_statistics, spread_order, zone_cells,
+                         zone_results)
+
+# Bivariate methods computed from pooled co-moments
+POOLED_METHODS = ("Correlation", "Linear Regression", "Skill Scores")
+
+
+class OpenVariables:
+    """
+    Open one variable per file for a job; the datasets are closed on exit.
+    """
+
+    def __init__(self, paths, variables):
+        self.paths = paths
+        self.variables = variables
+        self.datasets = []
+
+    def __enter__(self):
+        inputs = []
+        for path, variable in zip(self.paths, self.variables):
+            ds = open_dataset(path)
+            self.datasets.append(ds)
+            # Fill values are decoded per chunk by the shared reader
+            inputs.append((VariableReader(ds[variable]), ds))
+        return inputs
+
+    def __exit__(self, *exc):
+        for ds in self.datasets:
+            ds.close()
+        return False
+
+
+def _iter_group_chunks(group):
+    """Aligned chunks of an AlignedGroup with the fraction of time steps read."""
+    read = 0
+    for chunks in group.iter_chunks():
+        read += chunks[0].shape[0]
+        yield read / max(1, group.n_times), chunks
+
+
+def _progress(steps):
+    """Job steps (fraction, None) of a generator of fractions, keeping its return value."""
+    while True:
+        try:
+            fraction = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield fraction, None
+
+
+def _chunk_tasks(paths, variables, readers, planner):
+    """(path, variable, start, stop) chunk tasks along the first dimension of each variable."""
+    tasks = []
+    # Aim at enough tasks for all the workers over all the files together
+    per_file = max(1, planner.workers * TASKS_PER_WORKER // max(1, len(readers)))
+    for path, variable, reader in zip(paths, variables, readers):
+        length = reader.shape[0] if reader.ndim else 1
+        for start, stop in planner.ranges(length, reader.size // max(1, length), reader.data.dtype, tasks=per_file):
+            tasks.append((path, variable, start, stop))
+    return tasks
+
+
+def _pair_ranges(pair, backend):
+    """Time step ranges of the chunk tasks of an aligned pair."""
+    # Both variables of a chunk are held at once
+    return backend.planner.ranges(pair.n_times, pair.lat.size * pair.lon.size, inputs=2)
+
+
+def _pair_accumulator(acc, pair, paths, variables, kind, backend, edges=None):
+    """
+    Merge the accumulators of the aligned chunks of a pair, computed by the
+    backend (see kernels.pair_chunk).
+
+    Yields:
+        float: Fraction of the chunks merged.
+
+    Returns:
+        The accumulator acc with every chunk merged in.
+    """
+    tasks = [(paths, variables, start, stop, kind, edges) for start, stop in _pair_ranges(pair, backend)]
+    with closing(backend.map_unordered(pair_chunk, tasks)) as results:
+        for done, (_, part) in enumerate(results, 1):
+            acc.merge(part)
+            yield done / len(tasks)
+    return acc
+
+
+def _pixel_sums(acc, pair, paths, variables, backend):
+    """
+    Add the per-pixel regression sums of the aligned chunks of a pair to acc.
+    The workers write the sums of each chunk into a free slot of a shared
+    array (see kernels.pixel_chunk), which is added here before it is reused.
+
+    Yields:
+        float: Fraction of the chunks added.
+
+    Returns:
+        The bivariate.PixelRegressionAccumulator acc.
+    """
+    tasks = [(paths, variables, start, stop) for start, stop in _pair_ranges(pair, backend)]
+    slots = max(1, backend.workers)
+    with backend.shared_array((slots, len(acc.SUMS)) + pair.shape[1:], np.float64) as out:
+        tasks = [task + (out,) for task in tasks]
+        with closing(backend.map_slots(pixel_chunk, tasks, slots)) as results:
+            for done, (_, slot, _) in enumerate(results, 1):
+                acc.add_sums(out.array[slot])
+                yield done / len(tasks)
+    return acc
+
+
+def statistics_job(paths, variables, backend=None):
+    """
+    Statistics of one file (progressive estimate) or pooled over several files.
+
+    Yields:
+        tuple: (fraction, estimate record of statistics.iter_progressive_statistics).
+
+    Returns:
+        dict: The exact record.
+    """
+    backend = backend or get_backend()
+    with OpenVariables(paths, variables) as inputs:
+        readers = [reader for reader, _ in inputs]
+        preview_count = 0
+        if len(readers) == 1:
+            # Show a quick estimate first, then refine it as the chunks come back
+            record = preview_statistics(readers[0])
+            yield record["fraction"], record
+            if record["exact"]:
+                return record
+            preview_count = record["count"]
+        # Chunks spread over the period, so partial results cover all of it
+        tasks = spread_order(_chunk_tasks(paths, variables, readers, backend.planner))
+        total = sum(reader.size for reader in readers)
+    with closing(backend.map_unordered(statistics_chunk, tasks)) as results:
+        for record in iter_merged_statistics((part for _, part in results), total, preview_count):
+            yield record["fraction"], record
+    return record
+
+
+def zonal_statistics_job(paths, variable, masks, backend=None):
+    """
+    Statistics of a variable pooled over several files, inside each zone.
+
+    Args:
+        masks: Dictionary of zone id -> boolean array of shape (lat, lon).
+
+    Returns:
+        dict: Zone id -> mean, min, max, std and count.
+    """
+    backend = backend or get_backend()
+    with OpenVariables(paths, [variable] * len(paths)) as inputs:
+        readers = [reader for reader, _ in inputs]
+        tasks = _chunk_tasks(paths, [variable] * len(paths), readers, backend.planner)
+    # The cell indices of all zones go to the workers through shared memory
+    cells = zone_cells(masks)
+    zones = []
+    size = 0
+    for zone, index in cells.items():
+        zones.append((zone, size, size + index.size))
+        size += index.size
+    accs = {zone: RunningStats() for zone in masks}
+    with backend.shared_array((size,), np.intp) as shared:
+        if size:
+            shared.array[:] = np.concatenate(list(cells.values()))
+        tasks = [task + (shared, zones) for task in tasks]
+        with closing(backend.map_unordered(zonal_chunk, tasks)) as results:
+            for done, (_, (parts, _)) in enumerate(results, 1):
+                for zone, part in parts.items():
+                    accs[zone].merge(part)
+                yield done / len(tasks), None
+    return zone_results(accs)
+
+
+def aggregation_job(paths, output_path, frequency, backend=None):
+    """
+    Temporal aggregation (see aggregation.iter_aggregate).
+
+    Returns:
+        list: Input paths (the lineage of the output).
+    """
+    lineage = yield from _progress(iter_aggregate(paths, output_path, frequency, backend))
+    return lineage
+
+
+def bivariate_job(path1, var1, path2, var2, method, edges=None, backend=None):
+    """
+    Pooled bivariate statistics or categorical scores of two aligned variables.
+
+    Args:
+        method: One of POOLED_METHODS or "Categorical Skill Scores".
+        edges: Class edges of the categorical scores.
+
+    Returns:
+        tuple: (result text for the Analysis tab, True if it is a result worth
+            caching rather than a "no data" message).
+    """
+    with OpenVariables([path1, path2], [var1, var2]) as ((reader1, ds1), (reader2, ds2)):
+        # Join on common time steps and a common grid, reading only the overlap
+        pair = AlignedPair(reader1, ds1, reader2, ds2)
+        backend = backend or get_backend()
+        paths, variables = (path1, path2), (var1, var2)
+        if method in POOLED_METHODS:
+            # Pooled statistics from co-moments merged over aligned chunks
+            steps = _pair_accumulator(BivariateAccumulator(), pair, paths, variables, "pooled", backend)
+            acc = yield from _progress(steps)
+            if acc.n == 0:
+                return f"No valid data for {method.lower()}.", False
+        if method == "Correlation":
+            corr = acc.correlation()
+            result = f"Pearson correlation: {corr['r']:.4f}\np-value: {corr['pvalue']:.4g}"
+        elif method == "Linear Regression":
+            reg = acc.regression()
+            result = (
+                f"Linear regression:\n"
+                f"y = {reg['slope']:.4f} * x + {reg['intercept']:.4f}\n"
+                f"R² = {reg['r2']:.4f}\n"
+                f"p-value = {reg['pvalue']:.4g}\n"
+                f"StdErr = {reg['stderr']:.4g}"
+            )
+        elif method == "Skill Scores":
+            scores = acc.skill_scores()
+            result = (
+                f"Skill scores (secondary vs primary):\n"
+                f"Mean bias = {scores['bias']:.4f}, NMB = {scores['nmb']:.2%}\n"
+                f"RMSE = {scores['rmse']:.4f}, MAE = {scores['mae']:.4f}\n"
+                f"r = {scores['r']:.4f}, std ratio = {scores['std_ratio']:.4f}\n"
+                f"Pairs: {scores['n']}"
+            )
+        elif method == "Categorical Skill Scores":
+            # Confusion matrix of class indices, summed over aligned chunks
+            steps = _pair_accumulator(ConfusionAccumulator(edges), pair, paths, variables, "categorical",
+                                      backend, edges)
+            acc = yield from _progress(steps)
+            if acc.matrix.sum() == 0:
+                return "No valid data for categorical skill scores.", False
+            result = (
+                f"Categorical skill scores (class edges: {', '.join(f'{e:g}' for e in edges)}):\n"
+                f"{format_categorical(acc.result(), class_labels(edges))}"
+            )
+        else:
+            return "This analysis method is not implemented yet.", False
+        return f"{result}\n{pair.describe()}", True
+
+
+def pixel_correlation_job(path1, var1, path2, var2, out_path, backend=None):
+    """
+    r, slope, intercept, R² and p-value of every grid cell along time,
+    written as a multi-band GeoTIFF.
+
+    Returns:
+        str: Result text for the Analysis tab.
+    """
+    with OpenVariables([path1, path2], [var1, var2]) as ((reader1, ds1), (reader2, ds2)):
+        pair = AlignedPair(reader1, ds1, reader2, ds2)
+        steps = _pixel_sums(PixelRegressionAccumulator(pair.shape[1:]), pair, (path1, path2), (var1, var2),
+                            backend or get_backend())
+        acc = yield from _progress(steps)
+        maps = acc.result()
+        write_pixel_maps(out_path, maps, pair.lat, pair.lon)
+        valid = np.isfinite(maps["r"])
+        result = (
+            f"Per-pixel correlation map ({', '.join(PIXEL_MAP_BANDS)} bands):\n"
+            f"{out_path}\n"
+            f"Cells with a valid fit: {int(valid.sum())} of {valid.size}\n"
+        )
+        if valid.any():
+            result += (
+                f"Median r = {float(np.median(maps['r'][valid])):.4f}, "
+                f"cells with p < 0.05: {int((maps['pvalue'][valid] < 0.05).sum())}\n"
+            )
+        return result + pair.describe()
+
+
+def intercomparison_job(paths, variables):
+    """
+    Correlation, RMSE and mean bias between all pairs of files.
+
+    The result is JSON-serialisable, so it can be kept in the result cache and
+    written again to other tables (see intercomparison_report).
+
+    Returns:
+        dict: "labels" of the files, "matrices" (N×N nested lists per metric
+            of IntercomparisonAccumulator.result, NaN when undefined) and the
+            "alignment" description.
+    """
+    labels = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    with OpenVariables(paths, variables) as inputs:
+        group = AlignedGroup(inputs)
+        acc = IntercomparisonAccumulator(len(inputs))
+        for fraction, chunks in _iter_group_chunks(group):
+            acc.update(chunks)
+            yield fraction, None
+        matrices = acc.result()
+        return {
+            "labels": labels,
+            "matrices": {metric: matrix.tolist() for metric, matrix in matrices.items()},
+            "alignment": group.describe(),
+        }
+
+
+def intercomparison_report(result, out_path):
+    """
+    Write the CSV tables of an intercomparison_job result and describe it.
+
+    Args:
+        result: Dictionary returned by intercomparison_job (or read back from
+            the result cache).
+        out_path: Output path; "<base>_<metric>.csv" is written per metric.
+
+    Returns:
+        str: Result text for the Analysis tab.
+    """
+    labels = result["labels"]
+    matrices = {metric: np.asarray(matrix, dtype=np.float64) for metric, matrix in result["matrices"].items()}
+    written = write_matrix_tables(out_path, labels, matrices)
+    return (
+        f"Intercomparison of {len(labels)} files (bias = column - row):\n"
+        f"Correlation:\n{format_matrix(labels, matrices['r'])}\n"
+        f"RMSE:\n{format_matrix(labels, matrices['rmse'])}\n"
+        f"Mean bias:\n{format_matrix(labels, matrices['bias'])}\n"
+        f"Tables: {', '.join(written)}\n"
+        f"{result['alignment']}"
+    )
@@ -1,5 +1,19 @@
+import os
+
 import xarray as xr
-import geopandas as gpd
+
+from .catalog import query_paths
+from .chunking import default_planner
+from .compute import get_backend
+
+def _open_chunked(input_nc):
+    """
+    Open a NetCDF file for clipping, in chunks of whole grids planned for
+    the memory budget when dask is installed (see chunking.ChunkPlanner).
+    """
+    ds = xr.open_dataset(input_nc)
+    chunks = default_planner().xarray_chunks(ds)
+    return ds.chunk(chunks) if chunks else ds
 
 def clip_netcdf_by_bbox(input_nc, output_nc, north, south, east, west):
     """
@@ -9,7 +23,7 @@ def clip_netcdf_by_bbox(input_nc, output_nc, north, south, east, west):
         output_nc: Output NetCDF file path
         north, south, east, west: Bounding box (float)
     """
-    ds = xr.open_dataset(input_nc)
+    ds = _open_chunked(input_nc)
     # Automatically detect variable names
     lat_name = 'latitude' if 'latitude' in ds.dims else 'lat'
     lon_name = 'longitude' if 'longitude' in ds.dims else 'lon'
@@ -29,6 +43,29 @@ def clip_netcdf_by_bbox(input_nc, output_nc, north, south, east, west):
     ds.close()
     clipped.close()
 
+def clip_files_by_bbox(source, output_dir, north, south, east, west, suffix="_clipped", backend=None):
+    """
+    Clip several NetCDF files to the same bounding box, one file per task of
+    the compute backend.
+    Args:
+        source: List of NetCDF paths or a catalog.Coverage (see Catalog.query)
+        output_dir: Directory of the clipped files, named <name><suffix>.nc
+        north, south, east, west: Bounding box (float)
+        backend: compute.ComputeBackend (default: the shared one)
+    Returns:
+        list: (input path, clipped path) pairs, in input order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = []
+    for input_nc in query_paths(source):
+        stem = os.path.splitext(os.path.basename(input_nc))[0]
+        outputs.append((input_nc, os.path.join(output_dir, f"{stem}{suffix}.nc")))
+    backend = backend or get_backend()
+    tasks = [(input_nc, output_nc, north, south, east, west) for input_nc, output_nc in outputs]
+    for _ in backend.map_unordered(clip_netcdf_by_bbox, tasks):
+        pass
+    return outputs
+
 def clip_netcdf_by_shapefile(input_nc, output_nc, shapefile_path):
     """
     Clip a NetCDF file using the true polygon mask of a shapefile.
@@ -37,9 +74,12 @@ def clip_netcdf_by_shapefile(input_nc, output_nc, shapefile_path):
         output_nc: Output NetCDF file path
         shapefile_path: Path to the shapefile (polygon geometry)
     """
+    # geopandas is only needed for polygon masks (bbox clipping runs without it)
+    import geopandas as gpd
+
     print("[DEBUG] Entered clip_netcdf_by_shapefile")
     print(f"[DEBUG] shapefile_path: {shapefile_path}")
-    ds = xr.open_dataset(input_nc)
+    ds = _open_chunked(input_nc)
     # Detect coordinate variable names
     lat_name = 'latitude' if 'latitude' in ds.dims else ('lat' if 'lat' in ds.dims else None)
     lon_name = 'longitude' if 'longitude' in ds.dims else ('lon' if 'lon' in ds.dims else None)
@@ -0,0 +1,391 @@
+"""
+This module answers "is this CAMS product available?" questions.
+Availability is stored as one bitset of years x months per (variable, model,
+type, level), keyed by API ids, and loaded lazily from a versioned JSON file.
+Any axis can be queried (e.g. which models have NO2 for 2022-07, or which
+months of a download plan are missing) with a few integer operations.
+
+The index shipped with the plugin can be rebuilt from the constraints file
+that ADS publishes for the dataset, fetched online or dropped in the cache
+directory; the rebuilt index is cached with a time-to-live and diffed against
+the previous one.
+"""
+
+import datetime
+import itertools
+import json
+import os
+import time
+import urllib.request
+from functools import lru_cache
+
+from .config import (
+    AVAILABILITY_FILE, AVAILABILITY_CACHE_FILE, AVAILABILITY_CONSTRAINTS_FILE, AVAILABILITY_TTL,
+    AVAILABILITY_RETRY, ADS_CONSTRAINTS_URL
+)
+
+# Version of the availability file layout understood by this module
+AVAILABILITY_FORMAT = 1
+
+# Level of the entries that apply to every level
+ANY_LEVEL = "*"
+
+
+def month_bit(base_year, year, month):
+    """Position of a (year, month) in a bitset starting in January of base_year."""
+    return (int(year) - base_year) * 12 + int(month) - 1
+
+
+def months_mask(base_year, years, months):
+    """
+    Bitset of every combination of the given years and months.
+
+    Args:
+        base_year: First year of the bitset.
+        years: Years, e.g. ["2021", "2022"]; years before base_year are ignored.
+        months: Months, e.g. ["01", "07"].
+
+    Returns:
+        int: Bitset with one bit per (year, month).
+    """
+    mask = 0
+    for year in years:
+        if int(year) < base_year:
+            continue
+        for month in months:
+            mask |= 1 << month_bit(base_year, year, month)
+    return mask
+
+
+class AvailabilityIndex:
+    """
+    Bitsets of the available months of every CAMS product.
+
+    Args:
+        base_year: Year of bit 0 (January).
+        entries: Dictionary of (variable, model, data_type, level) -> bitset,
+            with API ids (see ui_handler maps) and ANY_LEVEL for entries valid
+            at every level.
+        version: Free-form version string of the data (e.g. its build date).
+    """
+
+    def __init__(self, base_year, entries, version=None):
+        self.base_year = base_year
+        self.entries = entries
+        self.version = version
+        # (variable, model, data_type) -> {level: bitset}
+        self._products = {}
+        for (v, m, t, lvl), mask in entries.items():
+            self._products.setdefault((v, m, t), {})[lvl] = mask
+
+    @classmethod
+    def from_file(cls, path=AVAILABILITY_FILE):
+        """
+        Load an index written by save().
+
+        Raises:
+            ValueError: If the file layout version is not supported.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != AVAILABILITY_FORMAT:
+            raise ValueError(f"Unsupported availability file format: {data.get('format')}")
+        entries = {(v, m, t, lvl): int(months, 16) for v, m, t, lvl, months in data["entries"]}
+        return cls(data["base_year"], entries, data.get("version"))
+
+    def save(self, path=AVAILABILITY_FILE):
+        """
+        Write the index as JSON, one [variable, model, type, level, months]
+        entry per line with the bitset as a hexadecimal string.
+        """
+        header = {"format": AVAILABILITY_FORMAT, "version": self.version, "base_year": self.base_year}
+        lines = [json.dumps([v, m, t, lvl, format(mask, "x")])
+                 for (v, m, t, lvl), mask in sorted(self.entries.items())]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header)[:-1] + ', "entries": [\n' + ",\n".join(lines) + "\n]}\n")
+        os.replace(tmp_path, path)
+
+    @property
+    def products(self):
+        """Known (variable, model, data_type) triples."""
+        return sorted(self._products)
+
+    def levels(self, variable, model, data_type):
+        """Levels with their own entry for a product (ANY_LEVEL excluded)."""
+        return sorted((lvl for lvl in self._products.get((variable, model, data_type), {}) if lvl != ANY_LEVEL),
+                      key=float)
+
+    def mask(self, variable, model, data_type, level=None):
+        """
+        Bitset of the available months of one product (0 if unknown).
+
+        With level None, the months available at any level.
+        """
+        levels = self._products.get((variable, model, data_type), {})
+        if level is None:
+            mask = 0
+            for value in levels.values():
+                mask |= value
+            return mask
+        return levels.get(ANY_LEVEL, 0) | levels.get(str(level), 0)
+
+    def is_available(self, variable, model, data_type, year, month, level=None):
+        if int(year) < self.base_year:
+            return False
+        return bool(self.mask(variable, model, data_type, level) >> month_bit(self.base_year, year, month) & 1)
+
+    def years(self, variable, model, data_type, level=None):
+        """Years with at least one available month, as strings."""
+        mask = self.mask(variable, model, data_type, level)
+        years = []
+        year = self.base_year
+        while mask:
+            if mask & 0xFFF:
+                years.append(str(year))
+            mask >>= 12
+            year += 1
+        return years
+
+    def months(self, variable, model, data_type, year, level=None):
+        """Available months of a year, as two-digit strings."""
+        if int(year) < self.base_year:
+            return []
+        mask = self.mask(variable, model, data_type, level) >> month_bit(self.base_year, year, 1)
+        return [f"{m:02d}" for m in range(1, 13) if mask >> (m - 1) & 1]
+
+    def missing(self, variable, model, data_type, years, months, level=None):
+        """
+        Months of a download plan that are not available.
+
+        Args:
+            years, months: The plan covers every combination of them.
+
+        Returns:
+            list: (year, month) string pairs, in time order.
+        """
+        wanted = months_mask(self.base_year, years, months)
+        missing = wanted & ~self.mask(variable, model, data_type, level)
+        pairs = [(str(y), f"{int(m):02d}") for y in years if int(y) < self.base_year for m in months]
+        return sorted(pairs + _months_of(self.base_year, missing))
+
+    def find(self, variable=None, model=None, data_type=None, level=None, year=None, month=None):
+        """
+        Products available for a given selection along any axis.
+
+        Args:
+            variable, model, data_type, level: Values to match (None matches any).
+            year: Year that must be available (any month if month is None).
+            month: Month that must be available (in any year if year is None).
+
+        Returns:
+            list: Sorted (variable, model, data_type, level) keys.
+        """
+        if year is not None and int(year) < self.base_year:
+            return []
+        if year is not None and month is not None:
+            wanted = 1 << month_bit(self.base_year, year, month)
+        elif year is not None:
+            wanted = 0xFFF << month_bit(self.base_year, year, 1)
+        elif month is not None:
+            wanted = months_mask(self.base_year, range(self.base_year, self.base_year + 100), [month])
+        else:
+            wanted = -1
+        keys = []
+        for key, mask in self.entries.items():
+            v, m, t, lvl = key
+            if ((variable is None or v == variable) and (model is None or m == model)
+                    and (data_type is None or t == data_type)
+                    and (level is None or lvl in (ANY_LEVEL, str(level)))
+                    and mask & wanted):
+                keys.append(key)
+        return sorted(keys)
+
+    def models(self, variable, data_type, year=None, month=None, level=None):
+        """Models that have a variable for a year (and month)."""
+        keys = self.find(variable=variable, data_type=data_type, level=level, year=year, month=month)
+        return sorted({model for _, model, _, _ in keys})
+
+
+def index_from_constraints(constraints, version=None):
+    """
+    Build an index from an ADS constraints file.
+
+    The constraints file is a list of entries mapping request fields to their
+    allowed values; every combination of the values of one entry is valid.
+
+    Args:
+        constraints: Parsed constraints JSON (list of dictionaries with
+            variable, model, level, type, year and month lists).
+        version: Version string of the index (default: current UTC time).
+
+    Returns:
+        AvailabilityIndex: One entry per (variable, model, type, level).
+
+    Raises:
+        ValueError: If no entry has all the fields.
+    """
+    fields = ("variable", "model", "type", "level", "year", "month")
+    usable = [entry for entry in constraints if all(entry.get(f) for f in fields)]
+    if not usable:
+        raise ValueError("The constraints file has no entry with " + ", ".join(fields) + ".")
+    base_year = min(int(year) for entry in usable for year in entry["year"])
+    entries = {}
+    for entry in usable:
+        mask = months_mask(base_year, entry["year"], entry["month"])
+        for key in itertools.product(entry["variable"], entry["model"], entry["type"],
+                                     [str(level) for level in entry["level"]]):
+            entries[key] = entries.get(key, 0) | mask
+    if version is None:
+        version = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return AvailabilityIndex(base_year, entries, version)
+
+
+def _months_of(base_year, mask):
+    pairs = []
+    bit = 0
+    while mask:
+        if mask & 1:
+            year, month = divmod(bit, 12)
+            pairs.append((str(base_year + year), f"{month + 1:02d}"))
+        mask >>= 1
+        bit += 1
+    return pairs
+
+
+def diff_availability(old, new):
+    """
+    Months that became available or unavailable between two indexes.
+
+    Products are compared level by level when either index has per-level
+    entries, otherwise over all levels.
+
+    Returns:
+        dict: "added" and "removed", lists of
+            (variable, model, data_type, level, [(year, month), ...]) with level
+            None for comparisons over all levels.
+    """
+    changes = {"added": [], "removed": []}
+    for product in sorted(set(old.products) | set(new.products)):
+        levels = sorted(set(old.levels(*product)) | set(new.levels(*product)), key=float) or [None]
+        for level in levels:
+            before = set(_months_of(old.base_year, old.mask(*product, level)))
+            after = set(_months_of(new.base_year, new.mask(*product, level)))
+            if after - before:
+                changes["added"].append((*product, level, sorted(after - before)))
+            if before - after:
+                changes["removed"].append((*product, level, sorted(before - after)))
+    return changes
+
+
+def fetch_constraints(url=ADS_CONSTRAINTS_URL, timeout=30):
+    """Download and parse the ADS constraints file of the dataset."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def read_constraints(source, timeout=30):
+    """Parse a constraints file from a local path or an http(s) URL."""
+    if source.startswith(("http://", "https://")):
+        return fetch_constraints(source, timeout)
+    with open(source, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def refresh_availability(source=None, force=False, ttl=AVAILABILITY_TTL, cache_path=AVAILABILITY_CACHE_FILE,
+                         timeout=30, retry=AVAILABILITY_RETRY):
+    """
+    Rebuild the availability index from ADS constraints if the cached one expired.
+
+    A constraints file dropped at AVAILABILITY_CONSTRAINTS_FILE that is newer
+    than the cached index is used without going online. A failed attempt is
+    recorded next to the cache, and not repeated for retry seconds.
+
+    Args:
+        source: Constraints file path or URL; defaults to the dropped-in file
+            if newer than the cache, else ADS_CONSTRAINTS_URL.
+        force: Rebuild even if the cached index is younger than ttl.
+        ttl: Time-to-live of the cached index, in seconds.
+        cache_path: Where the rebuilt index is stored.
+        timeout: Download timeout in seconds.
+        retry: Seconds before a failed attempt is tried again.
+
+    Returns:
+        dict: Changes from diff_availability, or None if the cached index
+            was still fresh (or the last attempt failed recently).
+    """
+    cache_mtime = os.path.getmtime(cache_path) if os.path.exists(cache_path) else None
+    if source is None:
+        dropped = AVAILABILITY_CONSTRAINTS_FILE
+        if os.path.exists(dropped) and (cache_mtime is None or os.path.getmtime(dropped) > cache_mtime):
+            source, force = dropped, True
+        else:
+            source = ADS_CONSTRAINTS_URL
+    if not force and cache_mtime is not None and time.time() - cache_mtime < ttl:
+        return None
+    failed_path = cache_path + ".failed"
+    if not force and os.path.exists(failed_path) and time.time() - os.path.getmtime(failed_path) < retry:
+        return None
+    try:
+        new = index_from_constraints(read_constraints(source, timeout))
+    except Exception:
+        os.makedirs(os.path.dirname(os.path.abspath(failed_path)), exist_ok=True)
+        with open(failed_path, "w", encoding="utf-8") as f:
+            f.write(str(source))
+        raise
+    if os.path.exists(failed_path):
+        os.remove(failed_path)
+    old = load_availability(cache_path) if cache_mtime is not None else load_availability(AVAILABILITY_FILE)
+    changes = diff_availability(old, new)
+    new.save(cache_path)
+    return changes
+
+
+@lru_cache(maxsize=4)
+def _load(path, mtime):
+    return AvailabilityIndex.from_file(path)
+
+
+def refresh_job(timeout=30):
+    """refresh_availability as a job for tasks.AnalysisTask (see analysis_jobs)."""
+    yield 0.0, None
+    return refresh_availability(timeout=timeout)
+
+
+def load_availability(path=None):
+    """
+    Availability index, loaded from disk on first use and kept in memory until
+    the file changes.
+
+    Args:
+        path: Index file; defaults to the index rebuilt from ADS constraints
+            (see refresh_availability) if any, else the one shipped with the plugin.
+    """
+    if path is None:
+        path = AVAILABILITY_CACHE_FILE if os.path.exists(AVAILABILITY_CACHE_FILE) else AVAILABILITY_FILE
+    return _load(path, os.path.getmtime(path))
+
+
+def plan_errors(params, index=None):
+    """
+    Problems of a download request that ADS would reject.
+
+    Args:
+        params: Download parameters (see ui_handler.collect_download_parameters).
+        index: AvailabilityIndex (default: load_availability()).
+
+    Returns:
+        list: Error messages; empty if the request can be submitted.
+    """
+    index = index or load_availability()
+    product = (params.get("variable"), params.get("model"), params.get("type"))
+    if not index.mask(*product):
+        return [f"{product[0]} from {product[1]} is not available as {product[2]}."]
+    level = str(params.get("level"))
+    if not index.mask(*product, level):
+        return [f"Level {level} is not available (available levels: {', '.join(index.levels(*product))})."]
+    missing = index.missing(*product, params.get("years", []), params.get("months", []), level)
+    if missing:
+        return ["Not available for " + ", ".join(f"{year}-{month}" for year, month in missing) + "."]
+    return []
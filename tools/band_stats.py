@@ -0,0 +1,137 @@
+"""
+This module precomputes per-band and global statistics of CAMS rasters.
+The statistics are computed once when a file is ingested (after unzipping and
+clipping) with a single chunked pass, and stored as GDAL band statistics in the
+file's PAM .aux.xml sidecar, so QGIS and GDAL find them instead of scanning the
+whole raster every time the layer is added or its style refreshed.
+"""
+
+import numpy as np
+
+from .netcdf_loader import netcdf_uri, resolve_variable
+from .nc_reader import open_variable
+from .statistics import RunningStats
+
+
+def compute_band_statistics(reader, chunk_elements=None):
+    """
+    Min, max, mean and std of every raster band and of the whole variable.
+
+    Bands follow GDAL's order: every combination of the non-spatial dimensions
+    (normally the time steps), with the last two dimensions as the grid.
+
+    Args:
+        reader: nc_reader.VariableReader of the variable.
+        chunk_elements: Approximate number of elements read per chunk (default: planned).
+
+    Returns:
+        dict: "bands", a list with one {min, max, mean, std, count} record per
+            band, and "global", the same record over all bands.
+    """
+    bands = []
+    total = RunningStats()
+    for _, chunk in reader.iter_chunks(chunk_elements):
+        if chunk.ndim < 2:
+            chunk = chunk.reshape(1, -1)
+        values = chunk.reshape(-1, chunk.shape[-2] * chunk.shape[-1])
+        valid = np.isfinite(values)
+        count = valid.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            filled = np.where(valid, values, 0.0).astype(np.float64)
+            mean = filled.sum(axis=1) / count
+            m2 = (np.where(valid, values - mean[:, None], 0.0) ** 2).sum(axis=1)
+            low = np.where(valid, values, np.inf).min(axis=1)
+            high = np.where(valid, values, -np.inf).max(axis=1)
+        for i in range(values.shape[0]):
+            band = RunningStats()
+            if count[i]:
+                band.n, band.mean, band.m2 = int(count[i]), float(mean[i]), float(m2[i])
+                band.min, band.max = float(low[i]), float(high[i])
+            total.merge(band)
+            bands.append(dict(band.result(), count=band.n))
+    return {"bands": bands, "global": dict(total.result(), count=total.n)}
+
+
+def write_band_statistics(source, stats):
+    """
+    Store statistics as GDAL band statistics (persisted in the PAM .aux.xml).
+
+    Args:
+        source: GDAL path or URI of the raster (GeoTIFF path or NETCDF:"...":var).
+        stats: Dictionary from compute_band_statistics.
+
+    Raises:
+        ValueError: If the raster cannot be opened or its band count differs.
+    """
+    from osgeo import gdal
+
+    ds = gdal.Open(source)
+    if ds is None:
+        raise ValueError(f"GDAL cannot open {source}")
+    if ds.RasterCount != len(stats["bands"]):
+        raise ValueError(f"{source} has {ds.RasterCount} bands, statistics have {len(stats['bands'])}")
+    for index, band_stats in enumerate(stats["bands"], start=1):
+        if not band_stats["count"]:
+            continue
+        band = ds.GetRasterBand(index)
+        band.SetStatistics(band_stats["min"], band_stats["max"], band_stats["mean"], band_stats["std"])
+    ds.GetRasterBand(1).SetMetadataItem("CAMS_GLOBAL_MINIMUM", repr(stats["global"]["min"]))
+    ds.GetRasterBand(1).SetMetadataItem("CAMS_GLOBAL_MAXIMUM", repr(stats["global"]["max"]))
+    ds = None  # closing flushes the .aux.xml
+
+
+def read_band_statistics(source):
+    """
+    Read statistics stored by write_band_statistics, without computing any.
+
+    Args:
+        source: GDAL path or URI of the raster.
+
+    Returns:
+        dict: Same layout as compute_band_statistics (bands without stored
+            statistics are None), or None if nothing is stored.
+    """
+    from osgeo import gdal
+
+    ds = gdal.Open(source)
+    if ds is None:
+        return None
+    first = ds.GetRasterBand(1)
+    low = first.GetMetadataItem("CAMS_GLOBAL_MINIMUM")
+    high = first.GetMetadataItem("CAMS_GLOBAL_MAXIMUM")
+    if low is None or high is None:
+        return None
+    bands = []
+    for index in range(1, ds.RasterCount + 1):
+        band = ds.GetRasterBand(index)
+        items = [band.GetMetadataItem(f"STATISTICS_{key}") for key in ("MINIMUM", "MAXIMUM", "MEAN", "STDDEV")]
+        if None in items:
+            bands.append(None)
+            continue
+        minimum, maximum, mean, std = (float(v) for v in items)
+        bands.append({"min": minimum, "max": maximum, "mean": mean, "std": std})
+    ds = None
+    return {"bands": bands, "global": {"min": float(low), "max": float(high)}}
+
+
+def ingest_statistics(path, variable=None, source=None):
+    """
+    Compute the band statistics of a NetCDF variable and store them with the raster.
+
+    Args:
+        path: Path to the NetCDF file.
+        variable: Variable name (see netcdf_loader.resolve_variable).
+        source: Raster the statistics are attached to; defaults to the NetCDF
+            variable itself. A COG converted later inherits them.
+
+    Returns:
+        dict: Statistics from compute_band_statistics.
+    """
+    gdal_variable = resolve_variable(path, variable)
+    ds, reader = open_variable(path, gdal_variable)
+    try:
+        stats = compute_band_statistics(reader)
+    finally:
+        ds.close()
+    write_band_statistics(source or netcdf_uri(path, gdal_variable), stats)
+    return stats
@@ -0,0 +1,324 @@
+"""
+This module runs download, clip, aggregation and statistics jobs without QGIS.
+A job is described by a plan (a JSON or YAML file, or the same dictionary in
+Python), so nightly ingestion can run from cron on a server:
+
+    folder: /data/cams
+    workers: 4
+    download:
+      variables: [nitrogen_dioxide, ozone]
+      models: [ensemble]
+      levels: ["0"]
+      types: [validated_reanalysis]
+      years: ["2022"]
+      months: ["01", "02", "03"]
+    clip: {north: 46.7, south: 44.6, east: 11.5, west: 8.4}
+    store: true
+    aggregate: {frequency: 1M}
+    statistics: true
+
+Downloads are packed into as few ADS requests as possible (see download_plan),
+already downloaded ZIPs are reused, and every step is reported as one JSON
+object per line so the progress can be followed by other programs. With
+store: true the months of each product are appended to its Zarr store (see
+zarr_store), which aggregation and statistics then read instead of the
+monthly files.
+Command line: python -m tools run plan.yaml (see tools/__main__.py).
+"""
+
+import datetime
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .aggregation import aggregate_files
+from .analysis_jobs import statistics_job
+from .aoi_utils import clip_netcdf_by_bbox
+from .catalog import Catalog
+from .compute import ComputeBackend
+from .config import CATALOG_DB, DEFAULT_DOWNLOAD_DIR
+from .download_plan import plan_downloads, split_download
+from .nc_header import first_data_variable
+from .nc_reader import find_data_variables, open_dataset
+from .validator import aoi_error
+from .zarr_store import STORE_EXTENSION, ingest_files, is_store, require_zarr
+
+# Keys of the download section, all lists of API values
+DOWNLOAD_FIELDS = ("variables", "models", "levels", "types", "years", "months")
+
+
+class ProgressLog:
+    """
+    Machine-readable progress: one JSON object per line, each with the UTC
+    time and an event name ("plan", "download", "clip", "aggregate",
+    "statistics", "error", "done", ...).
+    """
+
+    def __init__(self, path=None, stream=None):
+        """
+        Args:
+            path: File the events are appended to.
+            stream: Stream written to when no path is given (default: stdout).
+        """
+        self.path = path
+        self.stream = stream or sys.stdout
+        self.events = []
+        self._lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        record = {"time": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z", "event": event}
+        record.update(fields)
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self.events.append(record)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            else:
+                self.stream.write(line + "\n")
+                self.stream.flush()
+        return record
+
+
+def load_plan(path):
+    """
+    Read a plan file; YAML needs PyYAML, JSON is always supported.
+
+    Returns:
+        dict: The validated plan (see validate_plan).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("Reading a YAML plan requires PyYAML (pip install pyyaml); use JSON instead.")
+        plan = yaml.safe_load(text)
+    else:
+        plan = json.loads(text)
+    return validate_plan(plan)
+
+
+def validate_plan(plan):
+    """
+    Check a plan and fill in its defaults.
+
+    Raises:
+        ValueError: If the plan is incomplete or inconsistent.
+    """
+    if not isinstance(plan, dict):
+        raise ValueError("A plan must be a mapping.")
+    plan = dict(plan)
+    plan.setdefault("folder", DEFAULT_DOWNLOAD_DIR)
+    plan.setdefault("workers", 1)
+    download = plan.get("download")
+    if not download:
+        raise ValueError("The plan has no 'download' section.")
+    missing = [key for key in DOWNLOAD_FIELDS if not download.get(key)]
+    if missing:
+        raise ValueError(f"Missing download fields: {', '.join(missing)}")
+    plan["download"] = {key: [str(v) for v in download[key]] for key in DOWNLOAD_FIELDS}
+    if plan.get("clip"):
+        message = aoi_error(plan["clip"])
+        if message:
+            raise ValueError(message)
+    if plan.get("aggregate"):
+        plan["aggregate"] = dict(plan["aggregate"])
+        plan["aggregate"].setdefault("frequency", "1M")
+    if int(plan["workers"]) < 1:
+        raise ValueError("workers must be at least 1.")
+    if plan.get("store"):
+        require_zarr()
+    return plan
+
+
+def _product_of(cell):
+    """(variable, model, level, type) of a download cell."""
+    return tuple(cell[:4])
+
+
+def _product_name(product):
+    variable, model, level, data_type = product
+    return f"{variable}_{model}_l{level}_{data_type}"
+
+
+def download_request(request, folder):
+    """
+    Download one planned request unless its ZIP is already in the folder.
+
+    The file is written under a temporary name first, so an interrupted
+    download is not mistaken for a complete one on the next run.
+
+    Returns:
+        tuple: (ZIP path, "downloaded" or "skipped").
+    """
+    out_path = os.path.join(folder, request.filename())
+    if os.path.exists(out_path):
+        return out_path, "skipped"
+    # cdsapi is only needed when something has to be downloaded
+    from .cds_api import retrieve_request
+
+    part_path = out_path + ".part"
+    retrieve_request(request.to_api(), part_path)
+    os.replace(part_path, out_path)
+    return out_path, "downloaded"
+
+
+def _clip(input_nc, output_nc, area):
+    clip_netcdf_by_bbox(input_nc, output_nc, area["north"], area["south"], area["east"], area["west"])
+    return output_nc
+
+
+def _aggregate(paths, output_path, frequency, backend):
+    aggregate_files(paths, output_path, frequency, backend)
+    return output_path
+
+
+def _statistics(paths, backend):
+    """Exact pooled statistics of the first data variable of the files (or store)."""
+    if is_store(paths[0]):
+        with open_dataset(paths[0]) as ds:
+            variable = find_data_variables(ds)[0]
+    else:
+        variable = first_data_variable(paths[0])
+    record = None
+    # The last record yielded is the exact one
+    for _, record in statistics_job(paths, [variable] * len(paths), backend):
+        pass
+    return {"variable": variable, **record["values"]}
+
+
+def _run_parallel(executor, jobs, log, step):
+    """
+    Run (key, function, args) jobs and log each one as it finishes.
+
+    Returns:
+        dict: key -> result of the jobs that succeeded.
+    """
+    results = {}
+    futures = {executor.submit(function, *args): key for key, function, args in jobs}
+    for done, future in enumerate(as_completed(futures), 1):
+        key = futures[future]
+        try:
+            results[key] = future.result()
+            log.emit(step, key=key, result=results[key], done=done, total=len(futures))
+        except Exception as e:
+            log.emit("error", step=step, key=key, message=str(e), done=done, total=len(futures))
+    return results
+
+
+def run_plan(plan, log=None, index=None, catalog=None):
+    """
+    Download, clip, aggregate and summarise the data of a plan.
+
+    Downloads run in threads (they mostly wait for ADS); clipping, aggregation
+    and statistics run in the worker processes of a compute backend with
+    plan["workers"] workers, aggregation and statistics split into chunk
+    tasks. With plan["store"], the (clipped) months are appended to one Zarr
+    store per product before aggregation. A failing job is logged and the
+    others go on.
+
+    Args:
+        plan: Plan dictionary (see the module docstring and validate_plan).
+        log: ProgressLog (default: JSON lines on stdout).
+        index: availability.AvailabilityIndex (default: load_availability()).
+        catalog: catalog.Catalog the files are registered in (default: the
+            plan's "catalog" path or the plugin catalog).
+
+    Returns:
+        dict: "files" (product name -> final NetCDF paths or store), "statistics"
+            (product name -> values), "unavailable" cells and the number of
+            "errors".
+    """
+    plan = validate_plan(plan)
+    log = log or ProgressLog()
+    catalog = catalog or Catalog(plan.get("catalog") or CATALOG_DB)
+    folder = plan["folder"]
+    workers = int(plan["workers"])
+    os.makedirs(folder, exist_ok=True)
+
+    download = plan["download"]
+    download_plan = plan_downloads(*(download[key] for key in DOWNLOAD_FIELDS), index=index)
+    log.emit("plan", requests=len(download_plan.requests), cells=len(download_plan.cells),
+             unavailable=download_plan.unavailable, message=download_plan.describe())
+
+    # product -> list of (cell, path), in month order
+    files = {}
+    with ThreadPoolExecutor(max_workers=workers) as threads:
+        jobs = [(request.filename(), download_request, (request, folder)) for request in download_plan.requests]
+        zips = _run_parallel(threads, jobs, log, "download")
+    for request in download_plan.requests:
+        if request.filename() not in zips:
+            continue
+        zip_path, _ = zips[request.filename()]
+        found, missing, unmatched = split_download(zip_path, request, catalog)
+        if missing or unmatched:
+            log.emit("error", step="split", key=request.filename(), missing=missing, unmatched=unmatched)
+        for cell, path in found.items():
+            files.setdefault(_product_of(cell), []).append((cell, path))
+    files = {product: [path for _, path in sorted(pairs)] for product, pairs in sorted(files.items())}
+
+    with ComputeBackend(workers) as backend, ThreadPoolExecutor(max_workers=workers) as threads:
+        if plan.get("clip"):
+            clip_dir = os.path.join(folder, "clipped")
+            os.makedirs(clip_dir, exist_ok=True)
+            jobs = []
+            for paths in files.values():
+                for path in paths:
+                    stem = os.path.splitext(os.path.basename(path))[0]
+                    jobs.append((path, _clip, (path, os.path.join(clip_dir, f"{stem}_clipped.nc"), plan["clip"])))
+            clipped = _run_parallel(backend, jobs, log, "clip")
+            for source, output in clipped.items():
+                catalog.register(output, "clipped", [source])
+            files = {product: [clipped[path] for path in paths if path in clipped]
+                     for product, paths in files.items()}
+
+        ingested = {}
+        if plan.get("store"):
+            store_dir = os.path.join(folder, "stores")
+            stores = {product: os.path.join(store_dir, _product_name(product) + STORE_EXTENSION)
+                      for product in files}
+            jobs = [(_product_name(product), ingest_files, (paths, stores[product]))
+                    for product, paths in files.items() if paths]
+            # Products are appended from threads, the months of a product in time order
+            appended = _run_parallel(threads, jobs, log, "store")
+            ingested = files
+            files = {product: [stores[product]] if _product_name(product) in appended else []
+                     for product in files}
+
+        if plan.get("aggregate"):
+            frequency = plan["aggregate"]["frequency"]
+            aggregate_dir = os.path.join(folder, "aggregated")
+            os.makedirs(aggregate_dir, exist_ok=True)
+            jobs = []
+            for product, paths in files.items():
+                if paths:
+                    output = os.path.join(aggregate_dir, f"{_product_name(product)}_{frequency}.nc")
+                    jobs.append((_product_name(product), _aggregate, (paths, output, frequency, backend)))
+            # Products are driven from threads; their periods run in the backend
+            aggregated = _run_parallel(threads, jobs, log, "aggregate")
+            for product, paths in list(files.items()):
+                output = aggregated.get(_product_name(product))
+                if output:
+                    # The catalog cannot open stores: the months ingested by this run stand for them
+                    catalog.register(output, "aggregate", ingested.get(product, paths))
+                files[product] = [output] if output else []
+
+        statistics = {}
+        if plan.get("statistics"):
+            jobs = [(_product_name(product), _statistics, (paths, backend))
+                    for product, paths in files.items() if paths]
+            statistics = _run_parallel(threads, jobs, log, "statistics")
+
+    errors = sum(1 for event in log.events if event["event"] == "error")
+    result = {
+        "files": {_product_name(product): paths for product, paths in files.items()},
+        "statistics": statistics,
+        "unavailable": download_plan.unavailable,
+        "errors": errors,
+    }
+    log.emit("done", files=result["files"], errors=errors)
+    return result
@@ -0,0 +1,307 @@
+"""
+This module implements streaming bivariate statistics between two aligned variables.
+Statistics are accumulated chunk by chunk from sufficient statistics (counts,
+sums and co-moments), so arbitrarily long inputs never need to be held in
+memory: pooled correlation, regression and skill scores over all pairs, and
+per-grid-cell maps along time computed for all cells at once with vectorised numpy.
+"""
+
+import numpy as np
+
+# Bands written by write_pixel_maps, in order
+PIXEL_MAP_BANDS = ("r", "slope", "intercept", "r2", "pvalue", "n")
+
+
+def _t_test_pvalue(r, n):
+    """Two-sided p-value of Pearson's r under H0: rho = 0 (Student t with n-2 dof)."""
+    from scipy.special import stdtr
+
+    dof = n - 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt(dof / np.maximum(1.0 - r * r, 1e-300))
+        p = 2.0 * stdtr(dof, -np.abs(t))
+    return np.where(dof > 0, p, np.nan)
+
+
+class BivariateAccumulator:
+    """
+    Pooled correlation, regression and skill scores over all aligned pairs.
+
+    Each chunk is reduced to its count, means and centred co-moments, which are
+    merged with the pairwise update of Chan et al. The result is exact (up to
+    floating point) and memory use does not depend on the input size. The same
+    pass accumulates the error sums used by the skill scores, with x taken as
+    the reference and y as the evaluated variable.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.cxx = 0.0
+        self.cyy = 0.0
+        self.cxy = 0.0
+        self.sum_diff = 0.0
+        self.sum_abs_diff = 0.0
+        self.sum_sq_diff = 0.0
+        self.sum_x = 0.0
+
+    def update(self, x, y):
+        """
+        Add one chunk of paired values.
+
+        Args:
+            x: float32 array of the primary (reference) variable.
+            y: float32 array of the secondary variable, same shape as x.
+                Pairs where either value is NaN are skipped.
+        """
+        valid = np.isfinite(x) & np.isfinite(y)
+        x = x[valid].astype(np.float64)
+        y = y[valid].astype(np.float64)
+        n = x.size
+        if n == 0:
+            return
+        other = BivariateAccumulator()
+        other.n = n
+        other.mean_x = x.mean()
+        other.mean_y = y.mean()
+        dx = x - other.mean_x
+        dy = y - other.mean_y
+        other.cxx, other.cyy, other.cxy = dx @ dx, dy @ dy, dx @ dy
+        diff = y - x
+        other.sum_diff = diff.sum()
+        other.sum_abs_diff = np.abs(diff).sum()
+        other.sum_sq_diff = diff @ diff
+        other.sum_x = x.sum()
+        self.merge(other)
+
+    def merge(self, other):
+        """
+        Merge an accumulator of other pairs (e.g. computed by a worker process).
+
+        Args:
+            other: BivariateAccumulator instance.
+        """
+        if other.n == 0:
+            return
+        total = self.n + other.n
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        factor = self.n * other.n / total
+        self.cxx += other.cxx + delta_x * delta_x * factor
+        self.cyy += other.cyy + delta_y * delta_y * factor
+        self.cxy += other.cxy + delta_x * delta_y * factor
+        self.mean_x += delta_x * other.n / total
+        self.mean_y += delta_y * other.n / total
+        self.n = total
+        self.sum_diff += other.sum_diff
+        self.sum_abs_diff += other.sum_abs_diff
+        self.sum_sq_diff += other.sum_sq_diff
+        self.sum_x += other.sum_x
+
+    def correlation(self):
+        """
+        Returns:
+            dict: Pearson r and its two-sided p-value (same as scipy.stats.pearsonr).
+        """
+        if self.n < 2 or self.cxx <= 0 or self.cyy <= 0:
+            return {"r": float("nan"), "pvalue": float("nan"), "n": self.n}
+        r = max(-1.0, min(1.0, self.cxy / np.sqrt(self.cxx * self.cyy)))
+        return {"r": r, "pvalue": float(_t_test_pvalue(np.float64(r), np.float64(self.n))), "n": self.n}
+
+    def regression(self):
+        """
+        Returns:
+            dict: slope, intercept, r2, pvalue and stderr of the least-squares fit
+                of y on x (same as scipy.stats.linregress).
+        """
+        corr = self.correlation()
+        if self.n < 3 or self.cxx <= 0:
+            nan = float("nan")
+            return {"slope": nan, "intercept": nan, "r2": nan, "pvalue": nan, "stderr": nan, "n": self.n}
+        r = corr["r"]
+        slope = self.cxy / self.cxx
+        stderr = np.sqrt(max(0.0, (1.0 - r * r)) * self.cyy / self.cxx / (self.n - 2))
+        return {
+            "slope": slope,
+            "intercept": self.mean_y - slope * self.mean_x,
+            "r2": r * r,
+            "pvalue": corr["pvalue"],
+            "stderr": float(stderr),
+            "n": self.n,
+        }
+
+    def skill_scores(self):
+        """
+        Returns:
+            dict: Mean bias (y - x), RMSE, MAE, normalised mean bias, ratio of
+                standard deviations and Pearson r.
+        """
+        if self.n == 0:
+            nan = float("nan")
+            return {"bias": nan, "rmse": nan, "mae": nan, "nmb": nan, "std_ratio": nan, "r": nan, "n": 0}
+        return {
+            "bias": self.sum_diff / self.n,
+            "rmse": float(np.sqrt(self.sum_sq_diff / self.n)),
+            "mae": self.sum_abs_diff / self.n,
+            "nmb": self.sum_diff / self.sum_x if self.sum_x else float("nan"),
+            "std_ratio": float(np.sqrt(self.cyy / self.cxx)) if self.cxx > 0 else float("nan"),
+            "r": self.correlation()["r"],
+            "n": self.n,
+        }
+
+
+class PixelRegressionAccumulator:
+    """
+    Per-grid-cell correlation and linear regression along the time axis.
+
+    Each call to update() adds a (time, lat, lon) chunk of both variables; the
+    sums are kept per cell in float64 arrays of shape (lat, lon).
+    """
+
+    # Names of the per-cell sums
+    SUMS = ("n", "sx", "sy", "sxx", "syy", "sxy")
+
+    def __init__(self, shape):
+        """
+        Args:
+            shape: Spatial shape (lat, lon) of the aligned grid.
+        """
+        self.n = np.zeros(shape, dtype=np.int64)
+        self.sx = np.zeros(shape, dtype=np.float64)
+        self.sy = np.zeros(shape, dtype=np.float64)
+        self.sxx = np.zeros(shape, dtype=np.float64)
+        self.syy = np.zeros(shape, dtype=np.float64)
+        self.sxy = np.zeros(shape, dtype=np.float64)
+
+    def update(self, x, y):
+        """
+        Add one chunk of paired values.
+
+        Args:
+            x: float32 array (time, lat, lon) of the primary variable.
+            y: float32 array (time, lat, lon) of the secondary variable.
+                Pairs where either value is NaN are skipped.
+        """
+        valid = np.isfinite(x) & np.isfinite(y)
+        x = np.where(valid, x, 0).astype(np.float64)
+        y = np.where(valid, y, 0).astype(np.float64)
+        self.n += valid.sum(axis=0)
+        self.sx += x.sum(axis=0)
+        self.sy += y.sum(axis=0)
+        self.sxx += np.einsum("tij,tij->ij", x, x)
+        self.syy += np.einsum("tij,tij->ij", y, y)
+        self.sxy += np.einsum("tij,tij->ij", x, y)
+
+    def merge(self, other):
+        """
+        Merge the sums of another accumulator on the same grid.
+
+        Args:
+            other: PixelRegressionAccumulator instance.
+        """
+        for name in self.SUMS:
+            getattr(self, name).__iadd__(getattr(other, name))
+
+    def sums(self):
+        """The sums as one float64 array of shape (6, lat, lon), in SUMS order."""
+        return np.stack([getattr(self, name) for name in self.SUMS]).astype(np.float64)
+
+    def add_sums(self, sums):
+        """
+        Add sums stacked as by sums(), e.g. written by a worker into shared memory.
+
+        Args:
+            sums: float64 array of shape (6, lat, lon).
+        """
+        for name, plane in zip(self.SUMS, sums):
+            total = getattr(self, name)
+            total += plane.astype(total.dtype)
+
+    def result(self):
+        """
+        Returns:
+            dict: Arrays of shape (lat, lon) for r, slope, intercept, r2, pvalue
+                and n. Cells with fewer than 3 pairs or no variance are NaN.
+        """
+        n = self.n.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cxx = self.sxx - self.sx * self.sx / n
+            cyy = self.syy - self.sy * self.sy / n
+            cxy = self.sxy - self.sx * self.sy / n
+            r = cxy / np.sqrt(cxx * cyy)
+            r = np.clip(r, -1.0, 1.0)
+            slope = cxy / cxx
+            intercept = (self.sy - slope * self.sx) / n
+        undefined = (self.n < 3) | ~(cxx > 0) | ~(cyy > 0)
+        maps = {
+            "r": r,
+            "slope": slope,
+            "intercept": intercept,
+            "r2": r * r,
+            "pvalue": _t_test_pvalue(r, n),
+        }
+        for key in maps:
+            maps[key] = np.where(undefined, np.nan, maps[key]).astype(np.float32)
+        maps["n"] = self.n.astype(np.float32)
+        return maps
+
+
+def _north_up_layout(lat, lon):
+    """
+    Row and column order and geotransform of a lat/lon grid as a north-up raster.
+
+    Longitudes are wrapped to [-180, 180) and sorted west to east (e.g. for a
+    0..360 grid), and latitudes are sorted north to south.
+
+    Args:
+        lat: 1D latitude coordinates of the grid rows (regular spacing).
+        lon: 1D longitude coordinates of the grid columns (regular spacing).
+
+    Returns:
+        tuple: (row indices, column indices, GDAL geotransform).
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = (np.asarray(lon, dtype=np.float64) + 180.0) % 360.0 - 180.0
+    rows = np.argsort(-lat, kind="stable")
+    columns = np.argsort(lon, kind="stable")
+    dy = abs(lat[rows[1]] - lat[rows[0]]) if lat.size > 1 else 1.0
+    dx = abs(lon[columns[1]] - lon[columns[0]]) if lon.size > 1 else 1.0
+    north = lat.max() + dy / 2.0
+    west = lon.min() - dx / 2.0
+    return rows, columns, (west, dx, 0.0, north, 0.0, -dy)
+
+
+def write_pixel_maps(path, maps, lat, lon):
+    """
+    Write per-pixel maps as a multi-band GeoTIFF in EPSG:4326.
+
+    Args:
+        path: Output GeoTIFF path.
+        maps: Dictionary from PixelRegressionAccumulator.result().
+        lat: 1D latitude coordinates of the grid rows (regular spacing).
+        lon: 1D longitude coordinates of the grid columns (regular spacing).
+
+    Returns:
+        str: The output path.
+    """
+    from osgeo import gdal, osr
+
+    rows, columns, geotransform = _north_up_layout(lat, lon)
+
+    driver = gdal.GetDriverByName("GTiff")
+    out = driver.Create(path, int(columns.size), int(rows.size), len(PIXEL_MAP_BANDS), gdal.GDT_Float32,
+                        options=["COMPRESS=DEFLATE", "TILED=YES"])
+    out.SetGeoTransform(geotransform)
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(4326)
+    out.SetProjection(srs.ExportToWkt())
+    for index, name in enumerate(PIXEL_MAP_BANDS, start=1):
+        band = out.GetRasterBand(index)
+        data = maps[name][np.ix_(rows, columns)]
+        band.WriteArray(data)
+        band.SetDescription(name)
+        band.SetNoDataValue(float("nan"))
+    out.FlushCache()
+    out = None
+    return path
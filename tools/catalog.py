@@ -0,0 +1,505 @@
+"""
+This module keeps a catalog of the CAMS NetCDF files known to the plugin.
+Each downloaded or derived file is recorded once in a SQLite database with its
+variable, model, level, data type, time range, bounding box, grid signature,
+size, content hash and lineage. Directories are refreshed incrementally: only
+files whose size or modification time changed are opened again, so the
+Analysis tab can be populated from the catalog instead of rescanning files.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from .alignment import LAT_NAMES, LON_NAMES
+from .config import CATALOG_DB, CATALOG_HASH_FILES
+from .nc_header import read_header
+from .result_cache import hash_file
+from .ui_handler import MODEL_MAP, NETCDF_VARIABLE_MAP
+
+# Columns of the files table, in order
+FILE_COLUMNS = (
+    "path", "size", "mtime_ns", "hash", "kind", "variable", "netcdf_variable",
+    "model", "level", "data_type", "time_start", "time_end", "n_times",
+    "lat_min", "lat_max", "lon_min", "lon_max", "grid_signature", "lineage", "updated",
+)
+
+# ADS file names, e.g. cams.eaq.vra.ENSa.no2.l0.2022-01.nc
+ADS_FILENAME = re.compile(
+    r"cams\.eaq\.(?P<type>[a-z]+)\.(?P<model>[A-Za-z0-9-]+)\.(?P<variable>[A-Za-z0-9_]+)"
+    r"\.l(?P<level>\d+)\.")
+ADS_TYPE_CODES = {"vra": "validated_reanalysis", "ira": "interim_reanalysis"}
+
+# NetCDF variable name -> API variable name
+API_VARIABLES = {netcdf: api for api, netcdf in NETCDF_VARIABLE_MAP.items()}
+# Download API names (VARIABLE_MAP) that differ from the catalog names
+API_ALIASES = {"particulate_matter_2.5um": "pm2p5", "particulate_matter_10um": "pm10"}
+
+
+def catalog_variable(api_name):
+    """Catalog variable name of a download API variable name (see ui_handler.VARIABLE_MAP)."""
+    api_name = API_ALIASES.get(api_name, api_name)
+    short = NETCDF_VARIABLE_MAP.get(api_name, api_name)
+    return API_VARIABLES.get(short, short)
+
+
+def month_periods(years, months):
+    """
+    Periods covered by a selection of years and months, contiguous months merged.
+
+    Args:
+        years: Years, e.g. ["2021", "2022"].
+        months: Months, e.g. ["01", "02", "12"].
+
+    Returns:
+        list: (start, end) numpy datetime64[s] pairs, end excluded, in time order.
+    """
+    starts = sorted({np.datetime64(f"{int(y):04d}-{int(m):02d}", "M") for y in years for m in months})
+    periods = []
+    for start in starts:
+        if periods and periods[-1][1] == start:
+            periods[-1][1] = start + 1
+        else:
+            periods.append([start, start + 1])
+    return [(a.astype("datetime64[s]"), b.astype("datetime64[s]")) for a, b in periods]
+
+
+def model_from_code(code):
+    """Match an ADS model code (e.g. "ENSa", "LOTO") to a plugin model id."""
+    prefix = code.lower().replace("-", "")[:3]
+    for model in MODEL_MAP.values():
+        if model.replace("-", "")[:3] == prefix:
+            return model
+    return code.lower()
+
+
+def parse_filename(path):
+    """
+    Metadata encoded in an ADS file name.
+
+    Args:
+        path: NetCDF file path.
+
+    Returns:
+        dict: model, netcdf_variable, level and data_type found in the name
+            (empty if the name does not follow the ADS convention).
+    """
+    match = ADS_FILENAME.search(os.path.basename(path))
+    if not match:
+        return {}
+    return {
+        "model": model_from_code(match.group("model")),
+        "netcdf_variable": match.group("variable").lower(),
+        "level": match.group("level"),
+        "data_type": ADS_TYPE_CODES.get(match.group("type"), match.group("type")),
+    }
+
+
+def grid_signature(lat, lon):
+    """
+    Short identifier of a regular lat/lon grid (shape, origin and spacing).
+
+    Files with the same signature can be stacked or compared without regridding.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    parts = [lat.size, lon.size]
+    for coord in (lat, lon):
+        parts.append(round(float(coord[0]), 6) if coord.size else None)
+        parts.append(round(float(coord[1] - coord[0]), 6) if coord.size > 1 else None)
+    return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _to_datetime(value):
+    """numpy datetime64[s] of an ISO string, datetime or datetime64 (None stays None)."""
+    if value is None:
+        return None
+    return np.datetime64(value, "s")
+
+
+def _time_step(record):
+    """Time step of a catalogued file, from its range and number of steps (1 hour if unknown)."""
+    start, end, n = _to_datetime(record["time_start"]), _to_datetime(record["time_end"]), record["n_times"]
+    if n and n > 1 and end > start:
+        return (end - start) // (n - 1)
+    return np.timedelta64(3600, "s")
+
+
+def _covers_bbox(record, bbox, tolerance):
+    if bbox is None:
+        return True
+    if None in (record["lon_min"], record["lat_min"], record["lon_max"], record["lat_max"]):
+        return False
+    west, south, east, north = bbox
+    return (record["lon_min"] - tolerance <= west and record["lat_min"] - tolerance <= south
+            and record["lon_max"] + tolerance >= east and record["lat_max"] + tolerance >= north)
+
+
+def _area(record):
+    if None in (record["lon_min"], record["lat_min"], record["lon_max"], record["lat_max"]):
+        return float("inf")
+    return (record["lat_max"] - record["lat_min"]) * (record["lon_max"] - record["lon_min"])
+
+
+class Coverage:
+    """
+    Result of a catalog query: the files covering a period, in time order, and the gaps.
+
+    Files are used whole: the period selects which files are needed, not which
+    of their time steps.
+
+    Attributes:
+        files: Catalog records of the covering files, ordered by time start.
+        gaps: List of (start, end) ISO timestamps of the uncovered parts of the
+            period, end excluded.
+        start, end: Requested period (ISO timestamps, end excluded), or None.
+    """
+
+    def __init__(self, files, gaps, start=None, end=None):
+        self.files = files
+        self.gaps = gaps
+        self.start = start
+        self.end = end
+
+    @property
+    def paths(self):
+        return [record["path"] for record in self.files]
+
+    @property
+    def complete(self):
+        # No file covers nothing, even when the period is unbounded and has no gap
+        return bool(self.files) and not self.gaps
+
+    def __len__(self):
+        return len(self.files)
+
+    @classmethod
+    def combine(cls, coverages):
+        """Join the coverages of several periods (files are listed once)."""
+        files, gaps, seen = [], [], set()
+        for coverage in coverages:
+            gaps.extend(coverage.gaps)
+            for record in coverage.files:
+                if record["path"] not in seen:
+                    seen.add(record["path"])
+                    files.append(record)
+        starts = [c.start for c in coverages if c.start is not None]
+        ends = [c.end for c in coverages if c.end is not None]
+        return cls(files, gaps, min(starts) if starts else None, max(ends) if ends else None)
+
+    def describe(self):
+        """One-line summary of the coverage for the UI."""
+        text = f"{len(self.files)} file(s)"
+        if self.start is not None:
+            text += f" for {self.start} to {self.end}"
+        if self.gaps:
+            text += "; gaps: " + ", ".join(f"{a} to {b}" for a, b in self.gaps)
+        elif not self.files:
+            text += "; no matching file"
+        else:
+            text += "; no gaps"
+        return text
+
+
+def query_paths(source):
+    """
+    File paths of an analysis input given as a Coverage or as a list of paths.
+    """
+    if isinstance(source, Coverage):
+        return source.paths
+    return list(source)
+
+
+def _iso(value):
+    return str(np.datetime_as_string(value, unit="s"))
+
+
+def _greedy_cover(records, start, end):
+    """
+    Fewest files covering [start, end), chosen greedily by furthest reach.
+
+    Returns:
+        tuple: (chosen records, list of (start, end) datetime64 gaps).
+    """
+    spans = sorted(
+        ((_to_datetime(r["time_start"]), _to_datetime(r["time_end"]) + _time_step(r), r) for r in records),
+        key=lambda item: (item[0], -item[1].astype("int64")),
+    )
+    chosen, gaps = [], []
+    cursor = start
+    while cursor < end:
+        usable = [item for item in spans if item[0] <= cursor < item[1]]
+        if not usable:
+            following = [item[0] for item in spans if item[0] > cursor]
+            gap_end = min(min(following), end) if following else end
+            gaps.append((cursor, gap_end))
+            cursor = gap_end
+            continue
+        # Furthest reach first, then the smallest (e.g. already clipped) product
+        best = max(usable, key=lambda item: (item[1], -_area(item[2])))
+        chosen.append(best[2])
+        cursor = best[1]
+    return chosen, gaps
+
+
+def extract_metadata(path):
+    """
+    Read the catalog fields of a NetCDF file from its header and coordinates.
+
+    Args:
+        path: NetCDF file path.
+
+    Returns:
+        dict: Catalog fields (variable, model, level, data_type, time range,
+            bounding box, grid signature); unknown fields are None.
+    """
+    info = dict.fromkeys(("variable", "netcdf_variable", "model", "level", "data_type",
+                          "time_start", "time_end", "n_times", "lat_min", "lat_max",
+                          "lon_min", "lon_max", "grid_signature"))
+    header = read_header(path)
+    info["netcdf_variable"] = header.first_data_variable
+    time_range = header.time_range
+    if time_range is not None:
+        info["time_start"] = str(np.datetime_as_string(time_range[0], unit="s"))
+        info["time_end"] = str(np.datetime_as_string(time_range[1], unit="s"))
+        info["n_times"] = time_range[2]
+    lat = next((header.coords[d] for d in LAT_NAMES if d in header.coords), None)
+    lon = next((header.coords[d] for d in LON_NAMES if d in header.coords), None)
+    if lat is not None and lon is not None:
+        info.update(lat_min=float(lat.min()), lat_max=float(lat.max()),
+                    lon_min=float(lon.min()), lon_max=float(lon.max()),
+                    grid_signature=grid_signature(lat, lon))
+    level = header.coords.get("level")
+    if level is not None and level.size == 1:
+        info["level"] = f"{float(level[0]):g}"
+    for key, value in parse_filename(path).items():
+        if value and (info.get(key) is None or key != "netcdf_variable"):
+            info[key] = value
+    if info["netcdf_variable"]:
+        short = info["netcdf_variable"].lower()
+        short = short[:-len("_conc")] if short.endswith("_conc") else short
+        info["variable"] = API_VARIABLES.get(short, short)
+    return info
+
+
+class Catalog:
+    """
+    SQLite catalog of NetCDF files, refreshed incrementally.
+    """
+
+    def __init__(self, db_path=CATALOG_DB, hash_files=CATALOG_HASH_FILES):
+        """
+        Args:
+            db_path: Location of the SQLite database file (created if missing).
+            hash_files: Store the SHA-256 content hash of each file (computed
+                only when the file is new or changed).
+        """
+        self.db_path = db_path
+        self.hash_files = hash_files
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " hash TEXT,"
+                " kind TEXT,"
+                " variable TEXT,"
+                " netcdf_variable TEXT,"
+                " model TEXT,"
+                " level TEXT,"
+                " data_type TEXT,"
+                " time_start TEXT,"
+                " time_end TEXT,"
+                " n_times INTEGER,"
+                " lat_min REAL, lat_max REAL, lon_min REAL, lon_max REAL,"
+                " grid_signature TEXT,"
+                " lineage TEXT,"
+                " updated REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_files_variable ON files(variable, model, level, data_type)")
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def register(self, path, kind="download", lineage=None):
+        """
+        Add or update one file, opening it only if it changed since it was recorded.
+
+        Derived files inherit the model, level, data type and variable of their
+        parents when their own header does not provide them.
+
+        Args:
+            path: NetCDF file path.
+            kind: "download", "clipped", "aggregate", ... (kept if already recorded
+                and not given explicitly).
+            lineage: Paths of the files this one was derived from.
+
+        Returns:
+            dict: The catalog record of the file.
+        """
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+            if (row is not None and row["size"] == st.st_size and row["mtime_ns"] == st.st_mtime_ns
+                    and lineage is None):
+                return dict(row)
+            record = extract_metadata(path)
+            parents = [os.path.abspath(p) for p in lineage] if lineage is not None else (
+                json.loads(row["lineage"]) if row is not None and row["lineage"] else [])
+            if parents:
+                placeholders = ",".join("?" * len(parents))
+                for parent in conn.execute(f"SELECT * FROM files WHERE path IN ({placeholders})", parents):
+                    for key in ("variable", "netcdf_variable", "model", "level", "data_type"):
+                        if record.get(key) is None:
+                            record[key] = parent[key]
+            if row is not None and lineage is None and kind == "download":
+                kind = row["kind"]
+            record.update(
+                path=path,
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
+                hash=hash_file(path) if self.hash_files else None,
+                kind=kind,
+                lineage=json.dumps(parents),
+                updated=time.time(),
+            )
+            conn.execute(
+                f"INSERT OR REPLACE INTO files ({', '.join(FILE_COLUMNS)})"
+                f" VALUES ({', '.join('?' * len(FILE_COLUMNS))})",
+                [record[c] for c in FILE_COLUMNS],
+            )
+            return record
+
+    def refresh_directory(self, directory):
+        """
+        Bring the catalog up to date with the NetCDF files of a directory.
+
+        New or modified files are (re)read, unchanged ones are only stat'ed,
+        and recorded files that disappeared from the directory are removed.
+
+        Args:
+            directory: Directory to scan (not recursive).
+
+        Returns:
+            list: Paths of the files that were (re)read.
+        """
+        directory = os.path.abspath(directory)
+        if not os.path.isdir(directory):
+            return []
+        present = {os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".nc")}
+        with self._connect() as conn:
+            known = {row["path"]: (row["size"], row["mtime_ns"]) for row in conn.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE path LIKE ?", (os.path.join(directory, "%"),))
+                if os.path.dirname(row["path"]) == directory}
+            removed = [p for p in known if p not in present]
+            conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+        changed = []
+        for path in sorted(present):
+            try:
+                st = os.stat(path)
+                if known.get(path) == (st.st_size, st.st_mtime_ns):
+                    continue
+                self.register(path)
+                changed.append(path)
+            except Exception as e:
+                print(f"[WARNING] Catalog could not read {path}: {e}")
+        return changed
+
+    def remove(self, path):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM files WHERE path = ?", (os.path.abspath(path),))
+
+    def files(self, **filters):
+        """
+        List recorded files that still exist.
+
+        Args:
+            **filters: Column values to match exactly, e.g. variable="ozone",
+                kind="download". None values are ignored.
+
+        Returns:
+            list: Catalog records (dicts) ordered by time start, then path.
+        """
+        filters = {k: v for k, v in filters.items() if v is not None}
+        unknown = set(filters) - set(FILE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown catalog columns: {sorted(unknown)}")
+        where = " AND ".join(f"{k} = ?" for k in filters) or "1"
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM files WHERE {where} ORDER BY time_start, path", list(filters.values())
+            ).fetchall()
+        return [dict(row) for row in rows if os.path.exists(row["path"])]
+
+    def query(self, variable=None, model=None, level=None, data_type=None, start=None, end=None,
+              bbox=None, kinds=("download", "clipped"), tolerance=0.05):
+        """
+        Find the files covering a variable over a period and an area.
+
+        Candidates are grouped by grid so that the selected files can be stacked;
+        within a grid the fewest files covering the period are chosen, preferring
+        the smallest product (e.g. a file already clipped to the AOI) among those
+        reaching equally far. The grid leaving the shortest gaps wins, then the
+        one needing fewest files, then the one covering the smallest area.
+
+        Args:
+            variable, model, level, data_type: Values to match (None matches any).
+            start: Start of the period (ISO string, datetime or datetime64); None
+                for the start of the earliest file.
+            end: End of the period, excluded; None for the end of the latest file.
+            bbox: (west, south, east, north) in degrees that the files must cover,
+                or None.
+            kinds: Kinds of files to consider; aggregates are left out by default
+                because their time step differs from the downloads.
+            tolerance: Margin in degrees on the bounding box test (coordinates
+                are cell centres).
+
+        Returns:
+            Coverage: Covering files in time order and the gaps of the period.
+        """
+        records = [r for r in self.files(variable=variable, model=model, level=level, data_type=data_type)
+                   if r["time_start"] and r["time_end"] and (kinds is None or r["kind"] in kinds)
+                   and _covers_bbox(r, bbox, tolerance)]
+        if not records:
+            # Nothing matches: the whole period (if bounded) is a gap
+            gaps = [(_iso(_to_datetime(start)), _iso(_to_datetime(end)))] if start is not None and end is not None else []
+            return Coverage([], gaps, *(gaps[0] if gaps else (None, None)))
+        start = _to_datetime(start) if start is not None else min(_to_datetime(r["time_start"]) for r in records)
+        end = _to_datetime(end) if end is not None else max(
+            _to_datetime(r["time_end"]) + _time_step(r) for r in records)
+
+        grids = {}
+        for record in records:
+            grids.setdefault(record["grid_signature"], []).append(record)
+        best = None
+        for group in grids.values():
+            chosen, gaps = _greedy_cover(group, start, end)
+            missing = sum(((b - a) for a, b in gaps), np.timedelta64(0, "s"))
+            key = (missing, len(chosen), sum(_area(r) for r in chosen))
+            if best is None or key < best[0]:
+                best = (key, chosen, gaps)
+        _, chosen, gaps = best
+        return Coverage(chosen, [(_iso(a), _iso(b)) for a, b in gaps], _iso(start), _iso(end))
+
+    def get(self, path):
+        """Catalog record of one file, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM files WHERE path = ?", (os.path.abspath(path),)).fetchone()
+        return dict(row) if row is not None else None
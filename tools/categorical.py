@@ -0,0 +1,140 @@
+"""
+This module evaluates two variables categorically, after binning both into
+concentration classes (by default the European Air Quality Index bands).
+The confusion matrix is built chunk by chunk with a single bincount over the
+combined class indices, and the skill scores are derived from it directly.
+"""
+
+import numpy as np
+
+from .config import AQI_CLASS_EDGES, AQI_CLASS_NAMES
+
+
+def class_edges_for(variable):
+    """
+    Default class edges for a NetCDF variable.
+
+    Args:
+        variable: NetCDF variable name, e.g. "no2" or "no2_conc".
+
+    Returns:
+        list: Upper class edges, or None if no default is configured.
+    """
+    name = variable.lower()
+    if name not in AQI_CLASS_EDGES and name.endswith("_conc"):
+        name = name[:-len("_conc")]
+    return AQI_CLASS_EDGES.get(name)
+
+
+def class_labels(edges):
+    """
+    Names of the classes defined by a list of edges.
+
+    The AQI band names are used when the number of classes matches, otherwise
+    each class is named after its interval.
+    """
+    if len(edges) + 1 == len(AQI_CLASS_NAMES):
+        return list(AQI_CLASS_NAMES)
+    bounds = ["-inf"] + [f"{e:g}" for e in edges] + ["inf"]
+    return [f"[{lo}, {hi})" for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+class ConfusionAccumulator:
+    """
+    Confusion matrix between a reference (x) and an evaluated (y) variable.
+
+    Rows are the classes of the reference, columns those of the evaluated
+    variable. A value v falls in class k when edges[k-1] <= v < edges[k].
+    """
+
+    def __init__(self, edges):
+        """
+        Args:
+            edges: Increasing upper class edges; len(edges) + 1 classes.
+        """
+        self.edges = np.asarray(edges, dtype=np.float64)
+        if self.edges.ndim != 1 or self.edges.size == 0 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError("Class edges must be a non-empty, strictly increasing list.")
+        self.n_classes = self.edges.size + 1
+        self.matrix = np.zeros((self.n_classes, self.n_classes), dtype=np.int64)
+
+    def update(self, x, y):
+        """
+        Add one chunk of paired values.
+
+        Args:
+            x: Array of the reference variable.
+            y: Array of the evaluated variable, same shape as x.
+                Pairs where either value is NaN are skipped.
+        """
+        x = np.asarray(x).ravel()
+        y = np.asarray(y).ravel()
+        valid = np.isfinite(x) & np.isfinite(y)
+        if not valid.all():
+            x = x[valid]
+            y = y[valid]
+        combined = np.searchsorted(self.edges, x, side="right") * self.n_classes
+        combined += np.searchsorted(self.edges, y, side="right")
+        self.matrix += np.bincount(combined, minlength=self.n_classes ** 2).reshape(self.matrix.shape)
+
+    def merge(self, other):
+        """
+        Merge the confusion matrix of another accumulator with the same edges.
+
+        Args:
+            other: ConfusionAccumulator instance.
+        """
+        self.matrix += other.matrix
+
+    def result(self):
+        """
+        Returns:
+            dict: accuracy, kappa (Cohen), n, the confusion matrix, and per-class
+                pod (probability of detection, hits / reference count) and far
+                (false alarm ratio, false alarms / evaluated count). Undefined
+                scores are NaN.
+        """
+        matrix = self.matrix.astype(np.float64)
+        total = matrix.sum()
+        hits = np.diag(matrix)
+        observed = matrix.sum(axis=1)
+        forecast = matrix.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            accuracy = hits.sum() / total
+            expected = (observed * forecast).sum() / (total * total)
+            kappa = (accuracy - expected) / (1.0 - expected)
+            pod = hits / observed
+            far = (forecast - hits) / forecast
+        return {
+            "accuracy": float(accuracy),
+            "kappa": float(kappa),
+            "pod": pod,
+            "far": far,
+            "n": int(total),
+            "matrix": self.matrix.copy(),
+        }
+
+
+def format_categorical(scores, labels):
+    """
+    Format categorical scores for the results panel.
+
+    Args:
+        scores: Dictionary from ConfusionAccumulator.result().
+        labels: Class names.
+
+    Returns:
+        str: Human-readable text.
+    """
+    lines = [
+        f"Accuracy: {scores['accuracy']:.4f}",
+        f"Cohen's kappa: {scores['kappa']:.4f}",
+        f"Pairs: {scores['n']}",
+        "Class: POD / FAR (reference count)",
+    ]
+    observed = scores["matrix"].sum(axis=1)
+    for label, pod, far, count in zip(labels, scores["pod"], scores["far"], observed):
+        lines.append(f"  {label}: {pod:.3f} / {far:.3f} ({count})")
+    lines.append("Confusion matrix (rows reference, columns evaluated):")
+    lines.extend("  " + " ".join(f"{v:>10d}" for v in row) for row in scores["matrix"])
+    return "\n".join(lines)
@@ -101,4 +101,22 @@ def request_cams_data(params: Dict[str, Union[str, List[str]]],
         raise Exception(f"CDS API request failed: {str(e)}")
 
 
+def retrieve_request(payload: Dict[str, Union[str, List[str]]], out_path: str) -> str:
+    """
+    Submit a list-valued request (e.g. download_plan.DownloadRequest.to_api()).
+
+    Args:
+        payload: ADS request with variable, model, level, type, year, month lists.
+        out_path: Path of the ZIP to write.
 
+    Returns:
+        str: Path to the downloaded file
+    """
+    folder = os.path.dirname(out_path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+    c = cdsapi.Client()
+    c.retrieve("cams-europe-air-quality-reanalyses", payload, out_path)
+    if not os.path.exists(out_path):
+        raise IOError(f"Download completed but file not found at: {out_path}")
+    return out_path
@@ -0,0 +1,209 @@
+"""
+This module plans how NetCDF variables are read in chunks.
+Every chunked read of the plugin (statistics, zonal statistics, alignment,
+aggregation, clipping and the kernels of the compute backend) asks a
+ChunkPlanner for its chunk size instead of using a fixed number, so the
+same code fits the memory of a laptop and uses the memory of a server. The
+plan depends on the memory budget (config or a share of the available RAM),
+the number of workers reading at once, the dtype of the data and the access
+pattern of the operation: map-wise operations (statistics, means, clipping)
+read whole grids for a range of time steps, time-series-wise operations
+read the whole time axis for a block of grid rows.
+"""
+
+import math
+import os
+
+import numpy as np
+
+from .config import COMPUTE_MEMORY_BUDGET, COMPUTE_MEMORY_FRACTION, COMPUTE_WORKERS
+
+# Bytes held per element on top of the raw value: the decoded float32 copy,
+# the missing-value mask and float64 temporaries of the reductions
+WORKING_BYTES = 12
+# Budget used when the available memory cannot be read
+FALLBACK_BUDGET = 1024 ** 3
+# Smallest budget a plan is made for
+MIN_BUDGET = 256 * 1024 ** 2
+# Smallest chunk worth a read (and a task), and the number of tasks per
+# worker aimed at so that the workers stay busy until the end
+MIN_CHUNK_ELEMENTS = 100_000
+TASKS_PER_WORKER = 4
+
+MAP = "map"
+SERIES = "series"
+
+
+def available_memory():
+    """
+    Memory available to new allocations, in bytes, or None if unknown.
+    Uses psutil when installed, else the operating system directly.
+    """
+    try:
+        import psutil
+        return int(psutil.virtual_memory().available)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if os.name == "nt":
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return int(status.ullAvailPhys)
+        return None
+    try:
+        # macOS and other Unix systems: half of the physical memory
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // 2
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def memory_budget():
+    """
+    Bytes the chunks read at once may take, all workers together:
+    config.COMPUTE_MEMORY_BUDGET if set, else COMPUTE_MEMORY_FRACTION of the
+    memory available now.
+    """
+    if COMPUTE_MEMORY_BUDGET:
+        return int(COMPUTE_MEMORY_BUDGET)
+    available = available_memory()
+    if not available:
+        return FALLBACK_BUDGET
+    return max(MIN_BUDGET, int(available * COMPUTE_MEMORY_FRACTION))
+
+
+def bytes_per_element(dtype):
+    """Memory held per element of a chunk of the given raw dtype."""
+    return np.dtype(dtype).itemsize + WORKING_BYTES
+
+
+class ChunkPlanner:
+    """
+    Chunk sizes and shapes for a number of concurrent readers sharing a
+    memory budget.
+    """
+
+    def __init__(self, workers=1, budget=None):
+        """
+        Args:
+            workers: Number of chunks read at the same time (worker processes,
+                or 1 for a read in the calling thread).
+            budget: Memory budget in bytes (default: memory_budget()).
+        """
+        self.workers = max(1, int(workers))
+        self.budget = int(budget) if budget else memory_budget()
+
+    def elements(self, dtype=np.float32, inputs=1):
+        """
+        Largest number of elements per chunk and input.
+
+        Args:
+            dtype: Raw dtype of the variable read.
+            inputs: Number of variables read together (e.g. 2 for a pair).
+        """
+        per_chunk = self.budget // (self.workers * max(1, inputs) * bytes_per_element(dtype))
+        return max(MIN_CHUNK_ELEMENTS, int(per_chunk))
+
+    def ranges(self, length, per_step, dtype=np.float32, inputs=1, tasks=None):
+        """
+        Split the first dimension (normally time) of a map-wise read.
+
+        Chunks fit the budget and, when large enough, are made small enough
+        for every worker to get several of them.
+
+        Args:
+            length: Length of the dimension.
+            per_step: Number of elements per step along it.
+            dtype: Raw dtype of the variable read.
+            inputs: Number of variables read together.
+            tasks: Number of chunks aimed at (default: TASKS_PER_WORKER per
+                worker); pass 1 for reads that are not split across workers.
+
+        Returns:
+            list: (start, stop) ranges covering range(length).
+        """
+        per_step = max(1, per_step)
+        tasks = self.workers * TASKS_PER_WORKER if tasks is None else tasks
+        balanced = max(math.ceil(length / max(1, tasks)), MIN_CHUNK_ELEMENTS // per_step)
+        step = max(1, min(self.elements(dtype, inputs) // per_step, balanced))
+        return [(start, min(start + step, length)) for start in range(0, length, step)]
+
+    def shape(self, shape, time_axis=0, dtype=np.float32, access=MAP, inputs=1):
+        """
+        Chunk shape of an array for one access pattern.
+
+        Args:
+            shape: Shape of the array.
+            time_axis: Axis of time (None if the array has none).
+            dtype: Raw dtype of the array.
+            access: MAP (whole grids, split along time) or SERIES (whole time
+                axis, split along the other axes, first axis first).
+            inputs: Number of arrays read together.
+
+        Returns:
+            tuple: Chunk length along every axis.
+        """
+        shape = tuple(int(n) for n in shape)
+        if not shape:
+            return shape
+        elements = self.elements(dtype, inputs)
+        if access == MAP or time_axis is None:
+            order = [time_axis] if time_axis is not None else []
+            order += [axis for axis in range(len(shape)) if axis != time_axis]
+        elif access == SERIES:
+            order = [axis for axis in range(len(shape)) if axis != time_axis] + [time_axis]
+        else:
+            raise ValueError(f"Unknown access pattern: {access}")
+        # Split the axes in order until the chunk fits, keeping the later ones whole
+        chunks = list(shape)
+        for axis in order:
+            if int(np.prod(chunks)) <= elements:
+                break
+            rest = int(np.prod(chunks)) // max(1, chunks[axis])
+            chunks[axis] = max(1, min(shape[axis], elements // max(1, rest)))
+        return tuple(chunks)
+
+    def xarray_chunks(self, ds, access=MAP, time_dim="time"):
+        """
+        chunks argument of xarray.open_dataset for a dataset read with this plan.
+
+        Args:
+            ds: xarray.Dataset whose variables will be read.
+            access: MAP or SERIES.
+            time_dim: Name of the time dimension.
+
+        Returns:
+            dict: Dimension name -> chunk length, from the largest variable;
+                None when dask is not installed (xarray then reads lazily
+                without chunks).
+        """
+        try:
+            import dask  # noqa: F401
+        except ImportError:
+            return None
+        variables = [ds[name] for name in ds.data_vars if ds[name].ndim]
+        if not variables:
+            return {}
+        largest = max(variables, key=lambda var: var.size)
+        time_axis = largest.dims.index(time_dim) if time_dim in largest.dims else None
+        return dict(zip(largest.dims, self.shape(largest.shape, time_axis, largest.dtype, access)))
+
+
+def default_planner():
+    """Planner for reads in the calling thread while the workers may be reading too."""
+    return ChunkPlanner(max(1, COMPUTE_WORKERS))
@@ -0,0 +1,418 @@
+"""
+This module is the compute backend shared by the analyses of the plugin.
+A pool of worker processes is started on first use and kept warm: every
+worker imports numpy, xarray, netCDF4 and scipy once, when it starts, and
+keeps the files it reads open between tasks (see kernels). Clipping, zonal
+statistics, aggregation and bivariate analyses split their work into chunk
+tasks and submit them here, so they use several cores without holding the
+GIL of the QGIS process. The number of workers and the memory budget come
+from config and the chunk tasks are sized by a chunking.ChunkPlanner; the
+plugin shuts the pool down in unload().
+
+Arrays are never pickled between QGIS and the workers: kernels read their
+inputs from the files themselves, and large inputs or outputs (zone cell
+indices, aggregated periods, per-pixel sums) are placed in shared memory
+(see SharedArray), so only the segment name crosses the process boundary
+and workers write their results in place.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .chunking import ChunkPlanner
+from .config import COMPUTE_WORKERS, COMPUTE_MEMORY_BUDGET, COMPUTE_PYTHON
+
+# Seconds a finished map waits for the workers to close the files its tasks
+# opened; workers still busy with other tasks close them at a later release
+RELEASE_TIMEOUT = 2.0
+
+
+def _warm_up():
+    """Initializer of the workers: pay the heavy imports before the first task."""
+    import numpy  # noqa: F401
+    import xarray  # noqa: F401
+    import netCDF4  # noqa: F401
+    try:
+        import scipy.special  # noqa: F401
+    except ImportError:
+        pass
+    from . import kernels  # noqa: F401
+
+
+def python_executable():
+    """
+    Interpreter the workers are started with.
+
+    Inside QGIS sys.executable is the QGIS binary itself, so the Python
+    interpreter QGIS embeds is looked up in sys.exec_prefix instead, unless
+    config.COMPUTE_PYTHON names one.
+    """
+    if COMPUTE_PYTHON:
+        return COMPUTE_PYTHON
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    candidates = (
+        os.path.join(sys.exec_prefix, "python.exe"),
+        os.path.join(sys.exec_prefix, "bin", f"python{version}"),
+        os.path.join(sys.exec_prefix, "bin", "python3"),
+    )
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return sys.executable
+
+
+class SharedArray:
+    """
+    numpy array in a shared memory segment, handed to the workers by name.
+
+    The process that creates it owns the segment, uses it through .array and
+    frees it in release(). A copy unpickled in a worker only carries the
+    name: indexing assignments (out[slot] = values) write into the shared
+    memory in place and indexing reads return a copy, each attaching to the
+    segment for the duration of the operation.
+
+    Created unshared (a plain numpy array) when the kernels run inline.
+    """
+
+    def __init__(self, shape, dtype, shared=True):
+        self.shape = tuple(int(n) for n in shape)
+        self.dtype = np.dtype(dtype)
+        self.name = None
+        self._shm = None
+        if shared:
+            size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self.name = self._shm.name
+            # New segments are zero-filled
+            self.array = np.ndarray(self.shape, self.dtype, buffer=self._shm.buf)
+        else:
+            self.array = np.zeros(self.shape, self.dtype)
+
+    def __getstate__(self):
+        if self.name is None:
+            raise TypeError("An unshared array cannot be sent to a worker.")
+        return {"name": self.name, "shape": self.shape, "dtype": self.dtype.str}
+
+    def __setstate__(self, state):
+        self.shape = state["shape"]
+        self.dtype = np.dtype(state["dtype"])
+        self.name = state["name"]
+        self._shm = None
+        self.array = None
+
+    def _attached(self, operation):
+        if self.array is not None:
+            return operation(self.array)
+        shm = _attach(self.name)
+        try:
+            return operation(np.ndarray(self.shape, self.dtype, buffer=shm.buf))
+        finally:
+            shm.close()
+
+    def __getitem__(self, key):
+        return self._attached(lambda array: np.array(array[key]))
+
+    def __setitem__(self, key, value):
+        def write(array):
+            array[key] = value
+        self._attached(write)
+
+    def release(self):
+        """Free the segment (owner only); views of .array must not be used afterwards."""
+        self.array = None
+        shm, self._shm = self._shm, None
+        if shm is None:
+            return
+        try:
+            shm.close()
+        except BufferError:
+            # A view is still referenced; the mapping goes away with it
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _attach(name):
+    """Attach to an existing segment without taking over its cleanup."""
+    try:
+        # Python 3.13+
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Older versions register the segment again, with the resource tracker
+        # the workers share with QGIS, which unlinks it only if QGIS dies
+        return shared_memory.SharedMemory(name=name)
+
+
+class ComputeBackend:
+    """
+    Pool of warm worker processes running chunk kernels.
+
+    The processes are started on the first task. With workers=0 (or if the
+    pool cannot be started) the kernels run in the calling thread, which
+    gives the same results one chunk at a time.
+    """
+
+    def __init__(self, workers=COMPUTE_WORKERS, memory_budget=COMPUTE_MEMORY_BUDGET):
+        """
+        Args:
+            workers: Number of worker processes; 0 runs the kernels inline.
+            memory_budget: Bytes the chunks held by all workers together may
+                take; None for a share of the available memory (see chunking).
+        """
+        self.workers = max(0, int(workers))
+        self.memory_budget = memory_budget
+        self._executor = None
+        self._segments = set()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
+
+    @property
+    def planner(self):
+        """chunking.ChunkPlanner of the chunk tasks, for the memory available now."""
+        return ChunkPlanner(self.workers, self.memory_budget)
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                # Spawned rather than forked: forking the QGIS process is unsafe
+                context = multiprocessing.get_context("spawn")
+                context.set_executable(python_executable())
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_warm_up)
+            return self._executor
+
+    def submit(self, function, *args):
+        """
+        Run function(*args) in a worker.
+
+        Returns:
+            concurrent.futures.Future: Already done when running inline.
+        """
+        pool = self._pool()
+        if pool is not None:
+            return pool.submit(function, *args)
+        future = Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    @contextmanager
+    def shared_array(self, shape, dtype):
+        """
+        SharedArray for the duration of a with block.
+
+        The segment is freed when the block exits, also when the analysis is
+        cancelled or a worker crashes; segments still alive when the backend
+        shuts down are freed then.
+        """
+        array = SharedArray(shape, dtype, shared=self._pool() is not None)
+        with self._lock:
+            self._segments.add(array)
+        try:
+            yield array
+        finally:
+            with self._lock:
+                self._segments.discard(array)
+            array.release()
+
+    def map_slots(self, function, tasks, slots):
+        """
+        Run function(*args, slot) for every args tuple of tasks, with at most
+        slots tasks running at once.
+
+        slot is the number of a free slot, e.g. the row of a shared output
+        array the task writes into. A slot is only given to another task
+        once the caller has asked for the next result, so the caller reads
+        the slot of each result before moving on.
+
+        Yields:
+            tuple: (index of the task, slot, result), as the tasks finish.
+        """
+        tasks = list(tasks)
+        pool = self._pool()
+        if pool is None:
+            try:
+                for index, args in enumerate(tasks):
+                    yield index, 0, function(*args, 0)
+            finally:
+                self.release_files()
+            return
+        free = list(range(max(1, slots)))
+        pending = {}
+        done = set()
+        submitted = 0
+        try:
+            while submitted < len(tasks) or pending:
+                while free and submitted < len(tasks):
+                    slot = free.pop()
+                    pending[pool.submit(function, *tasks[submitted], slot)] = (submitted, slot)
+                    submitted += 1
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, slot = pending.pop(future)
+                    result = future.result()
+                    done.add(index)
+                    yield index, slot, result
+                    free.append(slot)
+        except BrokenProcessPool as e:
+            print(f"[WARNING] Compute workers stopped ({e}); running the remaining chunks in QGIS.")
+            self._stop_pool(wait=False)
+            self.workers = 0
+            for index, args in enumerate(tasks):
+                if index not in done:
+                    yield index, 0, function(*args, 0)
+        finally:
+            for future in pending:
+                future.cancel()
+            self.release_files()
+
+    def map_unordered(self, function, tasks):
+        """
+        Run function(*args) for every args tuple of tasks.
+
+        Closing the generator (e.g. when the analysis is cancelled) cancels
+        the tasks that have not started. If the worker processes die, the
+        remaining tasks run in the calling thread.
+
+        Yields:
+            tuple: (index of the task, result), as the tasks finish.
+        """
+        tasks = list(tasks)
+        pool = self._pool()
+        if pool is None:
+            try:
+                for index, args in enumerate(tasks):
+                    yield index, function(*args)
+            finally:
+                self.release_files()
+            return
+        futures = {pool.submit(function, *args): index for index, args in enumerate(tasks)}
+        done = set()
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                result = future.result()
+                done.add(index)
+                yield index, result
+        except BrokenProcessPool as e:
+            print(f"[WARNING] Compute workers stopped ({e}); running the remaining chunks in QGIS.")
+            self._stop_pool(wait=False)
+            self.workers = 0
+            for index, args in enumerate(tasks):
+                if index not in done:
+                    yield index, function(*args)
+        finally:
+            for future in futures:
+                future.cancel()
+            self.release_files()
+
+    def release_files(self):
+        """
+        Close the files kept open by the kernels (see kernels._cached): in
+        the calling thread, and in every idle worker. Called when a map
+        ends, so that the files of a finished analysis can be rewritten.
+        """
+        from .kernels import close_thread_files, release_files
+        close_thread_files()
+        with self._lock:
+            pool = self._executor
+        if pool is None:
+            return
+        released = set()
+        deadline = time.monotonic() + RELEASE_TIMEOUT
+        try:
+            while len(released) < self.workers and time.monotonic() < deadline:
+                futures = [pool.submit(release_files) for _ in range(self.workers - len(released))]
+                done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+                released.update(future.result() for future in done)
+                for future in not_done:
+                    future.cancel()
+        except (BrokenProcessPool, RuntimeError):
+            # The pool is gone, and the files with it
+            pass
+
+    def _stop_pool(self, wait):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def shutdown(self, wait=True):
+        """Stop the workers and free the shared memory; tasks not started yet are cancelled."""
+        self._stop_pool(wait)
+        with self._lock:
+            segments, self._segments = self._segments, set()
+        for array in segments:
+            array.release()
+        # Inline kernels keep their files open in this process
+        from .kernels import close_files
+        close_files()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The backend shared by the plugin, created on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = ComputeBackend()
+        return _backend
+
+
+def configure_backend(workers=None, memory_budget=None):
+    """
+    Replace the shared backend, e.g. after the user changed the worker count.
+
+    Args:
+        workers: Number of worker processes (default: unchanged).
+        memory_budget: Memory budget in bytes (default: unchanged).
+
+    Returns:
+        ComputeBackend: The new shared backend.
+    """
+    global _backend
+    with _backend_lock:
+        old, _backend = _backend, None
+    if old is not None:
+        old.shutdown(wait=False)
+        workers = old.workers if workers is None else workers
+        memory_budget = old.memory_budget if memory_budget is None else memory_budget
+    backend = ComputeBackend(
+        COMPUTE_WORKERS if workers is None else workers,
+        COMPUTE_MEMORY_BUDGET if memory_budget is None else memory_budget,
+    )
+    with _backend_lock:
+        _backend = backend
+    return backend
+
+
+def shutdown_backend(wait=True):
+    """Stop the workers of the shared backend (called from the plugin's unload())."""
+    global _backend
+    with _backend_lock:
+        backend, _backend = _backend, None
+    if backend is not None:
+        backend.shutdown(wait=wait)
@@ -13,9 +13,96 @@ PLUGIN_AUTHOR = "POLIMI"
 # Default paths
 DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.expanduser("~"), "CAMS_Data")
 
+# Plugin cache location (analysis results, indexes)
+CACHE_DIR = os.path.join(DEFAULT_DOWNLOAD_DIR, ".cache")
+RESULT_CACHE_DB = os.path.join(CACHE_DIR, "results.sqlite")
+CATALOG_DB = os.path.join(CACHE_DIR, "catalog.sqlite")
+# Store a SHA-256 content hash of every catalogued file (computed once per
+# version). Off by default: hashing multi-GB files on registration would block
+# the QGIS interface after every download.
+CATALOG_HASH_FILES = False
+
+# Availability of CAMS products (bitsets of years x months, see tools/availability.py)
+AVAILABILITY_FILE = os.path.join(os.path.dirname(__file__), "data", "availability.json")
+# Index rebuilt from the ADS constraints file, and how long it is trusted (seconds)
+AVAILABILITY_CACHE_FILE = os.path.join(CACHE_DIR, "availability.json")
+AVAILABILITY_TTL = 7 * 24 * 3600
+# Seconds before a failed refresh (e.g. offline) is tried again
+AVAILABILITY_RETRY = 24 * 3600
+# A constraints file saved here is used instead of downloading it
+AVAILABILITY_CONSTRAINTS_FILE = os.path.join(CACHE_DIR, "constraints.json")
+
+# Missing-value handling
+# Sentinel values treated as missing in addition to the variable's own
+# missing_value/_FillValue attributes, keyed by NetCDF variable name.
+# "default" applies to every variable without its own entry.
+FILL_SENTINELS = {
+    "default": [-999.0],
+}
+
+# Map display
+# Convert NetCDF variables to a cached Cloud-Optimized GeoTIFF (next to the
+# source file) before adding them to QGIS.
+LOAD_AS_COG = True
+COG_OPTIONS = ["COMPRESS=DEFLATE", "PREDICTOR=YES", "BLOCKSIZE=256", "OVERVIEWS=AUTO"]
+COG_RESAMPLING = "AVERAGE"
+# Overview factors used when GDAL has no band-interleaved COG driver
+COG_OVERVIEW_LEVELS = [2, 4, 8, 16]
+
+# Layer styling at load
+# Colours of the European AQI classes (AQI_CLASS_EDGES below), used as a
+# discrete colour ramp for pollutants that have AQI bands.
+AQI_CLASS_COLORS = ["#50f0e6", "#50ccaa", "#f0e641", "#ff5050", "#960032", "#7d2181"]
+# QGIS style colour ramp (stretched over the file's value range) for the
+# other variables, keyed by NetCDF variable name.
+POLLUTANT_COLOR_RAMPS = {
+    "default": "Viridis",
+    "co": "Inferno",
+    "nh3": "Magma",
+    "pm10_dust": "YlOrBr",
+    "pm10_ss": "Blues",
+    "pm10_fire": "Reds",
+}
+
+# Compute backend (see tools/compute.py)
+# Number of warm worker processes shared by the analyses; 0 runs every
+# kernel in the calling thread.
+COMPUTE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+# Memory the chunks read at once may take, all workers together (bytes);
+# None uses COMPUTE_MEMORY_FRACTION of the memory available (see tools/chunking.py)
+COMPUTE_MEMORY_BUDGET = None
+COMPUTE_MEMORY_FRACTION = 0.5
+# Python interpreter of the workers; None finds the one QGIS embeds
+COMPUTE_PYTHON = None
+
+# Zarr stores (see tools/zarr_store.py)
+# Time steps per chunk of a store (one day of hourly data) and largest
+# number of values per chunk; the grid is split into row blocks to fit.
+ZARR_TIME_CHUNK = 24
+ZARR_CHUNK_ELEMENTS = 2_000_000
+
+# Categorical evaluation
+# Upper class edges (µg/m³) of the European Air Quality Index bands, keyed by
+# NetCDF variable name. Values above the last edge fall in the last class.
+AQI_CLASS_NAMES = ["Good", "Fair", "Moderate", "Poor", "Very poor", "Extremely poor"]
+AQI_CLASS_EDGES = {
+    "pm2p5": [10.0, 20.0, 25.0, 50.0, 75.0],
+    "pm10": [20.0, 40.0, 50.0, 100.0, 150.0],
+    "no2": [40.0, 90.0, 120.0, 230.0, 340.0],
+    "o3": [50.0, 100.0, 130.0, 240.0, 380.0],
+    "so2": [100.0, 200.0, 350.0, 500.0, 750.0],
+}
+
 # CAMS API Configuration
 CAMS_API_URL = "https://ads.atmosphere.copernicus.eu/api/v2"
 CAMS_DATASET = "cams-europe-air-quality-reanalyses"
+# Maximum number of cells (variable x model x level x type x year x month) per
+# ADS request; the download planner splits larger requests
+ADS_REQUEST_COST_LIMIT = 120
+ADS_CONSTRAINTS_URL = (
+    "https://ads.atmosphere.copernicus.eu/api/catalogue/v1/collections/"
+    f"{CAMS_DATASET}/constraints.json"
+)
 
 # Model parameter constants
 VARIABLES = [
@@ -0,0 +1,245 @@
+"""
+This module plans CAMS downloads with as few ADS requests as possible.
+A desired set of cells (variable x model x level x type x month) is checked
+against the availability index, and the available cells are packed into
+list-valued requests: each request is a full cartesian product of its field
+lists, as ADS expects, and stays under the per-request cost limit. Once a
+request is downloaded, its ZIP is split back into one catalog entry per cell.
+"""
+
+import hashlib
+import itertools
+import os
+import zipfile
+
+from .availability import load_availability
+from .catalog import catalog_variable, model_from_code
+from .config import ADS_REQUEST_COST_LIMIT
+
+# Request fields, in the order of a cell tuple
+CELL_FIELDS = ("variable", "model", "level", "type", "year", "month")
+
+
+class DownloadRequest:
+    """
+    One ADS request: every combination of its field lists is requested.
+
+    Attributes:
+        variables, models, levels, types, years, months: Sorted lists of API values.
+    """
+
+    def __init__(self, variables, models, levels, types, years, months):
+        self.variables = sorted(variables)
+        self.models = sorted(models)
+        self.levels = sorted(levels, key=float)
+        self.types = sorted(types)
+        self.years = sorted(years)
+        self.months = sorted(months)
+
+    @property
+    def axes(self):
+        return [self.variables, self.models, self.levels, self.types, self.years, self.months]
+
+    @property
+    def cost(self):
+        """Number of cells, i.e. the product of the list lengths."""
+        cost = 1
+        for axis in self.axes:
+            cost *= len(axis)
+        return cost
+
+    @property
+    def cells(self):
+        """All (variable, model, level, type, year, month) cells of the request."""
+        return [(v, m, lvl, t, y, mo) for v in self.variables for m in self.models for lvl in self.levels
+                for t in self.types for y in self.years for mo in self.months]
+
+    def to_api(self):
+        """Request payload for cdsapi (see cds_api.retrieve_request)."""
+        payload = dict(zip(CELL_FIELDS, self.axes))
+        payload["format"] = "zip"
+        return payload
+
+    def filename(self):
+        """Output ZIP name, stable for the same request."""
+        parts = ["+".join(axis) for axis in self.axes]
+        name = "_".join(parts).replace(" ", "_")
+        if len(name) > 120:
+            digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+            name = f"{self.variables[0]}_{self.models[0]}_{self.years[0]}{self.months[0]}_{digest}"
+        return f"{name}.zip"
+
+    def __repr__(self):
+        return f"DownloadRequest({', '.join(f'{f}={a}' for f, a in zip(CELL_FIELDS, self.axes))})"
+
+
+class DownloadPlan:
+    """
+    Requests covering the available part of a desired set of cells.
+
+    Attributes:
+        requests: List of DownloadRequest.
+        unavailable: Desired cells that the availability index does not list.
+    """
+
+    def __init__(self, requests, unavailable):
+        self.requests = requests
+        self.unavailable = unavailable
+
+    @property
+    def cells(self):
+        return [cell for request in self.requests for cell in request.cells]
+
+    @property
+    def cost(self):
+        return sum(request.cost for request in self.requests)
+
+    def describe(self):
+        text = f"{len(self.requests)} request(s) for {len(self.cells)} cell(s)"
+        if self.unavailable:
+            text += f"; {len(self.unavailable)} cell(s) not available"
+        return text
+
+
+def _factor(pairs):
+    """
+    Group (a, b) pairs into rectangles A x B, merging the b's that share the same set of a's.
+
+    Returns:
+        list: (set of a, set of b) rectangles covering exactly the pairs.
+    """
+    by_b = {}
+    for a, b in pairs:
+        by_b.setdefault(b, set()).add(a)
+    by_a_set = {}
+    for b, a_set in by_b.items():
+        by_a_set.setdefault(frozenset(a_set), set()).add(b)
+    return [(set(a_set), b_set) for a_set, b_set in by_a_set.items()]
+
+
+def _split(request, cost_limit):
+    """Split a request along its longest axes until every part is under the cost limit."""
+    if request.cost <= cost_limit:
+        return [request]
+    axes = request.axes
+    index = max(range(len(axes)), key=lambda i: len(axes[i]))
+    axis = axes[index]
+    if len(axis) == 1:
+        return [request]
+    per_value = request.cost // len(axis)
+    size = max(1, cost_limit // per_value)
+    parts = []
+    for start in range(0, len(axis), size):
+        new_axes = list(axes)
+        new_axes[index] = axis[start:start + size]
+        parts.extend(_split(DownloadRequest(*new_axes), cost_limit))
+    return parts
+
+
+def plan_downloads(variables, models, levels, types, years, months, index=None,
+                   cost_limit=ADS_REQUEST_COST_LIMIT):
+    """
+    Pack the available cells of a desired set into the fewest ADS requests.
+
+    Products (variable, model, level, type) with the same available months are
+    grouped; their months are factored into years x months rectangles, and the
+    products into variables x models x levels boxes. Boxes over the cost limit
+    are split along their longest axis. The packing is greedy: it is exact
+    (no unavailable cell is requested, no cell twice) but not guaranteed to be
+    the global minimum.
+
+    Args:
+        variables, models, levels, types: API values (see ui_handler maps).
+        years, months: Year and month strings; every combination is desired.
+        index: availability.AvailabilityIndex (default: load_availability()).
+        cost_limit: Maximum number of cells per request.
+
+    Returns:
+        DownloadPlan: Requests and the unavailable cells.
+    """
+    index = index or load_availability()
+    years = [str(y) for y in years]
+    months = [f"{int(m):02d}" for m in months]
+    unavailable = []
+    # months available per product -> products
+    by_months = {}
+    levels = [str(level) for level in levels]
+    for variable, model, level, data_type in itertools.product(variables, models, levels, types):
+        missing = set(index.missing(variable, model, data_type, years, months, level))
+        available = frozenset((y, m) for y in years for m in months if (y, m) not in missing)
+        unavailable.extend((variable, model, level, data_type, y, m) for y, m in sorted(missing))
+        if available:
+            by_months.setdefault(available, []).append((variable, model, level, data_type))
+
+    requests = []
+    for available, products in by_months.items():
+        # Months as years x months rectangles, products as variables x models x levels boxes per type
+        periods = _factor(available)
+        for data_type in sorted({t for _, _, _, t in products}):
+            triples = [(v, m, lvl) for v, m, lvl, t in products if t == data_type]
+            for levels_set, vm_pairs in _factor(((lvl, (v, m)) for v, m, lvl in triples)):
+                for variables_set, models_set in _factor(vm_pairs):
+                    for years_set, months_set in periods:
+                        box = DownloadRequest(variables_set, models_set, levels_set, [data_type],
+                                              years_set, months_set)
+                        requests.extend(_split(box, cost_limit))
+    requests.sort(key=lambda r: (r.types, r.variables, r.models, r.levels, r.years, r.months))
+    return DownloadPlan(requests, unavailable)
+
+
+def match_cell(record, cells):
+    """
+    Cell of a request that a catalogued NetCDF file holds.
+
+    Args:
+        record: Catalog record of the file (see catalog.Catalog.register).
+        cells: Cells of the request.
+
+    Returns:
+        tuple: The matching cell, or None.
+    """
+    if not record.get("time_start"):
+        return None
+    year, month = record["time_start"][:4], record["time_start"][5:7]
+    for cell in cells:
+        variable, model, level, data_type, cell_year, cell_month = cell
+        if ((cell_year, cell_month) == (year, month)
+                and catalog_variable(variable) == record.get("variable")
+                and model_from_code(model) == record.get("model")
+                and (record.get("level") is None or float(record["level"]) == float(level))
+                and (record.get("data_type") is None or record["data_type"] == data_type)):
+            return cell
+    return None
+
+
+def split_download(zip_path, request, catalog, extract_to=None):
+    """
+    Extract a multi-member ADS ZIP and record every member as its own catalog entry.
+
+    Args:
+        zip_path: Downloaded ZIP of a DownloadRequest.
+        request: The DownloadRequest it answers.
+        catalog: catalog.Catalog to register the members in.
+        extract_to: Directory of the NetCDF files (default: next to the ZIP).
+
+    Returns:
+        tuple: (dict of cell -> NetCDF path, list of requested cells without a
+            member, list of members that match no cell).
+    """
+    extract_to = extract_to or os.path.dirname(zip_path)
+    cells = request.cells
+    found = {}
+    unmatched = []
+    with zipfile.ZipFile(zip_path, "r") as archive:
+        members = [name for name in archive.namelist() if name.endswith(".nc")]
+        archive.extractall(extract_to, members)
+    for name in members:
+        path = os.path.join(extract_to, name)
+        record = catalog.register(path, "download")
+        cell = match_cell(record, [c for c in cells if c not in found])
+        if cell is None:
+            unmatched.append(path)
+        else:
+            found[cell] = path
+    missing = [cell for cell in cells if cell not in found]
+    return found, missing, unmatched
@@ -4,7 +4,6 @@ It provides functions to submit requests to the CDS API and manage the download
 """
 
 from .cds_api import request_cams_data
-from PyQt5.QtWidgets import QMessageBox
 
 def submit_cams_request(params):
     """
@@ -25,6 +24,7 @@ def submit_cams_request(params):
         return output_file
     except Exception as e:
         print(f"Download failed: {str(e)}")
+        from PyQt5.QtWidgets import QMessageBox
         QMessageBox.critical(
             None,
             "Download Failed",
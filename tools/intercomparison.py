@@ -0,0 +1,141 @@
+"""
+This module computes N×N intercomparison matrices between CAMS variables
+(several models for one pollutant, or several pollutants for one model).
+Every aligned chunk of all inputs is read once, and the pairwise sums for all
+N² combinations are accumulated with a few matrix products, so the cost of the
+matrix is close to that of reading the inputs rather than N(N-1)/2 runs.
+"""
+
+import csv
+import os
+
+import numpy as np
+
+# Metrics of the intercomparison matrix, in output order
+MATRIX_METRICS = ("r", "rmse", "bias", "n")
+
+
+class IntercomparisonAccumulator:
+    """
+    Pairwise correlation, RMSE and mean bias between N aligned variables.
+
+    For each pair (i, j) only the elements where both inputs are valid are
+    used. Values are shifted by a per-input reference taken from the first
+    chunk to keep the float64 sums well conditioned.
+    """
+
+    def __init__(self, n_inputs):
+        """
+        Args:
+            n_inputs: Number of compared variables.
+        """
+        shape = (n_inputs, n_inputs)
+        self.n_inputs = n_inputs
+        self.shift = None
+        self.count = np.zeros(shape, dtype=np.float64)
+        # sums[i, j]: Σ u_i over pairs valid in i and j (u = value - shift)
+        self.sums = np.zeros(shape, dtype=np.float64)
+        # squares[i, j]: Σ u_i² over pairs valid in i and j
+        self.squares = np.zeros(shape, dtype=np.float64)
+        # products[i, j]: Σ u_i u_j
+        self.products = np.zeros(shape, dtype=np.float64)
+
+    def update(self, chunks):
+        """
+        Add one aligned chunk of every input.
+
+        Args:
+            chunks: Sequence of N float32 arrays of identical shape; NaN is missing.
+        """
+        values = np.stack([np.asarray(c, dtype=np.float64).ravel() for c in chunks])
+        valid = np.isfinite(values)
+        if self.shift is None:
+            if not valid.any():
+                return
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(np.where(valid, values, np.nan), axis=1))
+        u = np.where(valid, values - self.shift[:, None], 0.0)
+        mask = valid.astype(np.float64)
+        self.count += mask @ mask.T
+        self.sums += u @ mask.T
+        self.squares += (u * u) @ mask.T
+        self.products += u @ u.T
+
+    def result(self):
+        """
+        Returns:
+            dict: N×N float arrays "r" (Pearson correlation), "rmse" (root mean
+                square difference), "bias" (mean of column minus row input)
+                and "n" (number of valid pairs). Undefined entries are NaN.
+        """
+        n = self.count
+        shift = self.shift if self.shift is not None else np.zeros(self.n_inputs)
+        offset = shift[None, :] - shift[:, None]  # shift_j - shift_i
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sum_i = self.sums
+            sum_j = self.sums.T
+            # Σ (x_j - x_i) and Σ (x_j - x_i)² rebuilt from the shifted sums
+            diff = sum_j - sum_i
+            diff_sq = self.squares.T + self.squares - 2.0 * self.products
+            bias = diff / n + offset
+            mse = (diff_sq + 2.0 * offset * diff) / n + offset * offset
+            rmse = np.sqrt(np.maximum(mse, 0.0))
+            cov = self.products - sum_i * sum_j / n
+            var_i = self.squares - sum_i * sum_i / n
+            var_j = self.squares.T - sum_j * sum_j / n
+            r = np.clip(cov / np.sqrt(var_i * var_j), -1.0, 1.0)
+        r = np.where((n >= 2) & (var_i > 0) & (var_j > 0), r, np.nan)
+        empty = n == 0
+        return {
+            "r": r,
+            "rmse": np.where(empty, np.nan, rmse),
+            "bias": np.where(empty, np.nan, bias),
+            "n": n.copy(),
+        }
+
+
+def write_matrix_tables(base_path, labels, matrices):
+    """
+    Write each metric as a labelled square CSV table ready for heatmap plotting.
+
+    Args:
+        base_path: Output path; "<base>_<metric>.csv" is written per metric.
+        labels: Names of the N inputs (row and column headers).
+        matrices: Dictionary from IntercomparisonAccumulator.result().
+
+    Returns:
+        list: Paths of the written files.
+    """
+    base = os.path.splitext(base_path)[0]
+    paths = []
+    for metric in MATRIX_METRICS:
+        path = f"{base}_{metric}.csv"
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([""] + list(labels))
+            for label, row in zip(labels, matrices[metric]):
+                writer.writerow([label] + ["" if np.isnan(v) else f"{v:.6g}" for v in row])
+        paths.append(path)
+    return paths
+
+
+def format_matrix(labels, matrix, precision=3):
+    """
+    Format one N×N matrix as aligned text for the results panel.
+
+    Args:
+        labels: Names of the N inputs.
+        matrix: N×N array.
+        precision: Decimal places.
+
+    Returns:
+        str: Table with one row per input, rows and columns numbered.
+    """
+    width = max(8, precision + 6)
+    header = " " * 4 + "".join(f"{j + 1:>{width}}" for j in range(len(labels)))
+    lines = [header]
+    for i, row in enumerate(matrix):
+        cells = "".join(f"{'-':>{width}}" if np.isnan(v) else f"{v:>{width}.{precision}f}" for v in row)
+        lines.append(f"{i + 1:>3} {cells}")
+    lines.extend(f"{i + 1:>3} = {label}" for i, label in enumerate(labels))
+    return "\n".join(lines)
@@ -0,0 +1,254 @@
+"""
+This module holds the chunk kernels run by the workers of the compute backend
+(see compute.py). Kernels are top-level functions that take file paths and
+index ranges rather than open datasets, so their arguments pickle cheaply;
+they return small mergeable accumulators or write larger results in place
+into shared memory (see compute.SharedArray). Each process keeps the files
+and alignments it has built in a small cache, so the next chunks of the same
+files are read without opening them again; the backend closes them when the
+tasks of an analysis are done (see release_files), because HDF5 refuses to
+rewrite a file another process still has open.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from .alignment import AlignedGroup
+from .bivariate import BivariateAccumulator, PixelRegressionAccumulator
+from .categorical import ConfusionAccumulator
+from .nc_reader import open_dataset, VariableReader
+from .statistics import RunningStats, update_zones
+
+# Opened files and alignments kept per process (and per calling thread when
+# the kernels run inline), until the job that opened them ends
+CACHE_SIZE = 16
+# Seconds a worker waits after closing its files, so that the other idle
+# workers take the other release tasks (see compute.ComputeBackend.release_files)
+RELEASE_PAUSE = 0.05
+
+_caches = []
+_local = threading.local()
+_cache_lock = threading.Lock()
+
+
+def _file_key(path):
+    """Cache key of a file; a rewritten file (or an appended Zarr store) gets a new key."""
+    stamp = path
+    if os.path.isdir(path):
+        # Zarr stores rewrite their consolidated metadata on every append
+        stamp = next((os.path.join(path, name) for name in (".zmetadata", "zarr.json")
+                      if os.path.exists(os.path.join(path, name))), path)
+    return os.path.abspath(path), os.stat(stamp).st_mtime_ns
+
+
+def _close(datasets):
+    for ds in datasets:
+        ds.close()
+
+
+def _thread_cache():
+    """Cache of the calling thread; concurrent inline jobs never close each other's files."""
+    cache = getattr(_local, "cache", None)
+    if cache is None:
+        cache = _local.cache = OrderedDict()
+        with _cache_lock:
+            _caches.append(cache)
+    return cache
+
+
+def _cached(key, files, build):
+    """
+    Object cached under key, built by build() -> (object, datasets to close).
+
+    files are the _file_key of the files it reads. The least recently used
+    entries are closed beyond CACHE_SIZE, and so are the entries of an older
+    version of a file when it is opened again.
+    """
+    cache = _thread_cache()
+    with _cache_lock:
+        entry = cache.pop(key, None)
+        if entry is None:
+            obj, datasets = build()
+            entry = obj, datasets, dict(files)
+            current = entry[2]
+            for old in [old for old, (_, _, stamps) in cache.items()
+                        if any(current.get(path, mtime) != mtime for path, mtime in stamps.items())]:
+                _close(cache.pop(old)[1])
+        cache[key] = entry
+        while len(cache) > CACHE_SIZE:
+            _, (_, datasets, _) = cache.popitem(last=False)
+            _close(datasets)
+        return entry[0]
+
+
+def close_thread_files():
+    """Close the cached files of the calling thread (inline kernels of a finished job)."""
+    cache = getattr(_local, "cache", None)
+    with _cache_lock:
+        while cache:
+            _, (_, datasets, _) = cache.popitem()
+            _close(datasets)
+
+
+def close_files():
+    """Close every cached file of this process."""
+    with _cache_lock:
+        for cache in _caches:
+            while cache:
+                _, (_, datasets, _) = cache.popitem()
+                _close(datasets)
+
+
+def release_files():
+    """
+    Task sent to the workers when a job ends: close the cached files, so
+    they can be rewritten (HDF5 locks the files a process has open).
+
+    Returns:
+        int: Process id of the worker.
+    """
+    close_files()
+    time.sleep(RELEASE_PAUSE)
+    return os.getpid()
+
+
+def variable_reader(path, variable):
+    """Cached nc_reader.VariableReader of a variable."""
+    def build():
+        ds = open_dataset(path)
+        try:
+            return VariableReader(ds[variable]), [ds]
+        except Exception:
+            ds.close()
+            raise
+    key = _file_key(path)
+    return _cached(("variable", key, variable), [key], build)
+
+
+def aligned_group(paths, variables):
+    """Cached alignment.AlignedGroup of one variable per file."""
+    def build():
+        datasets = [open_dataset(path) for path in paths]
+        try:
+            inputs = [(VariableReader(ds[variable]), ds) for ds, variable in zip(datasets, variables)]
+            return AlignedGroup(inputs), datasets
+        except Exception:
+            _close(datasets)
+            raise
+    keys = [_file_key(path) for path in paths]
+    return _cached(("aligned",) + tuple(zip(keys, variables)), keys, build)
+
+
+def _read_steps(reader, start, stop):
+    if reader.ndim == 0:
+        return reader.read()
+    return reader.read(**{reader.dims[0]: slice(start, stop)})
+
+
+def statistics_chunk(path, variable, start, stop):
+    """
+    Statistics of steps start:stop (along the first dimension) of a variable.
+
+    Returns:
+        tuple: (statistics.RunningStats, number of elements read).
+    """
+    chunk = _read_steps(variable_reader(path, variable), start, stop)
+    acc = RunningStats()
+    acc.update(chunk)
+    return acc, chunk.size
+
+
+def zonal_chunk(path, variable, start, stop, cells, zones):
+    """
+    Statistics per zone of steps start:stop of a variable.
+
+    Args:
+        cells: compute.SharedArray of the flat cell indices of all zones,
+            one zone after the other.
+        zones: (zone id, first, last) positions of each zone in cells.
+
+    Returns:
+        tuple: (zone id -> statistics.RunningStats, number of elements read).
+    """
+    chunk = _read_steps(variable_reader(path, variable), start, stop)
+    accs = {zone: RunningStats() for zone, _, _ in zones}
+    index = cells[:]
+    update_zones(accs, chunk, {zone: index[first:last] for zone, first, last in zones})
+    return accs, chunk.size
+
+
+def _read_pair(paths, variables, start, stop):
+    group = aligned_group(paths, variables)
+    positions = np.arange(start, stop)
+    return group, tuple(side.read(positions) for side in group.sides)
+
+
+def pair_chunk(paths, variables, start, stop, kind, edges=None):
+    """
+    Accumulator of aligned time steps start:stop of two variables.
+
+    Args:
+        paths: Primary and secondary file.
+        variables: Their variable names.
+        kind: "pooled" (bivariate.BivariateAccumulator) or "categorical"
+            (categorical.ConfusionAccumulator).
+        edges: Class edges of the categorical scores.
+    """
+    _, (x, y) = _read_pair(paths, variables, start, stop)
+    if kind == "pooled":
+        acc = BivariateAccumulator()
+    elif kind == "categorical":
+        acc = ConfusionAccumulator(edges)
+    else:
+        raise ValueError(f"Unknown accumulator: {kind}")
+    acc.update(x, y)
+    return acc
+
+
+def pixel_chunk(paths, variables, start, stop, out, slot):
+    """
+    Per-pixel regression sums of aligned time steps start:stop of two variables.
+
+    Args:
+        out: compute.SharedArray of shape (slots, 6, lat, lon); the sums
+            (see bivariate.PixelRegressionAccumulator.sums) are written to
+            out[slot].
+    """
+    group, (x, y) = _read_pair(paths, variables, start, stop)
+    acc = PixelRegressionAccumulator(group.shape[1:])
+    acc.update(x, y)
+    out[slot] = acc.sums()
+
+
+def period_mean(segments, names, index, out, steps_per_read):
+    """
+    Temporal mean of the time steps of one output period.
+
+    Args:
+        segments: (path, positions) of the time steps of the period in each
+            file that has some.
+        names: Variables with a time dimension.
+        index: Position of the period in the output.
+        out: Dictionary of variable name -> compute.SharedArray of shape
+            (periods, ...) with time first; the mean is written to out[name][index].
+        steps_per_read: Number of time steps read at once (see chunking).
+    """
+    for name in names:
+        total = count = None
+        for path, positions in segments:
+            reader = variable_reader(path, name)
+            axis = reader.dims.index("time")
+            for start in range(0, len(positions), steps_per_read):
+                chunk = reader.read(time=positions[start:start + steps_per_read])
+                chunk = np.moveaxis(chunk, axis, 0)
+                valid = np.isfinite(chunk)
+                if total is None:
+                    total = np.zeros(chunk.shape[1:])
+                    count = np.zeros(chunk.shape[1:], np.int64)
+                total += np.where(valid, chunk, 0).sum(axis=0, dtype=np.float64)
+                count += valid.sum(axis=0)
+        out[name][index] = np.where(count > 0, total / np.maximum(count, 1), np.nan)
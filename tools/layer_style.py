@@ -0,0 +1,65 @@
+"""
+This module styles CAMS raster layers when they are added to QGIS.
+Pollutants with European AQI bands get a discrete ramp with the AQI class
+colours; other variables get a pollutant-specific continuous ramp stretched
+over the precomputed value range, so no raster scan is needed.
+"""
+
+from qgis.PyQt.QtGui import QColor
+from qgis.core import (
+    QgsColorRampShader, QgsRasterShader, QgsSingleBandPseudoColorRenderer, QgsStyle
+)
+
+from .categorical import class_edges_for, class_labels
+from .config import AQI_CLASS_COLORS, POLLUTANT_COLOR_RAMPS
+
+
+def _short_name(variable):
+    name = (variable or "").lower()
+    return name[:-len("_conc")] if name.endswith("_conc") else name
+
+
+def apply_pollutant_style(layer, variable, stats, band=1):
+    """
+    Set a pseudo-colour renderer for a pollutant on a raster layer.
+
+    Args:
+        layer: QgsRasterLayer.
+        variable: NetCDF variable name, e.g. "no2_conc".
+        stats: Statistics from band_stats (only the global min/max are used).
+        band: Band to render.
+
+    Returns:
+        bool: True if a style was applied.
+    """
+    low = stats["global"]["min"]
+    high = stats["global"]["max"]
+    if low is None or high is None or not low < high:
+        return False
+
+    edges = class_edges_for(variable or "")
+    if edges:
+        shader_function = QgsColorRampShader(low, high)
+        shader_function.setColorRampType(QgsColorRampShader.Discrete)
+        labels = class_labels(edges)
+        bounds = list(edges) + [float("inf")]
+        items = [QgsColorRampShader.ColorRampItem(bound, QColor(color), label)
+                 for bound, color, label in zip(bounds, AQI_CLASS_COLORS, labels)]
+        shader_function.setColorRampItemList(items)
+    else:
+        name = _short_name(variable)
+        ramp_name = POLLUTANT_COLOR_RAMPS.get(name, POLLUTANT_COLOR_RAMPS["default"])
+        ramp = QgsStyle.defaultStyle().colorRamp(ramp_name)
+        if ramp is None:
+            return False
+        shader_function = QgsColorRampShader(low, high, ramp)
+        shader_function.setColorRampType(QgsColorRampShader.Interpolated)
+        shader_function.classifyColorRamp(5, band)
+
+    shader = QgsRasterShader(low, high)
+    shader.setRasterShaderFunction(shader_function)
+    renderer = QgsSingleBandPseudoColorRenderer(layer.dataProvider(), band, shader)
+    renderer.setClassificationMin(low)
+    renderer.setClassificationMax(high)
+    layer.setRenderer(renderer)
+    return True
@@ -0,0 +1,145 @@
+"""
+This module reads NetCDF metadata without decoding any data.
+Only the header (dimensions, variables, attributes) and the 1D coordinate
+variables are read, and results are memoized by (path, mtime, size), so
+listing variables or extents of hundreds of files for the UI and the catalog
+costs a file open per changed file and nothing for unchanged ones.
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from .alignment import LAT_NAMES, LON_NAMES, TIME_NAMES
+from .nc_reader import NON_DATA_VARIABLES, fill_values_from_attrs
+
+
+class NetCDFHeader:
+    """
+    Metadata of one NetCDF file.
+
+    Attributes:
+        path: Absolute file path.
+        dims: Dictionary of dimension name -> size.
+        variables: Dictionary of variable name -> {"dims", "shape", "dtype", "attrs"}.
+        attrs: Global attributes.
+        extents: Dictionary of coordinate name -> (min, max, size) for the
+            latitude, longitude and time coordinates (times as numpy datetime64).
+        coords: Dictionary of coordinate name -> values of the 1D non-time
+            coordinates (latitude, longitude, level, ...).
+    """
+
+    def __init__(self, path, dims, variables, attrs, extents, coords):
+        self.path = path
+        self.dims = dims
+        self.variables = variables
+        self.attrs = attrs
+        self.extents = extents
+        self.coords = coords
+
+    @property
+    def data_variables(self):
+        """
+        Names of the scientific variables (same rule as nc_reader.find_data_variables).
+        """
+        return [name for name, var in self.variables.items()
+                if var["dims"] and name not in self.dims and name.lower() not in NON_DATA_VARIABLES]
+
+    @property
+    def first_data_variable(self):
+        names = self.data_variables
+        return names[0] if names else None
+
+    def fill_values(self, name, sentinels=None):
+        """Raw missing-data values of a variable (see nc_reader.fill_values_for)."""
+        return fill_values_from_attrs(name, self.variables[name]["attrs"], sentinels)
+
+    def extent(self, candidates):
+        """(min, max, size) of the first coordinate found among candidate names, or None."""
+        for name in candidates:
+            if name in self.extents:
+                return self.extents[name]
+        return None
+
+    @property
+    def time_range(self):
+        return self.extent(TIME_NAMES)
+
+    @property
+    def lat_range(self):
+        return self.extent(LAT_NAMES)
+
+    @property
+    def lon_range(self):
+        return self.extent(LON_NAMES)
+
+
+def _decode_times(var):
+    """Decode the first and last values of a CF time coordinate."""
+    import netCDF4
+
+    values = np.asarray(var[:])
+    if values.size == 0 or not hasattr(var, "units"):
+        return None
+    calendar = getattr(var, "calendar", "standard")
+    bounds = netCDF4.num2date([values.min(), values.max()], var.units, calendar,
+                              only_use_cftime_datetimes=False, only_use_python_datetimes=True)
+    return np.datetime64(bounds[0], "s"), np.datetime64(bounds[1], "s"), int(values.size)
+
+
+@lru_cache(maxsize=1024)
+def _read_header_cached(path, mtime_ns, size):
+    import netCDF4
+
+    with netCDF4.Dataset(path, "r") as ds:
+        ds.set_auto_maskandscale(False)
+        dims = {name: len(dim) for name, dim in ds.dimensions.items()}
+        variables = {}
+        extents = {}
+        coords = {}
+        for name, var in ds.variables.items():
+            variables[name] = {
+                "dims": tuple(var.dimensions),
+                "shape": tuple(var.shape),
+                "dtype": str(var.dtype),
+                "attrs": {key: var.getncattr(key) for key in var.ncattrs()},
+            }
+            if var.ndim != 1 or var.dimensions[0] != name:
+                continue
+            if name in TIME_NAMES:
+                try:
+                    decoded = _decode_times(var)
+                except Exception:
+                    decoded = None
+                if decoded is not None:
+                    extents[name] = decoded
+            elif var.size and np.issubdtype(var.dtype, np.number):
+                values = np.asarray(var[:], dtype=np.float64)
+                coords[name] = values
+                if name in LAT_NAMES + LON_NAMES:
+                    extents[name] = (float(values.min()), float(values.max()), int(values.size))
+        attrs = {key: ds.getncattr(key) for key in ds.ncattrs()}
+    return NetCDFHeader(path, dims, variables, attrs, extents, coords)
+
+
+def read_header(path):
+    """
+    Read the metadata of a NetCDF file, memoized by (path, mtime, size).
+
+    Args:
+        path: NetCDF file path.
+
+    Returns:
+        NetCDFHeader: Dimensions, variables, attributes and coordinate extents.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return _read_header_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def first_data_variable(path):
+    """
+    Name of the first scientific variable of a NetCDF file, or None.
+    """
+    return read_header(path).first_data_variable
@@ -0,0 +1,218 @@
+"""
+This module provides the shared read path for CAMS NetCDF variables.
+Variables are opened without xarray's own masking, and fill values are decoded
+per chunk as the data is read: every analysis operation receives float32 arrays
+in which missing_value/_FillValue and the configured sentinels are already NaN.
+"""
+
+import numpy as np
+import xarray as xr
+
+from .chunking import default_planner
+from .config import FILL_SENTINELS
+
+# Data variables that carry georeferencing rather than scientific data
+NON_DATA_VARIABLES = {"spatial_ref", "crs", "grid_mapping"}
+
+
+def open_dataset(path):
+    """
+    Open a NetCDF file lazily, leaving fill values and packing undecoded.
+
+    Args:
+        path: Path to the NetCDF file.
+
+    Returns:
+        xarray.Dataset: Lazily loaded dataset with raw (encoded) values.
+    """
+    # cache=False keeps chunk reads from pinning whole variables in memory
+    return xr.open_dataset(path, mask_and_scale=False, cache=False)
+
+
+def find_data_variables(ds):
+    """
+    List the scientific variables of a dataset.
+
+    Args:
+        ds: xarray.Dataset.
+
+    Returns:
+        list: Names of data variables with at least one dimension, excluding
+            grid mapping variables.
+    """
+    return [v for v in ds.data_vars if ds[v].ndim > 0 and v.lower() not in NON_DATA_VARIABLES]
+
+
+def fill_values_for(data, sentinels=None):
+    """
+    Collect the values that mark missing data for a variable.
+
+    Args:
+        data: xarray.DataArray opened with open_dataset (raw values).
+        sentinels: Extra sentinel values; if None, the FILL_SENTINELS entry for
+            the variable (or the "default" entry) is used.
+
+    Returns:
+        list: Raw values to treat as missing.
+    """
+    return fill_values_from_attrs(data.name, {**data.encoding, **data.attrs}, sentinels)
+
+
+def fill_values_from_attrs(name, attrs, sentinels=None):
+    """
+    Same as fill_values_for, from a variable name and its raw attributes.
+
+    Used with nc_header.read_header, which reads attributes without xarray.
+
+    Args:
+        name: Variable name.
+        attrs: Dictionary of the variable's attributes.
+        sentinels: Extra sentinel values (see fill_values_for).
+
+    Returns:
+        list: Raw values to treat as missing.
+    """
+    fills = []
+    for attr in ("missing_value", "_FillValue"):
+        value = attrs.get(attr)
+        if value is not None:
+            fills.extend(np.atleast_1d(value).tolist())
+    if sentinels is None:
+        sentinels = FILL_SENTINELS.get(name, FILL_SENTINELS.get("default", []))
+    fills.extend(sentinels)
+    return sorted(set(fills))
+
+
+class VariableReader:
+    """
+    Chunked reader of one NetCDF variable that returns decoded float32 arrays.
+
+    Decoding happens on each chunk as it is read: raw values equal to a fill
+    value become NaN, and scale_factor/add_offset packing is applied.
+    """
+
+    def __init__(self, data, sentinels=None):
+        """
+        Args:
+            data: xarray.DataArray opened with open_dataset (raw values).
+            sentinels: Extra sentinel values (see fill_values_for).
+        """
+        self.data = data
+        self.name = data.name
+        self.fill_values = fill_values_for(data, sentinels)
+        self.scale_factor = data.attrs.get("scale_factor", data.encoding.get("scale_factor"))
+        self.add_offset = data.attrs.get("add_offset", data.encoding.get("add_offset"))
+
+    @property
+    def dims(self):
+        return self.data.dims
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def ndim(self):
+        return self.data.ndim
+
+    @property
+    def size(self):
+        return int(self.data.size)
+
+    def decode(self, raw):
+        """
+        Decode a raw chunk into a masked float32 array.
+
+        Args:
+            raw: numpy array of raw values.
+
+        Returns:
+            numpy.ndarray: float32 array with missing values set to NaN.
+        """
+        raw = np.asarray(raw)
+        missing = np.isin(raw, self.fill_values) if self.fill_values else None
+        # Always a new array: raw may be the cached values of the DataArray
+        out = np.array(raw, dtype=np.float32, copy=True)
+        if self.scale_factor is not None:
+            out *= np.float32(self.scale_factor)
+        if self.add_offset is not None:
+            out += np.float32(self.add_offset)
+        if missing is not None:
+            out[missing] = np.nan
+        return out
+
+    def read(self, **indexers):
+        """
+        Read and decode a hyperslab.
+
+        Args:
+            **indexers: Positional indexers per dimension, as for DataArray.isel.
+
+        Returns:
+            numpy.ndarray: Decoded float32 array.
+        """
+        data = self.data.isel(indexers) if indexers else self.data
+        return self.decode(data.values)
+
+    def chunk_ranges(self, chunk_elements=None, dim=None):
+        """
+        (start, stop) ranges of the chunks of iter_chunks.
+
+        Returns:
+            tuple: (dimension split along, list of ranges).
+        """
+        dim = dim or self.dims[0]
+        axis = self.dims.index(dim)
+        length = self.shape[axis]
+        per_step = max(1, self.size // max(1, length))
+        if chunk_elements is None:
+            ranges = default_planner().ranges(length, per_step, self.data.dtype, tasks=1)
+        else:
+            step = max(1, chunk_elements // per_step)
+            ranges = [(start, min(start + step, length)) for start in range(0, length, step)]
+        return dim, ranges
+
+    def iter_chunks(self, chunk_elements=None, dim=None):
+        """
+        Read the variable chunk by chunk along one dimension.
+
+        Args:
+            chunk_elements: Approximate number of elements per chunk (default:
+                planned from the memory budget, see chunking.ChunkPlanner).
+            dim: Dimension to split along (default: the first one, normally time).
+
+        Yields:
+            tuple: (slice along dim, decoded float32 chunk).
+        """
+        if self.ndim == 0:
+            yield slice(None), self.read()
+            return
+        dim, ranges = self.chunk_ranges(chunk_elements, dim)
+        for start, stop in ranges:
+            index = slice(start, stop)
+            yield index, self.read(**{dim: index})
+
+
+def open_variable(path, variable=None, sentinels=None):
+    """
+    Open one variable of a NetCDF file for chunked, decoded reading.
+
+    Args:
+        path: Path to the NetCDF file.
+        variable: Variable name; defaults to the first scientific variable.
+        sentinels: Extra sentinel values (see fill_values_for).
+
+    Returns:
+        tuple: (xarray.Dataset, VariableReader). The caller closes the dataset.
+
+    Raises:
+        ValueError: If the file has no scientific variable.
+    """
+    ds = open_dataset(path)
+    if variable is None:
+        var_names = find_data_variables(ds)
+        if not var_names:
+            ds.close()
+            raise ValueError(f"No valid scientific variable found in {path}")
+        variable = var_names[0]
+    return ds, VariableReader(ds[variable], sentinels)
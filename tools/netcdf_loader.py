@@ -0,0 +1,205 @@
+"""
+This module prepares CAMS NetCDF files for display in QGIS.
+A variable can be converted once into a tiled, compressed Cloud-Optimized
+GeoTIFF with internal overviews, cached next to the source file and reused on
+later loads, so that rendering and zooming do not re-read every hourly band of
+the NetCDF file at full resolution.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+
+from .config import COG_OPTIONS, COG_OVERVIEW_LEVELS, COG_RESAMPLING
+
+COG_SUFFIX = ".cog.tif"
+
+# QGIS layer custom property holding the NetCDF file a layer was loaded from
+SOURCE_PATH_PROPERTY = "cams_data_manager/source_path"
+
+
+def netcdf_uri(path, variable=None):
+    """
+    GDAL URI of a NetCDF file or of one of its variables.
+
+    Args:
+        path: Path to the NetCDF file.
+        variable: Variable name; None lets GDAL pick the file itself.
+
+    Returns:
+        str: URI such as NETCDF:"/data/file.nc":no2_conc.
+    """
+    return f'NETCDF:"{path}":{variable}' if variable else f'NETCDF:"{path}"'
+
+
+def cog_path_for(path, variable=None):
+    """
+    Path of the cached COG of a NetCDF variable, next to the source file.
+
+    Args:
+        path: Path to the NetCDF file.
+        variable: Variable name, if the file has several.
+
+    Returns:
+        str: Path such as /data/file.no2_conc.cog.tif.
+    """
+    stem = os.path.splitext(path)[0]
+    if variable:
+        stem = f"{stem}.{variable}"
+    return stem + COG_SUFFIX
+
+
+def is_cog_current(cog_path, source_path):
+    """
+    Check whether a cached COG exists and is not older than its source.
+
+    Args:
+        cog_path: Path of the cached COG.
+        source_path: Path of the NetCDF file it was converted from.
+
+    Returns:
+        bool: True if the cached COG can be reused.
+    """
+    if not os.path.exists(cog_path):
+        return False
+    return os.path.getmtime(cog_path) >= os.path.getmtime(source_path)
+
+
+def resolve_variable(path, variable=None):
+    """
+    Find the GDAL subdataset name of a variable.
+
+    Args:
+        path: Path to the NetCDF file.
+        variable: Requested variable, e.g. "no2"; CAMS files may store it as
+            "no2_conc". If None or not found, the first subdataset is used.
+
+    Returns:
+        str: Variable name to use in netcdf_uri, or None if the file has a
+            single variable (GDAL opens it directly).
+    """
+    from osgeo import gdal
+
+    ds = gdal.Open(path)
+    if ds is None:
+        raise ValueError(f"GDAL cannot open {path}")
+    names = [name.rsplit(":", 1)[-1] for name, _ in ds.GetSubDatasets()]
+    ds = None
+    if not names:
+        return None
+    if variable:
+        for candidate in (variable, f"{variable}_conc"):
+            if candidate in names:
+                return candidate
+    return names[0]
+
+
+def convert_to_cog(path, variable=None, overwrite=False):
+    """
+    Convert a NetCDF variable into a Cloud-Optimized GeoTIFF with overviews.
+
+    All bands (time steps) are kept, with their metadata. Bands are stored
+    one after the other (INTERLEAVE=BAND), so drawing one time step only
+    decompresses the tiles of that band. The COG driver is used when it
+    supports band interleaving (GDAL >= 3.11); otherwise a tiled GeoTIFF with
+    internal overviews is written with the same layout. The file is written
+    under a temporary name and renamed, so an interrupted conversion never
+    leaves a truncated cache entry. Converting a month of hourly data takes a
+    while: run it in a background task (see cog_job).
+
+    Args:
+        path: Path to the NetCDF file.
+        variable: Variable to convert (see resolve_variable).
+        overwrite: Convert again even if a current COG exists.
+
+    Returns:
+        str: Path of the COG.
+    """
+    from osgeo import gdal
+
+    variable = resolve_variable(path, variable)
+    cog_path = cog_path_for(path, variable)
+    if not overwrite and is_cog_current(cog_path, path):
+        return cog_path
+
+    source = netcdf_uri(path, variable)
+    src = gdal.Open(source)
+    if src is None:
+        raise ValueError(f"GDAL cannot open {source}")
+    # CAMS files carry plain lat/lon coordinates; make the CRS explicit
+    srs = None if src.GetProjection() else "EPSG:4326"
+    tmp_path = cog_path + ".tmp"
+    try:
+        if _supports_band_interleave(gdal.GetDriverByName("COG")):
+            options = list(COG_OPTIONS) + [f"OVERVIEW_RESAMPLING={COG_RESAMPLING}", "BIGTIFF=IF_SAFER",
+                                           "INTERLEAVE=BAND"]
+            gdal.Translate(tmp_path, src, format="COG", outputSRS=srs, creationOptions=options)
+        else:
+            _write_tiled_geotiff(gdal, src, tmp_path, srs)
+        os.replace(tmp_path, cog_path)
+    finally:
+        src = None
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return cog_path
+
+
+def _supports_band_interleave(driver):
+    """Whether a GDAL driver accepts the INTERLEAVE=BAND creation option."""
+    if driver is None:
+        return False
+    options = driver.GetMetadataItem("DMD_CREATIONOPTIONLIST")
+    if not options:
+        return False
+    for option in ET.fromstring(options).iter("Option"):
+        if option.get("name") == "INTERLEAVE":
+            return "BAND" in (value.text for value in option.iter("Value"))
+    return False
+
+
+def _write_tiled_geotiff(gdal, src, path, srs):
+    """COG-like tiled GeoTIFF with internal overviews for GDAL versions without a suitable COG driver."""
+    # Written straight to the output file: a staging copy of every band would need as much memory or disk
+    out = gdal.Translate(path, src, format="GTiff", outputSRS=srs,
+                         creationOptions=["TILED=YES", "COMPRESS=DEFLATE", "INTERLEAVE=BAND", "BIGTIFF=IF_SAFER"])
+    if out is None:
+        raise ValueError(f"GDAL cannot write {path}")
+    levels = [f for f in COG_OVERVIEW_LEVELS if min(out.RasterXSize, out.RasterYSize) // f >= 1]
+    if levels:
+        out.BuildOverviews(COG_RESAMPLING, levels)
+    out = None
+
+
+def cog_job(path, variable=None):
+    """convert_to_cog as a job for tasks.AnalysisTask (see analysis_jobs)."""
+    yield 0.0, None
+    return convert_to_cog(path, variable)
+
+
+def layer_source(path, variable=None, use_cog=True):
+    """
+    Data source to add to QGIS for a NetCDF file, without converting it.
+
+    A current cached COG is used when there is one. Otherwise the NetCDF file
+    is opened directly, and the caller can convert it in the background (see
+    cog_job) and switch the layer to the COG afterwards.
+
+    Args:
+        path: Path to the NetCDF file.
+        variable: Variable to display (see resolve_variable).
+        use_cog: Use (or ask for) a cached COG; if False the NetCDF file is
+            always opened directly.
+
+    Returns:
+        tuple: (source URI or path, layer name, True if a COG should be built).
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    if not use_cog:
+        return netcdf_uri(path), name, False
+    try:
+        cog_path = cog_path_for(path, resolve_variable(path, variable))
+    except Exception:
+        # GDAL cannot open the file: no conversion, QGIS reports the invalid layer
+        return netcdf_uri(path), name, False
+    if is_cog_current(cog_path, path):
+        return cog_path, name, False
+    return netcdf_uri(path), name, True
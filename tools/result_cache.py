@@ -0,0 +1,206 @@
+"""
+This module provides a persistent on-disk cache for analysis results.
+Results are stored in a small SQLite database, keyed by the signature of the
+source files (path, size, mtime or content hash), the variable, the operation
+and its parameters. Entries belonging to a file that has since been replaced
+are dropped automatically the next time that file is looked up.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+
+from .config import RESULT_CACHE_DB
+
+
+def hash_file(path, block_size=1 << 20):
+    """
+    Compute the SHA-256 digest of a file's content.
+
+    Args:
+        path: Path of the file to hash.
+        block_size: Number of bytes read per iteration.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_signature(path, use_content_hash=False):
+    """
+    Build the signature identifying one version of a source file.
+
+    Args:
+        path: Path of the source file.
+        use_content_hash: If True, identify the file by its content hash instead
+            of its modification time (slower, but survives copies and touches).
+
+    Returns:
+        dict: Absolute path, size and either mtime (ns) or content hash.
+    """
+    st = os.stat(path)
+    signature = {"path": os.path.abspath(path), "size": st.st_size}
+    if use_content_hash:
+        signature["version"] = hash_file(path)
+    else:
+        signature["version"] = str(st.st_mtime_ns)
+    return signature
+
+
+class ResultCache:
+    """
+    SQLite-backed cache of analysis results.
+
+    A result is stored together with the signatures of every file it was
+    computed from, so that replacing any of those files invalidates it.
+    """
+
+    def __init__(self, db_path=RESULT_CACHE_DB, use_content_hash=False):
+        """
+        Args:
+            db_path: Location of the SQLite database file (created if missing).
+            use_content_hash: Identify source files by content hash instead of mtime.
+        """
+        self.db_path = db_path
+        self.use_content_hash = use_content_hash
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " variable TEXT,"
+                " operation TEXT,"
+                " params TEXT,"
+                " result TEXT NOT NULL,"
+                " created REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS result_sources ("
+                " key TEXT NOT NULL,"
+                " path TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " version TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sources_path ON result_sources(path)")
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _signatures(self, paths):
+        return [file_signature(p, self.use_content_hash) for p in paths]
+
+    @staticmethod
+    def _make_key(signatures, variable, operation, params):
+        payload = json.dumps(
+            [signatures, variable, operation, params or {}],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _drop_stale(conn, signatures):
+        """Delete every entry computed from an older version of the given files."""
+        for sig in signatures:
+            conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM result_sources"
+                " WHERE path = ? AND (size != ? OR version != ?))",
+                (sig["path"], sig["size"], sig["version"]),
+            )
+        conn.execute("DELETE FROM result_sources WHERE key NOT IN (SELECT key FROM results)")
+
+    def get(self, paths, variable, operation, params=None):
+        """
+        Look up a cached result.
+
+        Args:
+            paths: List of source file paths the result depends on.
+            variable: Variable name (or names) the operation ran on.
+            operation: Operation identifier, e.g. "statistics".
+            params: Dictionary of operation parameters (must be JSON-serialisable).
+
+        Returns:
+            The cached result (as stored by put), or None on a miss.
+        """
+        try:
+            signatures = self._signatures(paths)
+        except OSError:
+            return None
+        key = self._make_key(signatures, variable, operation, params)
+        with self._connect() as conn:
+            self._drop_stale(conn, signatures)
+            row = conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, paths, variable, operation, params, result):
+        """
+        Store a result.
+
+        Args:
+            paths: List of source file paths the result depends on.
+            variable: Variable name (or names) the operation ran on.
+            operation: Operation identifier, e.g. "statistics".
+            params: Dictionary of operation parameters (must be JSON-serialisable).
+            result: JSON-serialisable result to store.
+        """
+        signatures = self._signatures(paths)
+        key = self._make_key(signatures, variable, operation, params)
+        with self._connect() as conn:
+            self._drop_stale(conn, signatures)
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, variable, operation, params, result, created)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(variable),
+                    operation,
+                    json.dumps(params or {}, sort_keys=True, default=str),
+                    json.dumps(result),
+                    time.time(),
+                ),
+            )
+            conn.execute("DELETE FROM result_sources WHERE key = ?", (key,))
+            conn.executemany(
+                "INSERT INTO result_sources (key, path, size, version) VALUES (?, ?, ?, ?)",
+                [(key, s["path"], s["size"], s["version"]) for s in signatures],
+            )
+
+    def invalidate(self, path=None):
+        """
+        Remove cached results.
+
+        Args:
+            path: If given, only results depending on this file are removed;
+                otherwise the whole cache is cleared.
+        """
+        with self._connect() as conn:
+            if path is None:
+                conn.execute("DELETE FROM results")
+                conn.execute("DELETE FROM result_sources")
+                return
+            path = os.path.abspath(path)
+            conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM result_sources WHERE path = ?)",
+                (path,),
+            )
+            conn.execute(
+                "DELETE FROM result_sources WHERE key NOT IN (SELECT key FROM results)"
+            )
@@ -0,0 +1,362 @@
+"""
+This module computes summary statistics (mean, min, max, std) of NetCDF variables.
+Statistics are accumulated chunk by chunk with a mergeable running accumulator, so
+that a fast estimate from a strided subsample can be reported first and refined
+progressively until the exact result over the full array is available.
+
+Chunks are contiguous blocks of time steps, which are strongly autocorrelated
+(diurnal and seasonal cycles): they are read in a spread order so that the
+partial results cover the whole period, but they are not a random sample,
+so partial results carry no error bounds.
+"""
+
+import math
+
+import numpy as np
+
+# Two-sided 95% normal quantile used for the reported error bounds
+Z_95 = 1.96
+
+
+class RunningStats:
+    """
+    Streaming accumulator of count, mean, variance, min and max.
+
+    Chunks are combined with the parallel update of Chan et al., which keeps the
+    variance numerically stable without holding more than one chunk in memory.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, chunk):
+        """
+        Add the finite values of an array chunk to the accumulator.
+
+        Args:
+            chunk: numpy array of any shape; NaN values are ignored.
+        """
+        values = np.asarray(chunk).ravel()
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        other = RunningStats()
+        other.n = values.size
+        other.mean = float(values.mean(dtype=np.float64))
+        other.m2 = float(np.square(np.subtract(values, other.mean, dtype=np.float64)).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other):
+        """
+        Merge another accumulator into this one.
+
+        Args:
+            other: RunningStats instance.
+        """
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        """Population standard deviation (same convention as numpy.nanstd)."""
+        return math.sqrt(self.m2 / self.n) if self.n else math.nan
+
+    def result(self):
+        """
+        Returns:
+            dict: mean, min, max and std of the values seen so far.
+        """
+        if self.n == 0:
+            return {"mean": math.nan, "min": math.nan, "max": math.nan, "std": math.nan}
+        return {"mean": self.mean, "min": self.min, "max": self.max, "std": self.std}
+
+
+def spread_order(items):
+    """
+    Items reordered so that every prefix is spread over the whole sequence:
+    0, k, 2k, ..., then 1, k + 1, ... with k about the square root of the
+    length. Chunks read in this order give partial results over the whole
+    period rather than over its first weeks.
+    """
+    items = list(items)
+    k = max(1, math.isqrt(len(items)))
+    return [items[i] for offset in range(k) for i in range(offset, len(items), k)]
+
+
+def _estimate(acc, fraction, exact, stage):
+    """
+    Build an estimate record, with 95% error bounds for the preview.
+
+    The bounds of the preview assume its strided subsample behaves like a
+    random sample of the full array and include the finite population
+    correction. Partial records come from whole chunks of consecutive time
+    steps, which are not, so their bounds are NaN. Min and max read so far
+    are one-sided bounds (the true min can only be lower, the true max higher).
+    """
+    values = acc.result()
+    if stage == "partial":
+        mean_err = std_err = math.nan
+    elif exact or acc.n < 2:
+        mean_err = std_err = 0.0 if exact else math.nan
+    else:
+        fpc = math.sqrt(max(0.0, 1.0 - fraction))
+        mean_err = Z_95 * values["std"] / math.sqrt(acc.n) * fpc
+        std_err = Z_95 * values["std"] / math.sqrt(2.0 * (acc.n - 1)) * fpc
+    return {
+        "stage": stage,
+        "exact": exact,
+        "fraction": fraction,
+        "count": acc.n,
+        "values": values,
+        "errors": {"mean": mean_err, "std": std_err},
+    }
+
+
+def preview_statistics(reader, target_size=200_000):
+    """
+    Approximate statistics from a strided subsample of a variable.
+
+    The same stride is applied along every dimension (time and space), so the
+    subsample is spread over the whole array while reading only about
+    target_size elements.
+
+    Args:
+        reader: nc_reader.VariableReader of the variable.
+        target_size: Approximate number of elements to read.
+
+    Returns:
+        dict: Estimate record (see iter_progressive_statistics).
+    """
+    total = reader.size
+    step = 1
+    if reader.ndim and total > target_size:
+        step = max(1, int(math.ceil((total / target_size) ** (1.0 / reader.ndim))))
+    sample = reader.read(**{dim: slice(None, None, step) for dim in reader.dims})
+    acc = RunningStats()
+    acc.update(sample)
+    exact = step == 1
+    return _estimate(acc, sample.size / total if total else 1.0, exact, "final" if exact else "preview")
+
+
+def iter_progressive_statistics(reader, chunk_elements=None, preview_size=200_000):
+    """
+    Compute statistics progressively, yielding refined estimates as chunks are read.
+
+    The first record comes from a strided subsample (see preview_statistics);
+    subsequent records come from reading the array chunk by chunk along its
+    first dimension (normally time), in spread order (see spread_order), once
+    they hold more values than the preview. The last record is exact.
+
+    Args:
+        reader: nc_reader.VariableReader of the variable.
+        chunk_elements: Approximate number of elements read per chunk (default:
+            planned, see chunking.ChunkPlanner).
+        preview_size: Approximate number of elements read for the preview.
+
+    Yields:
+        dict: Estimate record with keys stage ("preview", "partial", "final"),
+            exact, fraction (share of the array read), count, values (mean, min,
+            max, std) and errors (95% half-widths for mean and std of the
+            preview, NaN for partial records).
+    """
+    if reader.ndim == 0:
+        acc = RunningStats()
+        acc.update(reader.read())
+        yield _estimate(acc, 1.0, True, "final")
+        return
+
+    preview = preview_statistics(reader, preview_size)
+    yield preview
+    if preview["exact"]:
+        return
+
+    total = reader.size
+    acc = RunningStats()
+    read = 0
+    dim, ranges = reader.chunk_ranges(chunk_elements)
+    for start, stop in spread_order(ranges):
+        chunk = reader.read(**{dim: slice(start, stop)})
+        acc.update(chunk)
+        read += chunk.size
+        if read < total and acc.n > preview["count"]:
+            yield _estimate(acc, read / total, False, "partial")
+    yield _estimate(acc, 1.0, True, "final")
+
+
+def iter_pooled_statistics(readers, chunk_elements=None):
+    """
+    Compute the statistics of several variables taken together (e.g. the monthly
+    files covering a period), yielding refined estimates as chunks are read.
+    The chunks of all files are read in spread order (see spread_order).
+
+    Args:
+        readers: nc_reader.VariableReader objects.
+        chunk_elements: Approximate number of elements read per chunk (default:
+            planned, see chunking.ChunkPlanner).
+
+    Yields:
+        dict: Estimate records as in iter_progressive_statistics; the last one
+            is exact.
+    """
+    total = sum(reader.size for reader in readers)
+    # Chunks of all the files, spread over the whole period
+    chunks = []
+    for reader in readers:
+        if reader.ndim == 0:
+            chunks.append((reader, None, None))
+            continue
+        dim, ranges = reader.chunk_ranges(chunk_elements)
+        chunks.extend((reader, dim, index) for index in ranges)
+    acc = RunningStats()
+    read = 0
+    for reader, dim, index in spread_order(chunks):
+        chunk = reader.read() if dim is None else reader.read(**{dim: slice(*index)})
+        acc.update(chunk)
+        read += chunk.size
+        if read < total:
+            yield _estimate(acc, read / total, False, "partial")
+    yield _estimate(acc, 1.0, True, "final")
+
+
+def iter_zonal_statistics(readers, masks, chunk_elements=None):
+    """
+    Compute the statistics of several variables taken together, separately
+    inside each zone of the grid (e.g. the polygons of a vector layer).
+
+    Args:
+        readers: nc_reader.VariableReader objects on the same grid, with
+            latitude and longitude as their last two dimensions.
+        masks: Dictionary of zone id -> boolean array of shape (lat, lon).
+        chunk_elements: Approximate number of elements read per chunk (default:
+            planned, see chunking.ChunkPlanner).
+
+    Yields:
+        dict: "fraction" read, "exact" (True for the last record) and "zones",
+            a dictionary of zone id -> mean, min, max, std and count.
+    """
+    total = sum(reader.size for reader in readers)
+    accs = {zone: RunningStats() for zone in masks}
+    cells = zone_cells(masks)
+    read = 0
+    for reader in readers:
+        for _, chunk in reader.iter_chunks(chunk_elements):
+            update_zones(accs, chunk, cells)
+            read += chunk.size
+            if read < total:
+                yield {"fraction": read / total, "exact": False, "zones": None}
+    yield {"fraction": 1.0, "exact": True, "zones": zone_results(accs)}
+
+
+def zone_cells(masks):
+    """
+    Flat indices of the grid cells of each zone.
+
+    Args:
+        masks: Dictionary of zone id -> boolean array of shape (lat, lon).
+
+    Returns:
+        dict: Zone id -> int array of indices into the flattened grid.
+    """
+    return {zone: np.flatnonzero(np.asarray(mask, dtype=bool)) for zone, mask in masks.items()}
+
+
+def update_zones(accs, chunk, cells):
+    """
+    Add a chunk to the accumulator of each zone.
+
+    Args:
+        accs: Dictionary of zone id -> RunningStats.
+        chunk: Array with latitude and longitude as its last two dimensions.
+        cells: Flat cell indices per zone (see zone_cells).
+    """
+    values = chunk.reshape(-1, chunk.shape[-2] * chunk.shape[-1])
+    for zone, index in cells.items():
+        if index.size:
+            accs[zone].update(values[:, index])
+
+
+def zone_results(accs):
+    """Zone id -> mean, min, max, std and count of the zone accumulators."""
+    return {zone: dict(acc.result(), count=acc.n) for zone, acc in accs.items()}
+
+
+def iter_merged_statistics(parts, total, min_count=0):
+    """
+    Merge the accumulators of chunks read elsewhere (e.g. by the worker
+    processes of compute.ComputeBackend), yielding refined estimates.
+
+    Args:
+        parts: Iterable of (RunningStats, number of elements read), one per
+            chunk, in any order.
+        total: Number of elements of all the chunks together.
+        min_count: Partial records are only yielded once they hold more
+            values than this (e.g. the count of a preview already shown).
+
+    Yields:
+        dict: Estimate records as in iter_progressive_statistics; the last one
+            is exact.
+    """
+    acc = RunningStats()
+    read = 0
+    for part, size in parts:
+        acc.merge(part)
+        read += size
+        if read < total and acc.n > min_count:
+            yield _estimate(acc, read / total, False, "partial")
+    yield _estimate(acc, 1.0, True, "final")
+
+
+def format_statistics(record, stats):
+    """
+    Format an estimate record for the statistics panel.
+
+    Args:
+        record: Estimate record from iter_progressive_statistics.
+        stats: List of statistics to show ("mean", "max", "min", "std").
+
+    Returns:
+        str: Human-readable text.
+    """
+    values = record["values"]
+    errors = record["errors"]
+    exact = record["exact"]
+    lines = []
+    bounds = not exact and math.isfinite(errors.get("mean", math.nan))
+    if 'mean' in stats:
+        if not bounds:
+            lines.append(f"Mean: {values['mean']:.4f}")
+        else:
+            lines.append(f"Mean: {values['mean']:.4f} ± {errors['mean']:.4f}")
+    if 'max' in stats:
+        lines.append(f"Max: {values['max']:.4f}" if exact else f"Max: ≥ {values['max']:.4f}")
+    if 'min' in stats:
+        lines.append(f"Min: {values['min']:.4f}" if exact else f"Min: ≤ {values['min']:.4f}")
+    if 'std' in stats:
+        if not bounds:
+            lines.append(f"Std. Dev: {values['std']:.4f}")
+        else:
+            lines.append(f"Std. Dev: {values['std']:.4f} ± {errors['std']:.4f}")
+    if exact:
+        lines.append("(exact result)")
+    elif record["stage"] == "preview":
+        lines.append("(preview from strided subsample, 95% bounds; refining...)")
+    else:
+        lines.append(f"({record['fraction'] * 100:.0f}% read, spread over the period; refining...)")
+    return "\n".join(lines)
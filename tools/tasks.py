@@ -0,0 +1,68 @@
+"""
+This module runs analysis jobs (see analysis_jobs) as QGIS background tasks.
+The task manager shows their progress and lets the user cancel them; the
+dialog gets partial and final results back through Qt signals, delivered on
+the main thread, so the map stays usable and several analyses can run at once.
+"""
+
+from qgis.PyQt.QtCore import pyqtSignal
+from qgis.core import QgsTask
+
+
+class AnalysisTask(QgsTask):
+    """
+    QgsTask driving a job generator that yields (fraction, partial result).
+
+    Signals:
+        partialResult(object): A partial result yielded by the job.
+        resultReady(object): The value returned by the job.
+        failed(str): Error message if the job raised.
+        cancelled(): The task was cancelled before the job finished.
+    """
+
+    partialResult = pyqtSignal(object)
+    resultReady = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, description, job, *args, **kwargs):
+        """
+        Args:
+            description: Name shown in the QGIS task manager.
+            job: Generator function (see analysis_jobs); called with args and
+                kwargs in the background thread.
+        """
+        super().__init__(description, QgsTask.CanCancel)
+        self.job = job
+        self.args = args
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
+
+    def run(self):
+        """Runs in a background thread: no GUI or project access here."""
+        steps = self.job(*self.args, **self.kwargs)
+        try:
+            while True:
+                if self.isCanceled():
+                    steps.close()
+                    return False
+                fraction, partial = next(steps)
+                self.setProgress(100.0 * fraction)
+                if partial is not None:
+                    self.partialResult.emit(partial)
+        except StopIteration as stop:
+            self.result = stop.value
+            return True
+        except Exception as e:
+            self.error = str(e)
+            return False
+
+    def finished(self, result):
+        """Runs on the main thread once run() has returned."""
+        if result:
+            self.resultReady.emit(self.result)
+        elif self.error is not None:
+            self.failed.emit(self.error)
+        else:
+            self.cancelled.emit()
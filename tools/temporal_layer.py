@@ -0,0 +1,252 @@
+"""
+This module connects multi-band CAMS rasters to the QGIS temporal controller.
+Each band is mapped to its timestamp, and only the band of the current frame is
+rendered: the layer's renderer is switched to that band when the frame changes.
+All frames share one contrast stretch, taken from the statistics of the whole
+variable, so that frames can be compared and each band is read only by QGIS.
+"""
+
+import numpy as np
+
+from .alignment import TIME_NAMES
+from .nc_reader import open_dataset, find_data_variables, VariableReader
+from .statistics import preview_statistics
+
+
+def find_variable(ds, variable=None):
+    """
+    Name of the variable to display.
+
+    Args:
+        ds: xarray.Dataset opened with nc_reader.open_dataset.
+        variable: Requested name, e.g. "no2"; CAMS files may store it as "no2_conc".
+
+    Returns:
+        str: The matching variable, else the first scientific variable, or None.
+    """
+    names = find_data_variables(ds)
+    if variable:
+        for candidate in (variable, f"{variable}_conc"):
+            if candidate in names:
+                return candidate
+    return names[0] if names else None
+
+
+def band_times(reader, ds):
+    """
+    Timestamps of the raster bands of a variable.
+
+    GDAL exposes every combination of non-spatial dimensions as a band; the
+    mapping is only defined when time is the sole non-singleton one.
+
+    Args:
+        reader: nc_reader.VariableReader of the variable.
+        ds: Dataset the reader was opened from.
+
+    Returns:
+        tuple: (time dimension name, numpy datetime64 array with one entry per
+            band), or (None, None) if the bands cannot be mapped to time.
+    """
+    time_dim = next((d for d in reader.dims if d in TIME_NAMES), None)
+    if time_dim is None:
+        return None, None
+    spatial = reader.dims[-2:]
+    for dim, size in zip(reader.dims, reader.shape):
+        if dim not in spatial and dim != time_dim and size != 1:
+            return None, None
+    times = np.asarray(ds[time_dim].values)
+    if not np.issubdtype(times.dtype, np.datetime64):
+        return None, None
+    return time_dim, times.astype("datetime64[ms]")
+
+
+def band_for_time(times, when):
+    """
+    Index of the band shown at a given instant (the last band starting at or before it).
+
+    Args:
+        times: Sorted numpy datetime64 array of band timestamps.
+        when: numpy datetime64 instant.
+
+    Returns:
+        int: 0-based band index, clipped to the valid range.
+    """
+    index = int(np.searchsorted(times, when, side="right")) - 1
+    return min(max(index, 0), len(times) - 1)
+
+
+def band_ranges(times):
+    """
+    Validity interval of each band: from its timestamp to the next one.
+
+    Args:
+        times: Sorted numpy datetime64 array of band timestamps.
+
+    Returns:
+        list: (start, end) numpy datetime64 pairs; the last band lasts one
+            median time step.
+    """
+    if len(times) > 1:
+        step = np.median(np.diff(times))
+    else:
+        step = np.timedelta64(1, "h")
+    ends = np.append(times[1:], times[-1] + step)
+    return list(zip(times, ends))
+
+
+def value_range(values):
+    """Finite (min, max) of statistics values, or None if there are none."""
+    low, high = values["min"], values["max"]
+    if not (np.isfinite(low) and np.isfinite(high)):
+        return None
+    return float(low), float(high)
+
+
+class TemporalBandBinding:
+    """
+    Drive the band rendered by a raster layer from the map canvas time range.
+
+    The layer gets an active fixed temporal range covering all bands, so the
+    temporal controller picks up its extent, and a single-band renderer whose
+    band follows the current frame. A grey renderer keeps one contrast stretch
+    for all frames, from the value range of the whole variable.
+
+    Args:
+        layer: QgsRasterLayer whose bands are time steps.
+        times: numpy datetime64 array with the timestamp of every band.
+        value_range: (min, max) stretch shared by all frames, or None to let
+            QGIS stretch each band.
+
+    Raises:
+        ValueError: If the number of timestamps differs from the band count.
+    """
+
+    def __init__(self, layer, times, value_range=None):
+        if len(times) != layer.bandCount():
+            raise ValueError(f"{layer.name()} has {layer.bandCount()} bands but {len(times)} timestamps.")
+        self.layer = layer
+        self.canvas = None
+        self.times = times
+        self.value_range = value_range
+        self.band = None
+
+    @classmethod
+    def from_netcdf(cls, layer, source_path, variable=None):
+        """
+        Bind a layer showing a NetCDF variable, with a stretch from its value range.
+
+        Args:
+            layer: QgsRasterLayer whose bands are the time steps of the variable.
+            source_path: NetCDF file the layer was loaded from.
+            variable: Variable to bind (see find_variable).
+
+        Raises:
+            ValueError: If the bands of the variable cannot be mapped to time.
+        """
+        ds = open_dataset(source_path)
+        try:
+            name = find_variable(ds, variable)
+            if name is None:
+                raise ValueError(f"No valid scientific variable found in {source_path}")
+            reader = VariableReader(ds[name])
+            _, times = band_times(reader, ds)
+            if times is None:
+                raise ValueError(f"The bands of {source_path} cannot be mapped to time steps.")
+            # Range of a strided subsample of all time steps (see statistics.preview_statistics)
+            return cls(layer, times, value_range(preview_statistics(reader)["values"]))
+        finally:
+            ds.close()
+
+    @classmethod
+    def from_gdal(cls, layer, source, times, sample_bands=8):
+        """
+        Bind a layer opened from any GDAL source (e.g. a VRT mosaic).
+
+        Args:
+            layer: QgsRasterLayer.
+            source: GDAL path of the layer.
+            times: numpy datetime64 array with the timestamp of every band.
+            sample_bands: Number of bands, spread over time, whose approximate
+                (or PAM) statistics give the shared stretch.
+        """
+        from osgeo import gdal
+
+        raster = gdal.Open(source)
+        if raster is None:
+            raise ValueError(f"GDAL cannot open {source}")
+        low, high = np.inf, -np.inf
+        count = raster.RasterCount
+        for index in sorted(set(np.linspace(0, count - 1, min(count, sample_bands)).astype(int))):
+            stats = raster.GetRasterBand(int(index) + 1).GetStatistics(True, True)
+            if stats is not None and stats[0] <= stats[1]:
+                low, high = min(low, stats[0]), max(high, stats[1])
+        raster = None
+        return cls(layer, times, value_range({"min": low, "max": high}))
+
+    def attach(self, canvas):
+        """
+        Activate temporal handling of the layer and follow the canvas time range.
+
+        Args:
+            canvas: QgsMapCanvas whose temporal range drives the frame.
+        """
+        from qgis.PyQt.QtCore import QDateTime, Qt
+        from qgis.core import QgsDateTimeRange, QgsRasterLayerTemporalProperties
+
+        def to_qdatetime(value):
+            return QDateTime.fromMSecsSinceEpoch(int(value.astype("int64")), Qt.UTC)
+
+        start, end = band_ranges(self.times)[0][0], band_ranges(self.times)[-1][1]
+        properties = self.layer.temporalProperties()
+        properties.setMode(QgsRasterLayerTemporalProperties.ModeFixedTemporalRange)
+        properties.setFixedTemporalRange(QgsDateTimeRange(to_qdatetime(start), to_qdatetime(end), True, False))
+        properties.setIsActive(True)
+        self.canvas = canvas
+        canvas.temporalRangeChanged.connect(self.on_temporal_range_changed)
+        self.show_band(0)
+
+    def detach(self):
+        """Stop following the canvas."""
+        if self.canvas is not None:
+            try:
+                self.canvas.temporalRangeChanged.disconnect(self.on_temporal_range_changed)
+            except TypeError:
+                pass
+            self.canvas = None
+
+    def on_temporal_range_changed(self):
+        time_range = self.canvas.temporalRange()
+        if not time_range.begin().isValid():
+            return
+        when = np.datetime64(time_range.begin().toMSecsSinceEpoch(), "ms")
+        self.show_band(band_for_time(self.times, when))
+
+    def show_band(self, index):
+        """
+        Render the band of one time step (0-based index).
+        """
+        if index == self.band:
+            return
+        from qgis.core import (
+            QgsContrastEnhancement, QgsSingleBandGrayRenderer, QgsSingleBandPseudoColorRenderer
+        )
+
+        band = index + 1
+        renderer = self.layer.renderer()
+        if isinstance(renderer, QgsSingleBandGrayRenderer):
+            renderer.setGrayBand(band)
+        elif isinstance(renderer, QgsSingleBandPseudoColorRenderer):
+            # Keep the colour classification; only the band changes
+            renderer.setInputBand(band)
+        else:
+            renderer = QgsSingleBandGrayRenderer(self.layer.dataProvider(), band)
+            self.layer.setRenderer(renderer)
+        if isinstance(renderer, QgsSingleBandGrayRenderer) and self.value_range is not None:
+            # The same stretch for every frame, so colours mean the same values over time
+            enhancement = QgsContrastEnhancement(self.layer.dataProvider().dataType(band))
+            enhancement.setContrastEnhancementAlgorithm(QgsContrastEnhancement.StretchToMinimumMaximum)
+            enhancement.setMinimumValue(self.value_range[0])
+            enhancement.setMaximumValue(self.value_range[1])
+            renderer.setContrastEnhancement(enhancement)
+        self.band = index
+        self.layer.triggerRepaint()
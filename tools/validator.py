@@ -1,9 +1,11 @@
 """
 This module handles validation of download parameters for the CAMS Data Manager plugin.
 It provides functions to check that user inputs meet the requirements for CAMS API requests.
+The checks themselves (params_error, aoi_error) do not need Qt, so the headless
+batch runner (tools/batch.py) uses them too.
 """
 
-from PyQt5.QtWidgets import QMessageBox
+from .availability import plan_errors
 
 def show_error(message):
     """
@@ -15,6 +17,8 @@ def show_error(message):
     Args:
         message: The warning message to display.
     """
+    from PyQt5.QtWidgets import QMessageBox
+
     QMessageBox.warning(None, "Invalid Parameters", message)
 
 
@@ -32,94 +36,111 @@ def validate_params(params):
     Returns:
         True if all checks pass, False if any check fails.
     """
+    message = params_error(params)
+    if message:
+        show_error(message)
+        return False
+    return True
+
+
+def params_error(params):
+    """
+    First problem of the download parameters, without any dialog.
+
+    Args:
+        params: Dictionary containing all parameters from the UI.
+
+    Returns:
+        str: Message for the user, or None if all checks pass.
+    """
     # Check for required parameter fields
     # Variable selection
     if not params.get("variable"):
-        show_error("Please select a variable (e.g., ozone, pm2p5).")
-        return False
+        return "Please select a variable (e.g., ozone, pm2p5)."
 
     # Model selection
     if not params.get("model"):
-        show_error("Please select a model (e.g., ensemble, chimere).")
-        return False
+        return "Please select a model (e.g., ensemble, chimere)."
 
     # Level selection
     if not params.get("level"):
-        show_error("Please select a vertical level (e.g., 0, 500 meters).")
-        return False
+        return "Please select a vertical level (e.g., 0, 500 meters)."
 
     # Data type selection
     if not params.get("type"):
-        show_error("Please select a data type (e.g., validated_reanalysis).")
-        return False
+        return "Please select a data type (e.g., validated_reanalysis)."
 
     # Time period selection
     # At least one year must be selected
     if not params.get("years"):
-        show_error("Please select at least one year.")
-        return False
+        return "Please select at least one year."
 
     # At least one month must be selected
     if not params.get("months"):
-        show_error("Please select at least one month.")
-        return False
+        return "Please select at least one month."
     
     # CAMS API requires exactly one year and one month per request
     # (This check may be redundant if already performed in the UI,
     # but included here for completeness)
     if len(params.get("years", [])) > 1:
-        show_error("Only one year can be selected per request.")
-        return False
+        return "Only one year can be selected per request."
         
     if len(params.get("months", [])) > 1:
-        show_error("Only one month can be selected per request.")
-        return False
+        return "Only one month can be selected per request."
+
+    # Reject requests for months ADS does not have before they wait in its queue
+    errors = plan_errors(params)
+    if errors:
+        return "\n".join(errors)
 
     # Output folder must be specified
     if not params.get("folder"):
-        show_error("Please select a folder to save the downloaded data.")
-        return False
+        return "Please select a folder to save the downloaded data."
 
     # Terms agreement check
     if not params.get("agree_terms", False):
-        show_error("You must agree to the terms and conditions before downloading.")
-        return False
+        return "You must agree to the terms and conditions before downloading."
 
     # Check area of interest parameters if using custom AOI
     if params.get("aoi_mode") == "custom":
-        area = params.get("area", {})
-        
-        # Ensure all required coordinates are present
-        if not all(k in area for k in ["north", "south", "east", "west"]):
-            show_error("Missing coordinates for custom area of interest.")
-            return False
-            
-        # Validate coordinate relationships
-        if area.get("north", 90) <= area.get("south", -90):
-            show_error("North latitude must be greater than South latitude.")
-            return False
-            
-        if area.get("east", 180) <= area.get("west", -180):
-            show_error("East longitude must be greater than West longitude.")
-            return False
-            
-        # Validate coordinate ranges
-        if not (-90 <= area.get("south", 0) <= 90):
-            show_error("South latitude must be between -90 and 90 degrees.")
-            return False
-            
-        if not (-90 <= area.get("north", 0) <= 90):
-            show_error("North latitude must be between -90 and 90 degrees.")
-            return False
-            
-        if not (-180 <= area.get("west", 0) <= 180):
-            show_error("West longitude must be between -180 and 180 degrees.")
-            return False
-            
-        if not (-180 <= area.get("east", 0) <= 180):
-            show_error("East longitude must be between -180 and 180 degrees.")
-            return False
+        return aoi_error(params.get("area", {}))
 
     # All checks passed
-    return True
+    return None
+
+
+def aoi_error(area):
+    """
+    First problem of a custom area of interest.
+
+    Args:
+        area: Dictionary with north, south, east and west coordinates (degrees).
+
+    Returns:
+        str: Message for the user, or None if the area is valid.
+    """
+    # Ensure all required coordinates are present
+    if not all(k in area for k in ["north", "south", "east", "west"]):
+        return "Missing coordinates for custom area of interest."
+        
+    # Validate coordinate relationships
+    if area.get("north", 90) <= area.get("south", -90):
+        return "North latitude must be greater than South latitude."
+        
+    if area.get("east", 180) <= area.get("west", -180):
+        return "East longitude must be greater than West longitude."
+        
+    # Validate coordinate ranges
+    if not (-90 <= area.get("south", 0) <= 90):
+        return "South latitude must be between -90 and 90 degrees."
+        
+    if not (-90 <= area.get("north", 0) <= 90):
+        return "North latitude must be between -90 and 90 degrees."
+        
+    if not (-180 <= area.get("west", 0) <= 180):
+        return "West longitude must be between -180 and 180 degrees."
+        
+    if not (-180 <= area.get("east", 0) <= 180):
+        return "East longitude must be between -180 and 180 degrees."
 
+    return None
@@ -0,0 +1,242 @@
+"""
+This module builds virtual multi-file time series of CAMS variables.
+A GDAL VRT references the bands of several NetCDF files (e.g. monthly
+downloads) in time order, so a whole year can be displayed as one layer without
+copying any data. The description of every source is kept in the VRT itself,
+so appending a new month only describes the new file and rewrites the XML.
+"""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from .netcdf_loader import netcdf_uri, resolve_variable
+from .nc_reader import open_variable
+from .temporal_layer import band_times
+
+# Dataset metadata item holding the JSON description of the sources
+SOURCES_METADATA_KEY = "CAMS_SOURCES"
+
+
+def describe_source(path, variable=None):
+    """
+    Describe the raster bands of a NetCDF variable for use in a mosaic.
+
+    Args:
+        path: Path to the NetCDF file.
+        variable: Variable name (see netcdf_loader.resolve_variable).
+
+    Returns:
+        dict: path, variable, uri, grid (xsize, ysize, geotransform, srs),
+            data_type, nodata, times (ISO timestamps, one per band) and per-band
+            stats ([min, max, mean, std] stored by GDAL, or None).
+
+    Raises:
+        ValueError: If the bands of the variable cannot be mapped to time steps.
+    """
+    from osgeo import gdal
+
+    gdal_variable = resolve_variable(path, variable)
+    ds, reader = open_variable(path, gdal_variable)
+    try:
+        _, times = band_times(reader, ds)
+    finally:
+        ds.close()
+    if times is None:
+        raise ValueError(f"The bands of {path} cannot be mapped to time steps.")
+
+    uri = netcdf_uri(path, gdal_variable)
+    raster = gdal.Open(uri)
+    if raster is None:
+        raise ValueError(f"GDAL cannot open {uri}")
+    if raster.RasterCount != len(times):
+        raise ValueError(f"{uri} has {raster.RasterCount} bands but {len(times)} time steps.")
+    first = raster.GetRasterBand(1)
+    stats = []
+    for index in range(1, raster.RasterCount + 1):
+        band = raster.GetRasterBand(index)
+        items = [band.GetMetadataItem(f"STATISTICS_{key}") for key in ("MINIMUM", "MAXIMUM", "MEAN", "STDDEV")]
+        stats.append(None if None in items else [float(v) for v in items])
+    source = {
+        "path": os.path.abspath(path),
+        "variable": gdal_variable or reader.name,
+        "uri": uri,
+        "xsize": raster.RasterXSize,
+        "ysize": raster.RasterYSize,
+        "geotransform": list(raster.GetGeoTransform()),
+        "srs": raster.GetProjection() or "EPSG:4326",
+        "data_type": gdal.GetDataTypeName(first.DataType),
+        "nodata": first.GetNoDataValue(),
+        "times": [str(t) for t in np.datetime_as_string(times, unit="s")],
+        "stats": stats,
+    }
+    raster = None
+    return source
+
+
+def _same_grid(a, b):
+    return (a["xsize"] == b["xsize"] and a["ysize"] == b["ysize"]
+            and np.allclose(a["geotransform"], b["geotransform"], atol=1e-9))
+
+
+def _check_compatible(reference, source):
+    """Raise ValueError unless two sources can be bands of one mosaic."""
+    if source["variable"] != reference["variable"]:
+        raise ValueError(f"{source['path']} holds {source['variable']}, "
+                         f"not {reference['variable']} like {reference['path']}.")
+    if not _same_grid(reference, source):
+        raise ValueError(f"{source['path']} is not on the same grid as {reference['path']}.")
+    if source["data_type"] != reference["data_type"]:
+        raise ValueError(f"{source['path']} has {source['data_type']} values, "
+                         f"not {reference['data_type']} like {reference['path']}.")
+
+
+def build_vrt_xml(sources):
+    """
+    Compose the VRT of a time series from source descriptions.
+
+    Bands are ordered by time; a timestamp present in several sources is
+    taken from the source that starts first.
+
+    Args:
+        sources: List of dictionaries from describe_source.
+
+    Returns:
+        tuple: (VRT XML string, list of ISO band timestamps).
+
+    Raises:
+        ValueError: If there is no source, or the sources differ in variable,
+            grid or data type.
+    """
+    if not sources:
+        raise ValueError("A mosaic needs at least one source file.")
+    sources = sorted(sources, key=lambda s: s["times"][0])
+    reference = sources[0]
+    for source in sources[1:]:
+        _check_compatible(reference, source)
+
+    root = ET.Element("VRTDataset", rasterXSize=str(reference["xsize"]), rasterYSize=str(reference["ysize"]))
+    ET.SubElement(root, "SRS").text = reference["srs"]
+    ET.SubElement(root, "GeoTransform").text = ", ".join(repr(float(v)) for v in reference["geotransform"])
+    metadata = ET.SubElement(root, "Metadata")
+    ET.SubElement(metadata, "MDI", key=SOURCES_METADATA_KEY).text = json.dumps(sources)
+
+    # Every band in time order; for duplicate timestamps the earliest source wins
+    entries = {}
+    for source in sources:
+        for index, time in enumerate(source["times"], start=1):
+            entries.setdefault(time, (source, index))
+    times = sorted(entries)
+    global_min = global_max = None
+    for number, time in enumerate(times, start=1):
+        source, index = entries[time]
+        band = ET.SubElement(root, "VRTRasterBand", dataType=reference["data_type"], band=str(number))
+        ET.SubElement(band, "Description").text = time
+        band_metadata = ET.SubElement(band, "Metadata")
+        ET.SubElement(band_metadata, "MDI", key="time").text = time
+        stats = source["stats"][index - 1]
+        if stats:
+            for key, value in zip(("MINIMUM", "MAXIMUM", "MEAN", "STDDEV"), stats):
+                ET.SubElement(band_metadata, "MDI", key=f"STATISTICS_{key}").text = repr(value)
+            global_min = stats[0] if global_min is None else min(global_min, stats[0])
+            global_max = stats[1] if global_max is None else max(global_max, stats[1])
+        if source["nodata"] is not None:
+            ET.SubElement(band, "NoDataValue").text = repr(float(source["nodata"]))
+        simple = ET.SubElement(band, "SimpleSource")
+        ET.SubElement(simple, "SourceFilename", relativeToVRT="0").text = source["uri"]
+        ET.SubElement(simple, "SourceBand").text = str(index)
+    if global_min is not None:
+        # Same keys as band_stats.write_band_statistics
+        first_metadata = root.find("VRTRasterBand/Metadata")
+        ET.SubElement(first_metadata, "MDI", key="CAMS_GLOBAL_MINIMUM").text = repr(global_min)
+        ET.SubElement(first_metadata, "MDI", key="CAMS_GLOBAL_MAXIMUM").text = repr(global_max)
+    return ET.tostring(root, encoding="unicode"), times
+
+
+def read_vrt_sources(vrt_path):
+    """
+    Source descriptions stored in a mosaic built by build_time_mosaic.
+
+    Args:
+        vrt_path: Path to the VRT.
+
+    Returns:
+        list: Dictionaries from describe_source.
+    """
+    root = ET.parse(vrt_path).getroot()
+    for item in root.findall("Metadata/MDI"):
+        if item.get("key") == SOURCES_METADATA_KEY:
+            return json.loads(item.text)
+    raise ValueError(f"{vrt_path} is not a CAMS time mosaic.")
+
+
+def vrt_band_times(vrt_path):
+    """
+    Timestamps of the bands of a mosaic.
+
+    Args:
+        vrt_path: Path to the VRT.
+
+    Returns:
+        numpy.ndarray: datetime64[ms] array, one entry per band.
+    """
+    root = ET.parse(vrt_path).getroot()
+    times = [band.findtext("Description") for band in root.findall("VRTRasterBand")]
+    return np.array(times, dtype="datetime64[ms]")
+
+
+def _write(vrt_path, sources):
+    xml, times = build_vrt_xml(sources)
+    tmp_path = vrt_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(xml)
+    os.replace(tmp_path, vrt_path)
+    return times
+
+
+def build_time_mosaic(paths, vrt_path, variable=None):
+    """
+    Write a VRT stacking the time steps of several NetCDF files.
+
+    Args:
+        paths: NetCDF files, in any order.
+        vrt_path: Output VRT path.
+        variable: Variable name (see netcdf_loader.resolve_variable).
+
+    Returns:
+        int: Number of bands (time steps) of the mosaic.
+
+    Raises:
+        ValueError: If the files differ in variable, grid or data type.
+    """
+    sources = [describe_source(path, variable) for path in paths]
+    return len(_write(vrt_path, sources))
+
+
+def append_to_mosaic(vrt_path, paths, variable=None):
+    """
+    Add NetCDF files to an existing mosaic.
+
+    Only the new files are opened; the description of the files already
+    referenced is read back from the VRT, and files already in it are skipped.
+
+    Args:
+        vrt_path: Path of a VRT written by build_time_mosaic.
+        paths: NetCDF files to add.
+        variable: Variable name (see netcdf_loader.resolve_variable).
+
+    Returns:
+        int: Number of bands (time steps) of the mosaic.
+
+    Raises:
+        ValueError: If a new file differs from the mosaic in variable, grid or
+            data type; the VRT is then left unchanged.
+    """
+    sources = read_vrt_sources(vrt_path)
+    known = {source["path"] for source in sources}
+    for path in paths:
+        if os.path.abspath(path) not in known:
+            sources.append(describe_source(path, variable or sources[0]["variable"]))
+    return len(_write(vrt_path, sources))
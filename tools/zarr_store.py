@@ -0,0 +1,158 @@
+"""
+This module keeps one append-only Zarr store per product (variable, model,
+level and data type). Every downloaded, and optionally clipped, month is
+appended along time to the store of its product, in compressed chunks of
+ZARR_TIME_CHUNK time steps with consolidated metadata, so multi-month
+analyses open a single store instead of re-combining dozens of monthly
+NetCDF files. Stores are opened like NetCDF files by xarray (and so by
+nc_reader.open_dataset): aggregation and statistics run on them unchanged,
+their chunk tasks reading the store in parallel in the compute workers.
+
+Writing a store needs the zarr package; the NetCDF workflow runs without it.
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from .chunking import default_planner
+from .config import ZARR_CHUNK_ELEMENTS, ZARR_TIME_CHUNK
+
+STORE_EXTENSION = ".zarr"
+
+
+def require_zarr():
+    """Import zarr, with an installation hint if it is missing."""
+    try:
+        import zarr
+    except ImportError:
+        raise ImportError("Zarr stores require the zarr package (pip install zarr).")
+    return zarr
+
+
+def is_store(path):
+    """True if path is a Zarr store (a directory named *.zarr)."""
+    return os.path.isdir(path) and path.rstrip("/\\").endswith(STORE_EXTENSION)
+
+
+def store_chunks(data, time_chunk=ZARR_TIME_CHUNK, elements=ZARR_CHUNK_ELEMENTS):
+    """
+    Chunk shape of a variable in a store.
+
+    Chunks hold time_chunk time steps; the other dimensions are split from
+    the first one (level, then latitude) until a chunk holds at most
+    elements values, so the last one (longitude) stays whole.
+
+    Args:
+        data: xarray.DataArray with a time dimension.
+
+    Returns:
+        tuple: Chunk length along every dimension of data.
+    """
+    chunks = dict(data.sizes)
+    chunks["time"] = min(time_chunk, chunks["time"])
+    rest = max(1, elements // chunks["time"])
+    for dim in reversed([dim for dim in data.dims if dim != "time"]):
+        chunks[dim] = max(1, min(chunks[dim], rest))
+        rest = max(1, rest // chunks[dim])
+    return tuple(chunks[dim] for dim in data.dims)
+
+
+def store_times(store_path):
+    """
+    Time steps already in a store.
+
+    Returns:
+        pandas.DatetimeIndex: Empty if the store does not exist yet.
+    """
+    if not os.path.exists(store_path):
+        return pd.DatetimeIndex([])
+    with xr.open_zarr(store_path) as store:
+        return store.indexes["time"]
+
+
+def _check_grid(ds, store, nc_path):
+    """Raise ValueError unless ds has the variables and grid of the store."""
+    if set(ds.data_vars) != set(store.data_vars):
+        raise ValueError(f"{os.path.basename(nc_path)} does not have the variables of the store: "
+                         f"{sorted(ds.data_vars)} vs {sorted(store.data_vars)}")
+    for name, coord in store.coords.items():
+        if "time" in coord.dims:
+            continue
+        if name not in ds.coords or not np.array_equal(ds[name].values, coord.values):
+            raise ValueError(f"{os.path.basename(nc_path)} is not on the grid of the store ({name} differs).")
+
+
+def append_to_store(nc_path, store_path):
+    """
+    Append the time steps of a NetCDF file to a store, creating it if needed.
+
+    The store is append-only: time steps already in it are skipped, so a
+    month can be ingested again safely, and time steps earlier than its end
+    are refused rather than inserted.
+
+    Args:
+        nc_path: NetCDF file of one product.
+        store_path: Zarr store of the product (a *.zarr directory).
+
+    Returns:
+        int: Number of time steps appended.
+
+    Raises:
+        ValueError: If the file does not fit the store (other variables or
+            grid, or new time steps before the end of the store).
+    """
+    require_zarr()
+    existing = store_times(store_path)
+    with xr.open_dataset(nc_path) as ds:
+        # NetCDF encodings (compression, chunk sizes, packing) do not apply to Zarr
+        for variable in ds.variables.values():
+            variable.encoding = {}
+        new = np.flatnonzero(~ds.indexes["time"].isin(existing))
+        if len(existing):
+            with xr.open_zarr(store_path) as store:
+                _check_grid(ds, store, nc_path)
+            if len(new) and ds.indexes["time"][new].min() <= existing.max():
+                raise ValueError(f"{os.path.basename(nc_path)} has time steps before the end of the store "
+                                 f"({existing.max()}); stores are append-only.")
+        ds = ds.isel(time=new)
+        timed = [name for name in ds.data_vars if "time" in ds[name].dims]
+        # Written in blocks of whole chunks that fit the memory budget
+        plane = sum(ds[name].size // max(1, ds.sizes["time"]) for name in timed)
+        step = default_planner().elements() // max(1, plane)
+        step = max(ZARR_TIME_CHUNK, step - step % ZARR_TIME_CHUNK)
+        with warnings.catch_warnings():
+            # zarr 3 warns that consolidated metadata is an extension of its format
+            warnings.filterwarnings("ignore", message="Consolidated metadata")
+            for start in range(0, len(new), step):
+                block = ds.isel(time=slice(start, start + step))
+                if start == 0 and not len(existing):
+                    encoding = {name: {"chunks": store_chunks(ds[name])} for name in timed}
+                    block.load().to_zarr(store_path, mode="w-", encoding=encoding, consolidated=True)
+                else:
+                    # Variables without a time dimension are already in the store
+                    block = block[timed].load()
+                    block.to_zarr(store_path, mode="a", append_dim="time", consolidated=True)
+    return len(new)
+
+
+def ingest_files(paths, store_path):
+    """
+    Append NetCDF files of one product to its store, in time order.
+
+    Args:
+        paths: NetCDF files, e.g. the months of a download.
+        store_path: Zarr store of the product.
+
+    Returns:
+        int: Number of time steps appended.
+    """
+    starts = {}
+    for path in paths:
+        with xr.open_dataset(path) as ds:
+            starts[path] = ds.indexes["time"].min()
+    os.makedirs(os.path.dirname(os.path.abspath(store_path)), exist_ok=True)
+    return sum(append_to_store(path, store_path) for path in sorted(paths, key=starts.get))